@@ -7,7 +7,8 @@ API routing and HTTP request/response processing only, actual business logic is
 """
 
 from chalice import Chalice, CORSConfig, Response
-from chalicelib.interfaces.chalice_chatbot_adapter import ChatbotInterface
+from chalicelib.interfaces.chalice_chatbot_adapter import ChatbotInterface, JobsUnavailable
+from core.orchestration.stage_timer import format_server_timing
 import logging
 import os
 from typing import Dict, Any
@@ -19,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Largest number of messages accepted by /api/chat/batch
+CHAT_BATCH_MAX_ITEMS = int(os.getenv('CHAT_BATCH_MAX_ITEMS', '50'))
+
 # CORS configuration
 ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', 'https://your-frontend-domain.com').split(',')
 cors_config = CORSConfig(
@@ -63,9 +67,78 @@ def chat():
 
         # Process the message
         response = chatbot.handle_user_input(message, language)
-        
+
+        # Stage timings (when STAGE_TIMING is on) go in a header, not the body
+        headers = {}
+        timings = response.pop('timings', None)
+        if timings:
+            headers['Server-Timing'] = format_server_timing(timings)
+
         return Response(
             body=response,
+            status_code=200,
+            headers=headers
+        )
+
+    except APIError as e:
+        logger.error(f"API Error: {str(e)}", extra={'status_code': e.status_code, 'details': e.details})
+        return Response(
+            body={
+                'error': e.message,
+                'details': e.details,
+                'status': 'error'
+            },
+            status_code=e.status_code
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        return Response(
+            body={
+                'error': 'Internal server error',
+                'status': 'error'
+            },
+            status_code=500
+        )
+
+@app.route('/api/chat/batch', methods=['POST'], cors=cors_config)
+def chat_batch():
+    try:
+        request_body = app.current_request.json_body
+        if not request_body:
+            raise APIError('Missing request body', status_code=400)
+
+        items = request_body.get('items') if isinstance(request_body, dict) else None
+        if not isinstance(items, list) or not items:
+            raise APIError('Missing items in request', status_code=400)
+        if len(items) > CHAT_BATCH_MAX_ITEMS:
+            raise APIError(
+                f'Too many items in request (maximum {CHAT_BATCH_MAX_ITEMS})',
+                status_code=400,
+                details={'max_items': CHAT_BATCH_MAX_ITEMS}
+            )
+
+        # Invalid items get an error result in place; the rest are processed
+        results = [None] * len(items)
+        valid = []
+        positions = []
+        for index, item in enumerate(items):
+            message = item.get('message') if isinstance(item, dict) else None
+            language = item.get('language', 'auto') if isinstance(item, dict) else None
+            if not isinstance(message, str) or not message.strip() or not isinstance(language, str):
+                results[index] = {'status': 'error', 'error': 'Invalid message format'}
+                continue
+            valid.append((message, language))
+            positions.append(index)
+
+        if valid:
+            for index, result in zip(positions, chatbot.handle_batch(valid)):
+                results[index] = result
+
+        return Response(
+            body={
+                'status': 'success',
+                'results': [dict(result, index=index) for index, result in enumerate(results)]
+            },
             status_code=200
         )
 
@@ -87,4 +160,94 @@ def chat():
                 'status': 'error'
             },
             status_code=500
-        ) 
\ No newline at end of file
+        )
+
+@app.route('/api/chat/jobs', methods=['POST'], cors=cors_config)
+def submit_chat_job():
+    try:
+        request_body = app.current_request.json_body
+        if not request_body:
+            raise APIError('Missing request body', status_code=400)
+
+        if 'message' not in request_body:
+            raise APIError('Missing message in request', status_code=400)
+
+        message = request_body['message']
+        language = request_body.get('language', 'auto')
+
+        # Validate message
+        if not isinstance(message, str) or not message.strip() or not isinstance(language, str):
+            raise APIError('Invalid message format', status_code=400)
+
+        # Queue the message; the client polls /api/chat/jobs/{job_id} for the result
+        try:
+            job = chatbot.submit_job(message, language)
+        except JobsUnavailable as e:
+            raise APIError('Asynchronous jobs are not available', status_code=503, details={'reason': str(e)})
+
+        return Response(
+            body={'job_id': job['job_id'], 'status': job['status']},
+            status_code=202,
+            headers={'Location': f"/api/chat/jobs/{job['job_id']}"}
+        )
+
+    except APIError as e:
+        logger.error(f"API Error: {str(e)}", extra={'status_code': e.status_code, 'details': e.details})
+        return Response(
+            body={
+                'error': e.message,
+                'details': e.details,
+                'status': 'error'
+            },
+            status_code=e.status_code
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        return Response(
+            body={
+                'error': 'Internal server error',
+                'status': 'error'
+            },
+            status_code=500
+        )
+
+@app.route('/api/chat/jobs/{job_id}', methods=['GET'], cors=cors_config)
+def get_chat_job(job_id):
+    try:
+        try:
+            job = chatbot.get_job(job_id)
+        except JobsUnavailable as e:
+            raise APIError('Asynchronous jobs are not available', status_code=503, details={'reason': str(e)})
+        if job is None:
+            raise APIError('Job not found', status_code=404, details={'job_id': job_id})
+
+        return Response(
+            body=job,
+            status_code=200
+        )
+
+    except APIError as e:
+        logger.error(f"API Error: {str(e)}", extra={'status_code': e.status_code, 'details': e.details})
+        return Response(
+            body={
+                'error': e.message,
+                'details': e.details,
+                'status': 'error'
+            },
+            status_code=e.status_code
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        return Response(
+            body={
+                'error': 'Internal server error',
+                'status': 'error'
+            },
+            status_code=500
+        )
+
+@app.lambda_function(name='chat_job_worker')
+def chat_job_worker(event, context):
+    """Run one chat job handed off by POST /api/chat/jobs (invoked asynchronously)"""
+    chatbot.run_job(event['job_id'], event['message'], event.get('language', 'auto'))
+    return {'job_id': event['job_id']}
@@ -14,6 +14,11 @@ This architecture promotes separation of concerns and makes the code more mainta
 import logging
 import os
 
+from dotenv import load_dotenv
+
+# Load .env once for every module in the package; deployed settings take precedence
+load_dotenv()
+
 # Configure logging
 log_level = os.environ.get('LOG_LEVEL', 'INFO')
 logging.basicConfig(
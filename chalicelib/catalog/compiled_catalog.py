@@ -0,0 +1,318 @@
+"""
+Compiled Drug Catalog
+
+Binary form of the drug catalog, built ahead of time by
+scripts/database/build_catalog_artifact.py so a new process can use the
+catalog without parsing JSON. The file is opened with a read-only mmap:
+pages come from the OS page cache and are shared by every process that
+opens it, and records are decoded only when they are looked up.
+
+Layout (little-endian, every section 4-byte aligned):
+- header: magic, version, section offsets and counts, then the size and
+  SHA-256 prefix of the dataset the artifact was compiled from
+- string table: offsets (uint32, count + 1) into a UTF-8 blob; every
+  distinct string (names, aliases, uses, side effects, substitutes) is
+  stored once
+- records: fixed-size rows of id, name, normalized name, habit-forming flag
+  and (start, count) slices of the list pool for the pre-split fields
+- list pool: string ids referenced by the record slices
+- lookup tables: (key, record index) pairs sorted by normalized name, by
+  alias and by id, searched by bisection
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+from .drug_catalog import DrugCatalog, DrugRecord
+
+DEFAULT_ARTIFACT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'processed', 'drug_catalog.bin'
+)
+
+MAGIC = b'PPDRUGC\x00'
+VERSION = 2
+
+# magic, version, record count, string count, then the offset of each section: string
+# offsets, string blob, records, list pool, name index (+ entries), alias index
+# (+ entries and distinct aliases) and id index, then the source dataset's size and digest
+_HEADER = struct.Struct('<8sI' + 'I' * 12 + 'Q16s')
+_NO_SOURCE = (0, b'\x00' * 16)
+# id, name, normalized name, habit forming, then (start, count) for uses, side effects, substitutes, aliases
+_RECORD = struct.Struct('<i' + 'I' * 11)
+_PAIR = struct.Struct('<II')
+_ID_PAIR = struct.Struct('<iI')
+_UINT = struct.Struct('<I')
+
+
+def _align(data: bytearray) -> None:
+    data.extend(b'\x00' * (-len(data) % 4))
+
+
+def source_fingerprint(source_path: str) -> tuple:
+    """Size and SHA-256 prefix of a dataset file, as recorded in the artifact header"""
+    digest = hashlib.sha256()
+    with open(source_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return os.path.getsize(source_path), digest.digest()[:16]
+
+
+def compile_catalog(catalog: DrugCatalog, path: str, source_path: Optional[str] = None) -> int:
+    """
+    Write a catalog as a compiled artifact
+
+    Args:
+        catalog: Catalog built from the processed dataset
+        path: Artifact to write; replaced atomically
+        source_path: Dataset the catalog was parsed from; its fingerprint is
+            recorded so the runtime only maps the artifact for that dataset
+
+    Returns:
+        Size of the artifact in bytes
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        sid = strings.get(text)
+        if sid is None:
+            sid = strings[text] = len(strings)
+        return sid
+
+    pool: List[int] = []
+
+    def add_list(values: List[str]) -> List[int]:
+        start = len(pool)
+        pool.extend(intern(value) for value in values)
+        return [start, len(values)]
+
+    rows = []
+    for record in catalog.records:
+        fields = [record.id, intern(record.name), intern(record.normalized_name), int(record.habit_forming)]
+        for values in (record.uses, record.side_effects, record.substitutes, record.aliases):
+            fields.extend(add_list(values))
+        rows.append(fields)
+
+    position = {id(record): index for index, record in enumerate(catalog.records)}
+    name_pairs = sorted((name, position[id(record)]) for name, record in catalog.by_name.items())
+    alias_pairs = sorted(
+        (alias, position[id(record)])
+        for alias, records in catalog.by_alias.items() for record in records
+    )
+    id_pairs = sorted((record.id, index) for index, record in enumerate(catalog.records))
+    name_pairs = [(intern(name), index) for name, index in name_pairs]
+    alias_pairs = [(intern(alias), index) for alias, index in alias_pairs]
+
+    blob = bytearray()
+    offsets = []
+    for text in strings:
+        offsets.append(len(blob))
+        blob.extend(text.encode('utf-8'))
+    offsets.append(len(blob))
+
+    body = bytearray()
+    sections = []
+
+    def section(payload: bytes) -> int:
+        offset = _HEADER.size + len(body)
+        body.extend(payload)
+        _align(body)
+        return offset
+
+    sections.append(section(b''.join(_UINT.pack(offset) for offset in offsets)))
+    sections.append(section(bytes(blob)))
+    sections.append(section(b''.join(_RECORD.pack(*row) for row in rows)))
+    sections.append(section(b''.join(_UINT.pack(sid) for sid in pool)))
+    name_offset = section(b''.join(_PAIR.pack(*pair) for pair in name_pairs))
+    alias_offset = section(b''.join(_PAIR.pack(*pair) for pair in alias_pairs))
+    id_offset = section(b''.join(_ID_PAIR.pack(*pair) for pair in id_pairs))
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(rows), len(strings),
+        sections[0], sections[1], sections[2], sections[3],
+        name_offset, len(name_pairs), alias_offset, len(alias_pairs), len(catalog.by_alias), id_offset,
+        *(source_fingerprint(source_path) if source_path else _NO_SOURCE)
+    )
+    partial = path + '.partial'
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(partial, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(partial, path)
+    return len(header) + len(body)
+
+
+class _SortedIndex(Mapping):
+    """Read-only mapping over a sorted (key, record index) table"""
+
+    def __init__(self, count: int, distinct: int, key_at: Callable[[int], Any],
+                 index_at: Callable[[int], int], record: Callable[[int], DrugRecord], multi: bool):
+        self._count = count
+        self._distinct = distinct
+        self._key_at = key_at
+        self._index_at = index_at
+        self._record = record
+        self._multi = multi
+        # Decoded keys by position; bisection keeps revisiting the same upper levels
+        self._keys: Dict[int, Any] = {}
+
+    def _key(self, position: int) -> Any:
+        key = self._keys.get(position)
+        if key is None:
+            key = self._keys[position] = self._key_at(position)
+        return key
+
+    def _lower_bound(self, key: Any) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __getitem__(self, key: Any) -> Any:
+        position = self._lower_bound(key)
+        if position >= self._count or self._key(position) != key:
+            raise KeyError(key)
+        if not self._multi:
+            return self._record(self._index_at(position))
+        records = []
+        while position < self._count and self._key(position) == key:
+            records.append(self._record(self._index_at(position)))
+            position += 1
+        return records
+
+    def __iter__(self) -> Iterator[Any]:
+        previous = object()
+        for position in range(self._count):
+            key = self._key_at(position)
+            if key != previous:
+                previous = key
+                yield key
+
+    def __len__(self) -> int:
+        return self._distinct
+
+
+class _RecordSequence(Sequence):
+    """Records in dataset order, decoded on access"""
+
+    def __init__(self, catalog: 'CompiledCatalog'):
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return self._catalog.record_count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._catalog.record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._catalog.record(index)
+
+
+class CompiledCatalog(DrugCatalog):
+    """DrugCatalog backed by a memory-mapped compiled artifact"""
+
+    def __init__(self, path: str = DEFAULT_ARTIFACT_PATH):
+        """
+        Raises:
+            ValueError: If the file is not a compiled catalog of this version
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError(f"Not a compiled drug catalog: {path}")
+        (magic, version, self.record_count, self._string_count,
+         self._string_offsets, self._string_blob, self._records_offset, self._pool_offset,
+         name_offset, name_count, alias_offset, alias_count, alias_distinct, id_offset,
+         self.source_size, self.source_digest) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a compiled drug catalog (version {VERSION}): {path}")
+
+        self._decoded: Dict[int, DrugRecord] = {}
+        self._decode_lock = threading.Lock()
+        self._fuzzy_matcher = None
+        self.records = _RecordSequence(self)
+        self.by_name = _SortedIndex(
+            name_count, name_count,
+            lambda i: self._string(_PAIR.unpack_from(self._buffer, name_offset + i * _PAIR.size)[0]),
+            lambda i: _PAIR.unpack_from(self._buffer, name_offset + i * _PAIR.size)[1],
+            self.record, multi=False
+        )
+        self.by_alias = _SortedIndex(
+            alias_count, alias_distinct,
+            lambda i: self._string(_PAIR.unpack_from(self._buffer, alias_offset + i * _PAIR.size)[0]),
+            lambda i: _PAIR.unpack_from(self._buffer, alias_offset + i * _PAIR.size)[1],
+            self.record, multi=True
+        )
+        self.by_id = _SortedIndex(
+            self.record_count, self.record_count,
+            lambda i: _ID_PAIR.unpack_from(self._buffer, id_offset + i * _ID_PAIR.size)[0],
+            lambda i: _ID_PAIR.unpack_from(self._buffer, id_offset + i * _ID_PAIR.size)[1],
+            self.record, multi=False
+        )
+
+    def _string(self, sid: int) -> str:
+        start, end = struct.unpack_from('<II', self._buffer, self._string_offsets + sid * 4)
+        return self._buffer[self._string_blob + start:self._string_blob + end].decode('utf-8')
+
+    def _strings(self, start: int, count: int) -> List[str]:
+        offset = self._pool_offset + start * 4
+        return [self._string(sid) for sid in struct.unpack_from(f'<{count}I', self._buffer, offset)]
+
+    def record(self, index: int) -> DrugRecord:
+        """Record at a dataset position, decoded once and then reused"""
+        record = self._decoded.get(index)
+        if record is not None:
+            return record
+        fields = _RECORD.unpack_from(self._buffer, self._records_offset + index * _RECORD.size)
+        record = DrugRecord.from_fields(
+            drug_id=fields[0],
+            name=self._string(fields[1]),
+            normalized_name=self._string(fields[2]),
+            habit_forming=bool(fields[3]),
+            uses=self._strings(fields[4], fields[5]),
+            side_effects=self._strings(fields[6], fields[7]),
+            substitutes=self._strings(fields[8], fields[9]),
+            aliases=self._strings(fields[10], fields[11])
+        )
+        with self._decode_lock:
+            # Keep one object per record, even when two threads decode it at once
+            return self._decoded.setdefault(index, record)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def is_fresh(artifact_path: str, source_path: str, check_digest: bool = True) -> bool:
+    """
+    Whether the artifact was compiled from the dataset as it is now
+
+    Compares the size recorded in the artifact header with the dataset file
+    and, when check_digest is set and the sizes agree, the digest too. The
+    digest reads the whole dataset, so it is skipped for the packaged
+    artifact, which the build step checks when it writes it.
+    """
+    if not os.path.exists(artifact_path) or not os.path.exists(source_path):
+        return False
+    with open(artifact_path, 'rb') as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    fields = _HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return False
+    size, digest = fields[-2:]
+    if size != os.path.getsize(source_path):
+        return False
+    return not check_digest or (size, digest) == source_fingerprint(source_path)
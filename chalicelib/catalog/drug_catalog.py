@@ -0,0 +1,296 @@
+"""
+Drug Catalog
+
+Loads the processed medication dataset (data/processed/dynamodb_ready_data.json)
+once per process and indexes it for constant-time lookups by id, normalized
+name and alias. The file is streamed record by record, so JSON arrays and
+JSON Lines files of any size can be loaded.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import logging
+import os
+import re
+import threading
+
+from .fuzzy_matcher import FuzzyMatcher
+from .streaming import iter_records, clean_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'processed', 'dynamodb_ready_data.json'
+)
+
+# Trailing words that describe the dosage form rather than the product
+DOSAGE_FORMS = {
+    'tablet', 'tablets', 'capsule', 'capsules', 'syrup', 'suspension', 'injection',
+    'gel', 'cream', 'ointment', 'drop', 'drops', 'solution', 'liquid', 'spray',
+    'inhaler', 'emulsion', 'infusion', 'expectorant', 'rotacaps', 'respules',
+    'kit', 'lotion', 'powder', 'sachet', 'dt', 'sr', 'er', 'pr', 'cr', 'xr', 'mr'
+}
+
+_WHITESPACE = re.compile(r'\s+')
+_STRENGTH = re.compile(r'\d')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a medication name for exact matching (case and whitespace folded)"""
+    return _WHITESPACE.sub(' ', name.strip().lower())
+
+
+def split_list_field(value: Any) -> List[str]:
+    """
+    Split a comma-separated dataset field into its parts
+
+    Commas inside parentheses are kept, so "Flushing (sense of warmth in the
+    face, ears, neck and trunk)" stays a single entry. Missing values (NaN or
+    None) produce an empty list.
+    """
+    if not isinstance(value, str):
+        return []
+
+    parts = []
+    depth = 0
+    current = []
+    for char in value:
+        if char == '(':
+            depth += 1
+        elif char == ')' and depth > 0:
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def generate_aliases(normalized_name: str) -> List[str]:
+    """
+    Derive the shorter names users type for a catalog entry
+
+    "augmentin 625 duo tablet" yields "augmentin 625 duo" and "augmentin";
+    hyphenated brands like "allegra-m tablet" also yield "allegra m".
+    """
+    tokens = normalized_name.split(' ')
+    aliases = []
+
+    # Drop trailing dosage-form words
+    end = len(tokens)
+    while end > 1 and tokens[end - 1] in DOSAGE_FORMS:
+        end -= 1
+    if end < len(tokens):
+        aliases.append(' '.join(tokens[:end]))
+
+    # Brand stem: everything before the first strength or dosage-form token
+    stem_end = 0
+    while stem_end < end and not _STRENGTH.search(tokens[stem_end]) and tokens[stem_end] not in DOSAGE_FORMS:
+        stem_end += 1
+    if stem_end:
+        aliases.append(' '.join(tokens[:stem_end]))
+
+    for alias in list(aliases):
+        if '-' in alias:
+            aliases.append(alias.replace('-', ' '))
+
+    seen = {normalized_name}
+    unique = []
+    for alias in aliases:
+        alias = normalize_name(alias.strip(' -'))
+        if alias and alias not in seen:
+            seen.add(alias)
+            unique.append(alias)
+    return unique
+
+
+class DrugRecord:
+    """A single medication from the processed dataset"""
+
+    __slots__ = ('id', 'name', 'normalized_name', 'uses', 'side_effects',
+                 'substitutes', 'habit_forming', 'aliases')
+
+    def __init__(self, item: Dict[str, Any]):
+        self.id = int(item['id'])
+        self.name = item['name'].strip()
+        self.normalized_name = normalize_name(self.name)
+        self.uses = split_list_field(item.get('Uses'))
+        self.side_effects = split_list_field(item.get('SideEffects'))
+        self.substitutes = split_list_field(item.get('Substitute'))
+        habit = item.get('Habit Forming')
+        self.habit_forming = isinstance(habit, str) and 'cannot' not in habit.lower()
+        self.aliases = generate_aliases(self.normalized_name)
+
+    @classmethod
+    def from_fields(
+        cls,
+        drug_id: int,
+        name: str,
+        normalized_name: str,
+        uses: List[str],
+        side_effects: List[str],
+        substitutes: List[str],
+        habit_forming: bool,
+        aliases: List[str]
+    ) -> 'DrugRecord':
+        """Rebuild a record from already-parsed fields (used by the compiled catalog)"""
+        record = cls.__new__(cls)
+        record.id = drug_id
+        record.name = name
+        record.normalized_name = normalized_name
+        record.uses = uses
+        record.side_effects = side_effects
+        record.substitutes = substitutes
+        record.habit_forming = habit_forming
+        record.aliases = aliases
+        return record
+
+    @property
+    def display_name(self) -> str:
+        return self.name.title()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'uses': self.uses,
+            'side_effects': self.side_effects,
+            'substitutes': self.substitutes,
+            'habit_forming': self.habit_forming
+        }
+
+
+class DrugCatalog:
+    """In-memory drug catalog indexed by id, normalized name and alias"""
+
+    def __init__(self, records: Iterable[DrugRecord]):
+        self.records: List[DrugRecord] = []
+        self.by_id: Dict[int, DrugRecord] = {}
+        self.by_name: Dict[str, DrugRecord] = {}
+        self.by_alias: Dict[str, List[DrugRecord]] = {}
+        self._fuzzy_matcher: Optional[FuzzyMatcher] = None
+
+        for record in records:
+            if record.id in self.by_id:
+                logger.warning(f"Duplicate catalog id {record.id}, keeping the first entry")
+                continue
+            self.records.append(record)
+            self.by_id[record.id] = record
+            # Dataset order follows popularity, so the first entry wins a name clash
+            self.by_name.setdefault(record.normalized_name, record)
+            for alias in record.aliases:
+                self.by_alias.setdefault(alias, []).append(record)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> 'DrugCatalog':
+        """Build a catalog from raw dataset rows"""
+        return cls(DrugRecord(item) for item in items if item.get('id') is not None and item.get('name'))
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_CATALOG_PATH) -> 'DrugCatalog':
+        """Build a catalog from the processed dataset (JSON array or JSON Lines)"""
+        # NaN ids become None while cleaning and are skipped by from_items
+        return cls.from_items(clean_records(iter_records(path)))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[DrugRecord]:
+        return iter(self.records)
+
+    def get_by_id(self, drug_id: int) -> Optional[DrugRecord]:
+        return self.by_id.get(int(drug_id))
+
+    def get_by_name(self, name: str) -> Optional[DrugRecord]:
+        return self.by_name.get(normalize_name(name))
+
+    def get_by_alias(self, alias: str) -> List[DrugRecord]:
+        return self.by_alias.get(normalize_name(alias), [])
+
+    def lookup(self, name: str) -> Optional[DrugRecord]:
+        """
+        Find the best catalog entry for a medication name
+
+        Args:
+            name: Medication name as written by the user
+
+        Returns:
+            Exact name match if there is one, otherwise the most popular entry
+            sharing the alias, otherwise None
+        """
+        key = normalize_name(name)
+        record = self.by_name.get(key)
+        if record is not None:
+            return record
+        matches = self.by_alias.get(key)
+        return matches[0] if matches else None
+
+    @property
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """Trigram matcher over every name and alias, built on first use"""
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = FuzzyMatcher(list(self.by_name) + list(self.by_alias))
+        return self._fuzzy_matcher
+
+    def suggest(self, name: str, limit: int = 5, max_distance: Optional[int] = None) -> List[DrugRecord]:
+        """
+        Rank catalog entries whose name or alias is close to a misspelled name
+
+        Args:
+            name: Medication name as written by the user
+            limit: Maximum number of suggestions
+            max_distance: Edit-distance bound (defaults to one based on length)
+
+        Returns:
+            Matching records, closest first, without duplicates
+        """
+        suggestions = []
+        for term, _ in self.fuzzy_matcher.match(normalize_name(name), max_distance, limit):
+            record = self.lookup(term)
+            if record is not None and record not in suggestions:
+                suggestions.append(record)
+        return suggestions
+
+_catalog: Optional[DrugCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_drug_catalog() -> DrugCatalog:
+    """
+    Return the process-wide drug catalog, loading it on first use
+
+    A compiled artifact (DRUG_CATALOG_ARTIFACT, default
+    data/processed/drug_catalog.bin) is memory-mapped when it was built from
+    the dataset; otherwise the dataset itself is parsed. The dataset path can
+    be overridden with the DRUG_CATALOG_PATH environment variable, and only
+    then is the dataset hashed against the digest recorded in the artifact.
+    The packaged artifact is trusted when the bundled dataset has the
+    recorded size, or is absent, so a cold start never reads the dataset.
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from .compiled_catalog import CompiledCatalog, DEFAULT_ARTIFACT_PATH, is_fresh
+
+                configured = os.getenv('DRUG_CATALOG_PATH')
+                path = configured or DEFAULT_CATALOG_PATH
+                artifact = os.getenv('DRUG_CATALOG_ARTIFACT', DEFAULT_ARTIFACT_PATH)
+                if configured:
+                    usable = is_fresh(artifact, path)
+                else:
+                    usable = is_fresh(artifact, path, check_digest=False) or not os.path.exists(path)
+                if artifact and usable and os.path.exists(artifact):
+                    try:
+                        _catalog = CompiledCatalog(artifact)
+                        logger.info(f"Mapped {len(_catalog)} medications from the compiled catalog {artifact}")
+                        return _catalog
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Ignoring compiled catalog {artifact}: {str(e)}")
+                elif artifact and os.path.exists(artifact):
+                    logger.warning(f"Compiled catalog {artifact} was not built from {path}; rebuild it")
+                _catalog = DrugCatalog.from_file(path)
+                logger.info(f"Loaded {len(_catalog)} medications into the drug catalog from {path}")
+    return _catalog
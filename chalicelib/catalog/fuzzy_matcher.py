@@ -0,0 +1,230 @@
+"""
+Fuzzy Name Matcher
+
+Trigram index with bounded edit-distance verification for misspelled
+medication names ("ibuprofin", "azithrall"). Candidates come from the
+rarest postings of the query's trigrams, restricted to terms of compatible
+length, pruned by shared trigram count and by the set of characters they
+use, and the survivors are checked with a banded Levenshtein distance that
+stops as soon as the bound is exceeded.
+
+Latency (scripts/benchmarks/bench_fuzzy_matcher.py): over the 500-drug
+catalog p99 is about 0.3ms, inside the sub-millisecond target. Over a dense
+synthetic set of 50k names the target is missed: p50 is about 0.65ms but p99
+is about 14ms, from two-typo queries whose rarest trigrams are still shared
+by thousands of names. The opt-in max_postings bound cuts that p99 to about
+4ms, still above target, and loses true matches while doing so; it is off by
+default because the catalog lookups feed medication answers.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+from itertools import chain
+import bisect
+from operator import itemgetter
+
+GRAM_SIZE = 3
+_PADDING = ' ' * (GRAM_SIZE - 1)
+
+
+def trigrams(text: str) -> List[str]:
+    """Padded character trigrams of a normalized string (duplicates kept once)"""
+    padded = f"{_PADDING}{text} "
+    grams = []
+    seen = set()
+    for i in range(len(padded) - GRAM_SIZE + 1):
+        gram = padded[i:i + GRAM_SIZE]
+        if gram not in seen:
+            seen.add(gram)
+            grams.append(gram)
+    return grams
+
+
+def bounded_levenshtein(source: str, target: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance, or None as soon as it must exceed max_distance
+
+    Only the diagonal band of width 2 * max_distance + 1 is filled in.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return None
+    if source == target:
+        return 0
+
+    # A shared prefix or suffix never changes the distance, so only the
+    # differing middle is compared ("abcd forte" vs "abed forte" -> "c" vs "e")
+    start = 0
+    shortest = min(len(source), len(target))
+    while start < shortest and source[start] == target[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and source[-1 - end] == target[-1 - end]:
+        end += 1
+    source = source[start:len(source) - end]
+    target = target[start:len(target) - end]
+    if not source or not target:
+        return max(len(source), len(target))
+
+    too_far = max_distance + 1
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(target), i + max_distance)
+        current = [too_far] * (len(target) + 1)
+        current[0] = i if i <= max_distance else too_far
+        source_char = source[i - 1]
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if source_char == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    distance = previous[len(target)]
+    return distance if distance <= max_distance else None
+
+
+def char_mask(text: str) -> int:
+    """Bit set of the characters in a string (hashed into 64 bits)"""
+    mask = 0
+    for char in text:
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+def default_max_distance(query: str) -> int:
+    """
+    Edit budget that grows with the query length; short names must match exactly
+
+    One edit turns a five-letter brand into an unrelated drug ("advil" and
+    "avil" are ibuprofen and pheniramine), so names up to that length get none.
+    """
+    if len(query) <= 5:
+        return 0
+    if len(query) <= 8:
+        return 1
+    return 2
+
+
+class FuzzyMatcher:
+    """Trigram index over a fixed list of normalized terms"""
+
+    def __init__(self, terms: Iterable[str], max_postings: Optional[int] = None):
+        """
+        Args:
+            terms: Normalized terms to index
+            max_postings: Posting entries merged per search before the rarer
+                trigrams alone must supply the candidates. None (the default)
+                never stops early; a bound trades recall for latency
+        """
+        self.max_postings = max_postings
+        self.terms: List[str] = []
+        self.term_masks: List[int] = []
+        term_ids: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+
+        for term in terms:
+            if not term or term in term_ids:
+                continue
+            term_id = len(self.terms)
+            term_ids[term] = term_id
+            self.terms.append(term)
+            self.term_masks.append(char_mask(term))
+            grams = trigrams(term)
+            for gram in grams:
+                postings.setdefault(gram, []).append(term_id)
+
+        # Postings sorted by term length so a length window is two bisects away
+        self.term_ids = term_ids
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for gram, ids in postings.items():
+            ids.sort(key=lambda term_id: len(self.terms[term_id]))
+            self.postings[gram] = ([len(self.terms[term_id]) for term_id in ids], ids)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def match(self, query: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Find indexed terms within an edit-distance bound of the query
+
+        Args:
+            query: Normalized (lowercase, single-spaced) text
+            max_distance: Edit budget; defaults to one based on the query length
+            limit: Maximum number of candidates to return
+
+        Returns:
+            (term, distance) pairs, closest first; ties keep index order
+        """
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        if query in self.term_ids:
+            return [(query, 0)]
+        if max_distance <= 0 or not self.terms:
+            return []
+
+        query_grams = trigrams(query)
+        # Each edit destroys at most GRAM_SIZE trigrams
+        min_shared = len(query_grams) - GRAM_SIZE * max_distance
+        min_length = len(query) - max_distance
+        max_length = len(query) + max_distance
+
+        # (size, gram, slice bounds) of each posting restricted to the length window
+        windows = []
+        for gram in query_grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                windows.append((0, gram, None, 0, 0))
+                continue
+            lengths, ids = posting
+            low = bisect.bisect_left(lengths, min_length)
+            high = bisect.bisect_right(lengths, max_length)
+            windows.append((high - low, gram, ids, low, high))
+
+        # A term sharing min_shared trigrams appears in at least one of any
+        # len(query_grams) - min_shared + 1 postings, so candidates come from
+        # the rarest ones and the common grams ("00 ", " forte") are checked per
+        # candidate. In dense name sets the rarest postings can still hold
+        # thousands of terms; with max_postings set, merging stops at that many
+        # entries and a term that shares none of the merged trigrams is missed
+        windows.sort(key=itemgetter(0))
+        merged = len(windows) - min_shared + 1 if min_shared > 0 else len(windows)
+        total = 0
+        for position in range(merged):
+            total += windows[position][0]
+            if position and self.max_postings is not None and total > self.max_postings:
+                merged = position
+                break
+        counts = Counter(chain.from_iterable(ids[low:high] for _, _, ids, low, high in windows[:merged] if ids))
+        common = [gram for _, gram, _, _, _ in windows[merged:]]
+
+        # Each edit changes the set of characters used by at most two
+        query_mask = char_mask(query)
+        max_char_changes = 2 * max_distance
+        masks = self.term_masks
+        terms = self.terms
+
+        results = []
+        for term_id, shared in counts.items():
+            if _popcount(masks[term_id] ^ query_mask) > max_char_changes:
+                continue
+            term = terms[term_id]
+            if common and shared < min_shared:
+                padded = f"{_PADDING}{term} "
+                shared += sum(1 for gram in common if gram in padded)
+            if shared < min_shared:
+                continue
+            distance = bounded_levenshtein(query, term, max_distance)
+            if distance is not None:
+                results.append((distance, term_id))
+
+        results.sort()
+        return [(self.terms[term_id], distance) for distance, term_id in results[:limit]]
@@ -0,0 +1,118 @@
+"""
+Keyword Automaton
+
+Aho-Corasick automaton over many keywords at once (intent cue words, every
+catalog name and alias). A text is scanned once, character by character,
+however many keywords there are, and every occurrence of every keyword is
+reported, overlapping ones included. Keywords can be restricted to whole
+words, so the alias "air" is not found inside "hair".
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple
+from collections import deque
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+class KeywordAutomaton:
+    """Multi-keyword matcher whose keywords carry arbitrary payloads"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (keyword length, payload, whole word) ending at each node, own keywords only
+        self._own: List[List[Tuple[int, Any, bool]]] = [[]]
+        # Own keywords plus those of every suffix node, filled in by build()
+        self._outputs: List[Tuple[Tuple[int, Any, bool], ...]] = []
+        self._keywords = 0
+
+    def __len__(self) -> int:
+        return self._keywords
+
+    def add(self, keyword: str, payload: Any, whole_word: bool = False) -> None:
+        """
+        Add a keyword; the same keyword may be added with several payloads
+
+        Args:
+            keyword: Text to find, matched case-sensitively (normalize first)
+            payload: Value reported with each occurrence
+            whole_word: Only report occurrences not preceded or followed by a
+                letter or digit
+        """
+        if not keyword:
+            raise ValueError("Keywords must not be empty")
+        node = 0
+        for char in keyword:
+            following = self._goto[node].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[node][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            node = following
+        self._own[node].append((len(keyword), payload, whole_word))
+        self._keywords += 1
+        self._outputs = []
+
+    def build(self) -> None:
+        """Compute failure links breadth-first; find() calls this when needed"""
+        outputs: List[Tuple[Tuple[int, Any, bool], ...]] = [()] * len(self._goto)
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            outputs[node] = tuple(self._own[node])
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            for char, following in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                # Parents are dequeued first, so the failure node's outputs are complete
+                outputs[following] = tuple(self._own[following]) + outputs[self._fail[following]]
+                queue.append(following)
+        self._outputs = outputs
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yield (start, end, payload) for every keyword occurrence in text
+
+        Occurrences are reported in order of their end position, longest first.
+        """
+        if not self._outputs:
+            self.build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            end = position + 1
+            for length, payload, whole_word in outputs[node]:
+                start = end - length
+                if whole_word and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                yield start, end, payload
+
+
+def leftmost_longest(matches: List[Tuple[int, int, Any]]) -> List[Tuple[int, int, Any]]:
+    """
+    Keep non-overlapping occurrences, preferring the leftmost and then the longest
+
+    "augmentin 625 duo tablet" is reported once as the full name rather than
+    also as its aliases "augmentin 625 duo" and "augmentin".
+    """
+    selected = []
+    covered = 0
+    for start, end, payload in sorted(matches, key=lambda match: (match[0], -match[1])):
+        if start >= covered:
+            selected.append((start, end, payload))
+            covered = end
+    return selected
@@ -0,0 +1,308 @@
+"""
+Offline OpenFDA Label Store
+
+Read side of a local SQLite copy of the openFDA drug-label dataset, built by
+scripts/database/build_label_store.py from the bulk download files. Labels
+are indexed by set id, by brand and generic name (exact, case-folded), and
+by an FTS5 full-text index over the names and label sections, so
+OpenFDAClient can answer label queries without calling api.fda.gov.
+
+Each label is kept once per set id (the newest effective_time wins) and is
+returned in the openFDA result shape: sections are lists of strings and the
+'openfda' block carries the harmonized names.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LABEL_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'openfda', 'drug-label.sqlite3'
+)
+
+# Label sections kept in the store and searchable with full-text queries
+LABEL_SECTIONS = (
+    'indications_and_usage', 'dosage_and_administration', 'adverse_reactions',
+    'warnings', 'warnings_and_cautions', 'boxed_warning', 'contraindications',
+    'drug_interactions', 'precautions', 'overdosage', 'purpose',
+    'active_ingredient', 'inactive_ingredient', 'do_not_use', 'ask_doctor',
+    'when_using', 'stop_use', 'pregnancy_or_breast_feeding'
+)
+
+# Harmonized 'openfda' fields kept with each label
+OPENFDA_FIELDS = ('brand_name', 'generic_name', 'manufacturer_name', 'product_type', 'route', 'substance_name')
+
+LABEL_COLUMNS = ('set_id', 'label_id', 'effective_time', 'product_type', 'brand_name', 'generic_name', 'openfda') + LABEL_SECTIONS
+
+# Conflict clause keeping the newest version of each label
+LABEL_CONFLICT_SQL = (
+    f"ON CONFLICT(set_id) DO UPDATE SET "
+    f"{', '.join(f'{column} = excluded.{column}' for column in LABEL_COLUMNS[1:])} "
+    f"WHERE excluded.effective_time > labels.effective_time"
+)
+
+UPSERT_LABEL_SQL = (
+    f"INSERT INTO labels ({', '.join(LABEL_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(LABEL_COLUMNS))}) {LABEL_CONFLICT_SQL}"
+)
+
+# openFDA search terms: field:value or field:"quoted value"
+_SEARCH_TERM = re.compile(r'([\w.]+):("[^"]*"|\S+)')
+_AND = re.compile(r'\s+AND\s+|\+AND\+')
+
+
+def create_label_schema(conn: sqlite3.Connection, indexes: bool = True) -> None:
+    """
+    Create the label tables
+
+    Args:
+        conn: Connection to the store (or to an ingestion shard)
+        indexes: Also create the name index and the full-text index, which
+            only the final store needs
+    """
+    sections = ', '.join(f"{section} TEXT NOT NULL DEFAULT ''" for section in LABEL_SECTIONS)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS labels ("
+        "set_id TEXT PRIMARY KEY, label_id TEXT, effective_time TEXT NOT NULL DEFAULT '', "
+        "product_type TEXT NOT NULL DEFAULT '', brand_name TEXT NOT NULL DEFAULT '[]', "
+        f"generic_name TEXT NOT NULL DEFAULT '[]', openfda TEXT NOT NULL DEFAULT '{{}}', {sections})"
+    )
+    if not indexes:
+        return
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS label_names ("
+        "kind TEXT NOT NULL, name TEXT NOT NULL, set_id TEXT NOT NULL, "
+        "PRIMARY KEY (kind, name, set_id)) WITHOUT ROWID"
+    )
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS label_text USING fts5("
+        f"brand_name, generic_name, {', '.join(LABEL_SECTIONS)}, "
+        "content='labels', tokenize='porter unicode61')"
+    )
+
+
+def build_label_indexes(conn: sqlite3.Connection) -> None:
+    """(Re)build the name index and the full-text index from the labels table"""
+    conn.execute("DELETE FROM label_names")
+    for kind in ('brand', 'generic'):
+        conn.execute(
+            "INSERT OR IGNORE INTO label_names (kind, name, set_id) "
+            f"SELECT ?, lower(trim(value)), set_id FROM labels, json_each(labels.{kind}_name)",
+            (kind,)
+        )
+    conn.execute("INSERT INTO label_text(label_text) VALUES ('rebuild')")
+
+
+def label_row(label: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """
+    Convert one raw openFDA label into a labels row
+
+    Returns:
+        Values in LABEL_COLUMNS order, or None for labels without a set id
+    """
+    set_id = label.get('set_id')
+    if not isinstance(set_id, str) or not set_id:
+        return None
+    raw_openfda = label.get('openfda') or {}
+    openfda = {field: raw_openfda[field] for field in OPENFDA_FIELDS if raw_openfda.get(field)}
+    product_type = ' '.join(openfda.get('product_type', []))
+    sections = []
+    for section in LABEL_SECTIONS:
+        value = label.get(section) or ''
+        sections.append('\n\n'.join(value) if isinstance(value, list) else str(value))
+    return (
+        set_id,
+        label.get('id'),
+        str(label.get('effective_time') or ''),
+        product_type,
+        json.dumps(openfda.get('brand_name', [])),
+        json.dumps(openfda.get('generic_name', [])),
+        json.dumps(openfda)
+    ) + tuple(sections)
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class LabelStore:
+    """Read-only, thread-safe access to a built label store"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._fetch_one("SELECT count(*) FROM labels")[0]
+
+    def get(self, set_id: str) -> Optional[Dict[str, Any]]:
+        """Label with this set id"""
+        results = self._select("labels.set_id = ?", [set_id], 1)
+        return results[0] if results else None
+
+    def by_brand_name(self, name: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Newest labels whose brand name is exactly name (case-insensitive)"""
+        return self._select(self._name_clause('brand'), [name.strip().lower()], limit)
+
+    def by_generic_name(self, name: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Newest labels whose generic name is exactly name (case-insensitive)"""
+        return self._select(self._name_clause('generic'), [name.strip().lower()], limit)
+
+    def search(self, text: str, section: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Full-text search over names and label sections, best matches first
+
+        Args:
+            text: Words to find; all must appear
+            section: Restrict the search to one of LABEL_SECTIONS
+            limit: Maximum labels returned
+        """
+        if section is not None and section not in LABEL_SECTIONS:
+            raise ValueError(f"Unknown label section: {section}")
+        words = ' '.join(_fts_phrase(word) for word in text.split())
+        if not words:
+            return []
+        match = f"{section} : ({words})" if section else words
+        rows = self._fetch_all(
+            "SELECT labels.* FROM label_text JOIN labels ON labels.rowid = label_text.rowid "
+            "WHERE label_text MATCH ? ORDER BY bm25(label_text) LIMIT ?",
+            (match, limit)
+        )
+        return [self._document(row) for row in rows]
+
+    def query(self, search: str, limit: int = 1) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer an openFDA label 'search' expression from the store
+
+        Supports terms joined by AND on openfda.brand_name, openfda.generic_name,
+        openfda.product_type, set_id, any of LABEL_SECTIONS and _exists_:<section>.
+        Names match exactly first and then as a phrase, the way openFDA
+        matches analyzed fields.
+
+        Returns:
+            Matching labels, newest first, or None when the expression uses
+            anything the store cannot answer
+        """
+        exact: List[Tuple[str, List[Any]]] = []
+        phrase: List[Tuple[str, List[Any]]] = []
+        for part in _AND.split(search.strip()):
+            match = _SEARCH_TERM.fullmatch(part.strip())
+            if not match:
+                return None
+            field, value = match.group(1), match.group(2).strip('"').replace('+', ' ').strip()
+            if field in ('openfda.brand_name', 'openfda.generic_name'):
+                column = field.split('.', 1)[1]
+                exact.append((self._name_clause(column.split('_')[0]), [value.lower()]))
+                phrase.append((self._fts_clause(), [f"{column} : {_fts_phrase(value)}"]))
+                continue
+            if field == 'set_id':
+                clause = ("labels.set_id = ?", [value])
+            elif field == 'openfda.product_type':
+                clause = ("labels.product_type LIKE ?", [f"%{value}%"])
+            elif field == '_exists_' and value in LABEL_SECTIONS:
+                clause = (f"labels.{value} != ''", [])
+            elif field in LABEL_SECTIONS:
+                clause = (self._fts_clause(), [f"{field} : {_fts_phrase(value)}"])
+            else:
+                return None
+            exact.append(clause)
+            phrase.append(clause)
+
+        results = self._select_all(exact, limit)
+        if not results and phrase != exact:
+            results = self._select_all(phrase, limit)
+        if results:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        return {'labels': len(self), 'hits': self.hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _name_clause(kind: str) -> str:
+        return f"labels.set_id IN (SELECT set_id FROM label_names WHERE kind = '{kind}' AND name = ?)"
+
+    @staticmethod
+    def _fts_clause() -> str:
+        return "labels.rowid IN (SELECT rowid FROM label_text WHERE label_text MATCH ?)"
+
+    def _select_all(self, clauses: Iterable[Tuple[str, List[Any]]], limit: int) -> List[Dict[str, Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        for condition, values in clauses:
+            conditions.append(condition)
+            params.extend(values)
+        return self._select(' AND '.join(conditions) or '1', params, limit)
+
+    def _select(self, condition: str, params: List[Any], limit: int) -> List[Dict[str, Any]]:
+        rows = self._fetch_all(
+            f"SELECT * FROM labels WHERE {condition} ORDER BY effective_time DESC LIMIT ?",
+            tuple(params) + (limit,)
+        )
+        return [self._document(row) for row in rows]
+
+    def _fetch_all(self, sql: str, params: Tuple[Any, ...]) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _fetch_one(self, sql: str) -> sqlite3.Row:
+        with self._lock:
+            return self._conn.execute(sql).fetchone()
+
+    @staticmethod
+    def _document(row: sqlite3.Row) -> Dict[str, Any]:
+        """Rebuild the openFDA result shape from a labels row"""
+        document: Dict[str, Any] = {
+            'set_id': row['set_id'],
+            'id': row['label_id'],
+            'effective_time': row['effective_time'],
+            'openfda': json.loads(row['openfda'])
+        }
+        for section in LABEL_SECTIONS:
+            if row[section]:
+                document[section] = [row[section]]
+        return document
+
+
+_store: Optional[LabelStore] = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_label_store() -> Optional[LabelStore]:
+    """
+    Return the process-wide label store, opened on first use
+
+    The path comes from OPENFDA_LABEL_STORE (default
+    data/openfda/drug-label.sqlite3). Returns None when no store has been built.
+    """
+    global _store, _store_loaded
+    if not _store_loaded:
+        with _store_lock:
+            if not _store_loaded:
+                path = os.getenv('OPENFDA_LABEL_STORE', DEFAULT_LABEL_STORE_PATH)
+                if os.path.exists(path):
+                    try:
+                        _store = LabelStore(path)
+                        logger.info(f"Opened offline label store {path} ({len(_store)} labels)")
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to open label store {path}: {str(e)}")
+                _store_loaded = True
+    return _store
@@ -0,0 +1,161 @@
+"""
+Side Effect Index
+
+Inverted index from normalized side-effect terms to drug ids, built from the
+SideEffects column of the drug catalog. Answers "which medicines cause X"
+questions by intersecting (AND) or merging (OR) sorted posting lists.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import re
+
+from .drug_catalog import DrugCatalog
+
+# Everyday words users type for terms the dataset spells differently
+TERM_SYNONYMS = {
+    'dizzy': 'dizziness',
+    'drowsy': 'drowsiness',
+    'sleepy': 'sleepiness',
+    'nauseous': 'nausea',
+    'nauseated': 'nausea',
+    'tired': 'tiredness',
+    'headaches': 'headache',
+    'rashes': 'rash',
+    'dry mouth': 'dryness in mouth'
+}
+
+# Dataset placeholders that are not side effects
+IGNORED_TERMS = {'no common side effects seen'}
+
+_PARENTHETICAL = re.compile(r'\(.*?(\)|$)')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_OR_OPERATOR = re.compile(r'\bor\b|/')
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a side-effect term: lowercase, parentheticals and punctuation removed"""
+    term = _PARENTHETICAL.sub(' ', term.lower())
+    term = _NON_WORD.sub(' ', term).strip()
+    return TERM_SYNONYMS.get(term, term)
+
+
+def intersect_sorted(left: List[int], right: List[int]) -> List[int]:
+    """Intersect two ascending posting lists"""
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] == right[j]:
+            result.append(left[i])
+            i += 1
+            j += 1
+        elif left[i] < right[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def union_sorted(lists: Iterable[List[int]]) -> List[int]:
+    """Merge ascending posting lists, dropping duplicates"""
+    result = []
+    for drug_id in heapq.merge(*lists):
+        if not result or result[-1] != drug_id:
+            result.append(drug_id)
+    return result
+
+
+class SideEffectIndex:
+    """Inverted index from side-effect terms to ascending lists of drug ids"""
+
+    def __init__(self, postings: Dict[str, List[int]]):
+        self.postings = postings
+        self.max_phrase_words = max((len(term.split(' ')) for term in postings), default=0)
+        # Synonyms are only useful when the term they point to is indexed
+        for synonym, term in TERM_SYNONYMS.items():
+            if term in postings and synonym not in postings:
+                self.max_phrase_words = max(self.max_phrase_words, len(synonym.split(' ')))
+
+    @classmethod
+    def from_catalog(cls, catalog: DrugCatalog) -> 'SideEffectIndex':
+        """Build the index from every record's side effects"""
+        postings: Dict[str, List[int]] = {}
+        for record in sorted(catalog, key=lambda record: record.id):
+            for side_effect in record.side_effects:
+                term = normalize_term(side_effect)
+                if not term or term in IGNORED_TERMS:
+                    continue
+                ids = postings.setdefault(term, [])
+                # A record may list the same term twice (e.g. with different parentheticals)
+                if not ids or ids[-1] != record.id:
+                    ids.append(record.id)
+        return cls(postings)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_term(term) in self.postings
+
+    def terms(self) -> List[str]:
+        return sorted(self.postings)
+
+    def posting_list(self, term: str) -> List[int]:
+        return self.postings.get(normalize_term(term), [])
+
+    def query(self, terms: Iterable[str], operator: str = 'AND') -> List[int]:
+        """
+        Find drugs listing the given side effects
+
+        Args:
+            terms: Side-effect terms, normalized on the way in
+            operator: 'AND' for drugs listing every term, 'OR' for any of them
+
+        Returns:
+            Ascending list of matching drug ids
+        """
+        lists = [self.posting_list(term) for term in terms]
+        if not lists:
+            return []
+
+        if operator.upper() == 'OR':
+            return union_sorted(lists)
+
+        # Start from the shortest list so each intersection step stays small
+        lists.sort(key=len)
+        result = lists[0]
+        for posting in lists[1:]:
+            if not result:
+                break
+            result = intersect_sorted(result, posting)
+        return list(result)
+
+    def parse_query(self, text: str) -> Tuple[List[str], str]:
+        """
+        Extract known side-effect terms and the boolean operator from a question
+
+        "Which medicines cause dizziness or drowsiness?" yields
+        (['dizziness', 'drowsiness'], 'OR'). Longer phrases win over the words
+        they contain, so "stomach pain" is not read as "pain".
+        """
+        operator = 'OR' if _OR_OPERATOR.search(text.lower()) else 'AND'
+        words = _NON_WORD.sub(' ', text.lower()).split()
+
+        terms = []
+        position = 0
+        while position < len(words):
+            match: Optional[str] = None
+            for size in range(min(self.max_phrase_words, len(words) - position), 0, -1):
+                phrase = normalize_term(' '.join(words[position:position + size]))
+                if phrase in self.postings:
+                    match = phrase
+                    position += size
+                    break
+            if match is None:
+                position += 1
+            elif match not in terms:
+                terms.append(match)
+        return terms, operator
+
+    def search(self, text: str) -> Tuple[List[str], str, List[int]]:
+        """Parse a free-text question and run it against the index"""
+        terms, operator = self.parse_query(text)
+        return terms, operator, self.query(terms, operator)
+
@@ -0,0 +1,211 @@
+"""
+Streaming Dataset Reader
+
+Reads medication datasets one record at a time so memory stays flat no
+matter how large the file is. Two layouts are supported: a single JSON
+array of objects (like dynamodb_ready_data.json) and JSON Lines, one object
+per line. Files ending in .gz are decompressed on the fly. An array held in
+one member of a wrapping object (openFDA exports) can be streamed with
+iter_json_field. The stages are plain generators meant to be chained:
+parse, clean, then batch.
+"""
+
+from typing import Any, Dict, IO, Iterable, Iterator, List
+import gzip
+import json
+import math
+
+# Characters read from the file per refill
+CHUNK_SIZE = 1 << 16
+
+JSONL_SUFFIXES = ('.jsonl', '.ndjson', '.jsonl.gz', '.ndjson.gz')
+
+_decoder = json.JSONDecoder()
+
+_DELIMITERS = frozenset(',] \t\r\n')
+
+
+class _StreamDecoder:
+    """Incremental JSON tokenizer over a text stream, refilled in chunks"""
+
+    def __init__(self, stream: IO[str], chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def refill(self, size: int) -> bool:
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at the end of the stream"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.refill(self.chunk_size):
+                return ''
+
+    def expect(self, char: str, message: str) -> None:
+        if self.peek() != char:
+            raise ValueError(message)
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decode the complete JSON value at the current position"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+                # A number may continue in the next chunk unless a delimiter follows it
+                if self.eof or (end < len(self.buffer) and (
+                        isinstance(value, (dict, list, str)) or self.buffer[end] in _DELIMITERS)):
+                    break
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise ValueError("Malformed JSON value")
+            # Grow the read size so one large element is not re-parsed many times
+            self.refill(size)
+            size *= 2
+        self.position = end
+        return value
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position"""
+        self.expect('[', "Expected a JSON array")
+        expect_value = True
+        while True:
+            char = self.peek()
+            if not char:
+                raise ValueError("Unterminated JSON array")
+            if char == ']':
+                self.position += 1
+                return
+            if not expect_value:
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+                self.position += 1
+                expect_value = True
+                continue
+            try:
+                value = self.value()
+            except ValueError:
+                raise ValueError("Malformed JSON array element")
+            expect_value = False
+            yield value
+
+
+def iter_json_array(stream: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array without loading it whole
+
+    Args:
+        stream: Text stream positioned at the start of the array
+        chunk_size: Characters read per refill
+
+    Raises:
+        ValueError: If the stream is not a well-formed JSON array
+    """
+    yield from _StreamDecoder(stream, chunk_size).array_items()
+
+
+def iter_json_field(stream: IO[str], field: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of the array stored under one key of a top-level object
+
+    Used for exports shaped like {"meta": {...}, "results": [...]}: other
+    members are decoded and discarded, so they should be small.
+
+    Raises:
+        ValueError: If the stream is not a JSON object or the field is not an array
+    """
+    decoder = _StreamDecoder(stream, chunk_size)
+    decoder.expect('{', "Expected a JSON object")
+    if decoder.peek() == '}':
+        return
+    while True:
+        key = decoder.value()
+        if not isinstance(key, str):
+            raise ValueError("Expected a string key in JSON object")
+        decoder.expect(':', "Expected ':' in JSON object")
+        if key == field and decoder.peek() == '[':
+            yield from decoder.array_items()
+        else:
+            decoder.value()
+        char = decoder.peek()
+        if char == '}':
+            return
+        decoder.expect(',', f"Expected ',' or '}}' in JSON object, found {char!r}")
+
+
+def iter_json_lines(stream: IO[str]) -> Iterator[Any]:
+    """Yield one parsed value per non-empty line"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Malformed JSON on line {line_number}: {str(e)}")
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a JSON array or JSON Lines file
+
+    The layout comes from the file name (.jsonl/.ndjson) or, failing that,
+    from the first non-whitespace character.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as stream:
+        if path.endswith(JSONL_SUFFIXES):
+            yield from iter_json_lines(stream)
+            return
+        first = stream.read(1)
+        while first and first.isspace():
+            first = stream.read(1)
+        stream.seek(0)
+        if first == '[':
+            yield from iter_json_array(stream)
+        else:
+            yield from iter_json_lines(stream)
+
+
+def replace_non_finite(value: Any) -> Any:
+    """Replace NaN and Infinity (which the dataset uses for missing values) with None"""
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [replace_non_finite(item) for item in value]
+    return value
+
+
+def clean_records(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Pipeline stage: drop non-object rows and null out non-finite numbers"""
+    for record in records:
+        if isinstance(record, dict):
+            yield replace_non_finite(record)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Pipeline stage: group items into lists of at most size"""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
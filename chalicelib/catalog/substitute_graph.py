@@ -0,0 +1,123 @@
+"""
+Substitute Graph
+
+Adjacency structure linking each catalog drug to the substitutes listed in
+its Substitute field and back. Substitute names are resolved to catalog
+entries where possible; the rest become external nodes. All name resolution
+happens at build time, so a lookup only walks precomputed neighbor tuples.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+
+from .drug_catalog import DrugCatalog, normalize_name
+
+
+class SubstituteGraph:
+    """
+    Undirected substitute graph over catalog drugs and external products
+
+    Catalog drugs use their catalog id as node id; substitutes that are not
+    in the catalog get negative node ids.
+    """
+
+    def __init__(self):
+        self.substitutes: Dict[int, Tuple[int, ...]] = {}
+        self.substituted_by: Dict[int, Tuple[int, ...]] = {}
+        self.neighbors: Dict[int, Tuple[int, ...]] = {}
+        self.node_names: Dict[int, str] = {}
+        self.node_by_name: Dict[str, int] = {}
+
+    @classmethod
+    def from_catalog(cls, catalog: DrugCatalog) -> 'SubstituteGraph':
+        """Build the graph from every record's Substitute field"""
+        graph = cls()
+        forward: Dict[int, List[int]] = {}
+        reverse: Dict[int, List[int]] = {}
+
+        for record in catalog:
+            graph._add_node(record.id, record.display_name, record.normalized_name)
+
+        for record in catalog:
+            targets = forward.setdefault(record.id, [])
+            for name in record.substitutes:
+                node = graph._resolve(catalog, name)
+                if node == record.id or node in targets:
+                    continue
+                targets.append(node)
+                reverse.setdefault(node, []).append(record.id)
+
+        graph.substitutes = {node: tuple(targets) for node, targets in forward.items() if targets}
+        graph.substituted_by = {node: tuple(sources) for node, sources in reverse.items()}
+        for node in graph.node_names:
+            merged = list(graph.substitutes.get(node, ()))
+            merged.extend(source for source in graph.substituted_by.get(node, ()) if source not in merged)
+            if merged:
+                graph.neighbors[node] = tuple(merged)
+        return graph
+
+    def _add_node(self, node: int, display_name: str, key: str) -> None:
+        self.node_names[node] = display_name
+        self.node_by_name.setdefault(key, node)
+
+    def _resolve(self, catalog: DrugCatalog, name: str) -> int:
+        """Map a substitute name to a catalog id, or to an external node"""
+        key = normalize_name(name)
+        node = self.node_by_name.get(key)
+        if node is not None:
+            return node
+
+        # Only trust an alias when it points at a single catalog entry
+        matches = catalog.get_by_alias(key)
+        if len(matches) == 1:
+            node = matches[0].id
+        else:
+            node = -(len(self.node_names) + 1)
+            self.node_names[node] = name.strip()
+        self.node_by_name[key] = node
+        return node
+
+    def __len__(self) -> int:
+        return len(self.node_names)
+
+    def find_node(self, name: str) -> Optional[int]:
+        return self.node_by_name.get(normalize_name(name))
+
+    def name_of(self, node: int) -> str:
+        return self.node_names[node]
+
+    def is_catalog_node(self, node: int) -> bool:
+        return node > 0
+
+    def alternatives(self, node: int) -> Tuple[int, ...]:
+        """One-hop substitutes in either direction, in O(degree)"""
+        return self.neighbors.get(node, ())
+
+    def alternatives_within(self, node: int, max_hops: int = 2, limit: int = 50) -> List[Tuple[int, int]]:
+        """
+        Bounded breadth-first walk over the substitute graph
+
+        Args:
+            node: Starting node id
+            max_hops: Maximum distance from the starting node
+            limit: Maximum number of nodes to return
+
+        Returns:
+            (node, hops) pairs ordered by distance, excluding the start node
+        """
+        seen = {node}
+        found: List[Tuple[int, int]] = []
+        queue = deque([(node, 0)])
+        while queue and len(found) < limit:
+            current, hops = queue.popleft()
+            if hops >= max_hops:
+                continue
+            for neighbor in self.neighbors.get(current, ()):
+                if neighbor in seen:
+                    continue
+                seen.add(neighbor)
+                found.append((neighbor, hops + 1))
+                if len(found) >= limit:
+                    break
+                queue.append((neighbor, hops + 1))
+        return found
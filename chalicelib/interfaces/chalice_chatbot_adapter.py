@@ -1,6 +1,29 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from core.interfaces.chatbot_interface import ChatbotInterface as CoreChatbotInterface
+from core.orchestration.job_runner import ThreadJobRunner
+from core.orchestration.job_store import InMemoryJobStore
+from core.orchestration.lazy_service import LazyService
+from core.services.job_runner_interface import JobRunner
+from core.services.job_store_interface import JobStore, JOB_PENDING, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
 from ..orchestration.chalice_query_handler import ChaliceQueryHandler
+from ..services.dynamodb_job_store import DynamoDBJobStore
+from ..services.lambda_job_runner import LambdaJobRunner
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class JobsUnavailable(RuntimeError):
+    """Asynchronous jobs are not configured for this environment"""
+
+
+def running_on_lambda() -> bool:
+    return bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+
 
 class ChatbotInterface:
     """
@@ -9,9 +32,38 @@ class ChatbotInterface:
     This class serves as an adapter between the Chalice framework and pure business logic.
     It performs API-specific processing and delegates core business logic to the core package.
     """
+    # Built on the first job request, so plain chat requests never touch DynamoDB
+    job_store: JobStore = LazyService()
+    job_runner: JobRunner = LazyService()
+
     def __init__(self):
         # Use the Chalice-specific QueryHandler directly instead of the core interface
         self.query_handler = ChaliceQueryHandler()
+        self.batch_workers = int(os.getenv('CHAT_BATCH_WORKERS', '8'))
+        self.job_workers = int(os.getenv('CHAT_JOB_WORKERS', '4'))
+
+    def _create_job_store(self) -> JobStore:
+        ttl = float(os.getenv('JOB_TTL', '3600'))
+        if os.getenv('JOB_STORE', 'memory').lower() == 'dynamodb':
+            return DynamoDBJobStore(ttl=ttl)
+        # Each Lambda container has its own memory, so a poll served by
+        # another container would never find the job
+        if running_on_lambda():
+            raise JobsUnavailable("JOB_STORE=dynamodb is required on Lambda")
+        return InMemoryJobStore(ttl=ttl)
+
+    def _create_job_runner(self) -> JobRunner:
+        default = 'lambda' if running_on_lambda() else 'thread'
+        runner = os.getenv('JOB_RUNNER', default).lower()
+        if runner == 'lambda':
+            lambda_runner = LambdaJobRunner()
+            if not lambda_runner.function_name:
+                raise JobsUnavailable("CHAT_JOB_FUNCTION is required for JOB_RUNNER=lambda")
+            return lambda_runner
+        # Lambda freezes the container after the response, stalling in-process threads
+        if running_on_lambda():
+            raise JobsUnavailable("JOB_RUNNER=thread only works outside Lambda")
+        return ThreadJobRunner(self.run_job, self.job_workers)
 
     def handle_user_input(self, user_input: str, language: str = "auto") -> Dict[str, Any]:
         """
@@ -32,6 +84,84 @@ class ChatbotInterface:
             source_lang=language
         )
         
+    def handle_batch(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Process many (message, language) pairs concurrently
+        Args:
+            items: Validated messages with their source language codes
+        Returns:
+            One result per item, in input order: {'status': 'success',
+            'response': ...} or {'status': 'error', 'error': ...}
+        """
+        # Identical items are processed once and share the result
+        unique = list(dict.fromkeys((message.strip(), language) for message, language in items))
+
+        def run(item: Tuple[str, str]) -> Dict[str, Any]:
+            try:
+                response = self.handle_user_input(*item)
+                response.pop('timings', None)
+                return {'status': 'success', 'response': response}
+            except Exception as e:
+                logger.error(f"Batch item failed: {str(e)}", exc_info=True)
+                return {'status': 'error', 'error': 'Internal server error'}
+
+        workers = max(1, min(self.batch_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chat-batch') as executor:
+            results = dict(zip(unique, executor.map(run, unique)))
+        return [dict(results[(message.strip(), language)]) for message, language in items]
+
+    def submit_job(self, user_input: str, language: str = "auto") -> Dict[str, Any]:
+        """
+        Queue user input for background processing
+        Args:
+            user_input: User text input
+            language: Source language code (default: auto-detect)
+        Returns:
+            The new job record; poll it with get_job using its job_id
+        Raises:
+            JobsUnavailable: The job store or runner is not configured
+        """
+        # Resolve both before recording a job nothing could run
+        job_store, job_runner = self.job_store, self.job_runner
+        job_id = uuid.uuid4().hex
+        record = {
+            'job_id': job_id,
+            'status': JOB_PENDING,
+            'message': user_input,
+            'language': language,
+            'created_at': datetime.utcnow().isoformat() + 'Z'
+        }
+        job_store.put(job_id, record)
+        job_store.cleanup()
+        try:
+            job_runner.submit(job_id, user_input, language)
+        except Exception:
+            job_store.update(job_id, {
+                'status': JOB_FAILED,
+                'error': 'Could not start job',
+                'finished_at': datetime.utcnow().isoformat() + 'Z'
+            })
+            raise
+        return record
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current job record, or None if the job is unknown or expired"""
+        return self.job_store.get(job_id)
+
+    def run_job(self, job_id: str, user_input: str, language: str) -> None:
+        """Run a submitted job and record its outcome in the job store"""
+        self.job_store.update(job_id, {'status': JOB_RUNNING})
+        try:
+            response = self.handle_user_input(user_input, language)
+            response.pop('timings', None)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            update = {'status': JOB_FAILED, 'error': 'Internal server error'}
+        else:
+            update = {'status': JOB_SUCCEEDED, 'result': response}
+        update['finished_at'] = datetime.utcnow().isoformat() + 'Z'
+        self.job_store.update(job_id, update)
+
     def format_response(self, response_data: Dict[str, Any]) -> str:
         """
         Format the API response data
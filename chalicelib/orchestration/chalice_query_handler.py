@@ -5,10 +5,14 @@ Extends the QueryHandler from core to integrate with AWS services.
 """
 
 from core.orchestration.query_handler_interface import QueryHandler
+from core.services.intent_recognition_interface import IntentRecognitionService
+from core.services.session_backend_interface import SessionBackend
 from ..services.aws_translation_service import AWSTranslationService
 from ..services.chalice_intent_recognition import ChaliceIntentRecognitionService
 from ..services.chalice_medical_info import ChalliceMedicalInfoService
+from ..services.dynamodb_session_backend import DynamoDBSessionBackend
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +21,37 @@ class ChaliceQueryHandler(QueryHandler):
     
     def __init__(self):
         super().__init__()
-        # Replace core services with AWS implementations
-        self.translation_service = AWSTranslationService()
-        self.intent_service = ChaliceIntentRecognitionService()
-        self.medical_service = ChalliceMedicalInfoService()
-        
+        # Per-stage timings for the Server-Timing header and the slow-query log
+        self.stage_timing = os.getenv('STAGE_TIMING', 'false').lower() in ('1', 'true', 'yes')
+        slow_query_ms = os.getenv('SLOW_QUERY_MS')
+        self.slow_query_threshold_ms = float(slow_query_ms) if slow_query_ms else None
+
+    # AWS implementations of the core services, built on first use
+    def _create_translation_service(self) -> AWSTranslationService:
+        return AWSTranslationService()
+
+    def _create_intent_service(self) -> IntentRecognitionService:
+        # INTENT_BACKEND=local uses the trained NumPy classifier, falling back to the keyword rules
+        if os.getenv('INTENT_BACKEND', 'rules').lower() == 'local':
+            try:
+                from ..services.local_intent_recognition import LocalIntentRecognitionService
+                service = LocalIntentRecognitionService()
+                if os.path.exists(service.model_path):
+                    return service
+                logger.error(f"Intent model {service.model_path} not found, using keyword rules")
+            except ImportError as e:
+                logger.error(f"Local intent classifier unavailable, using keyword rules: {str(e)}")
+        return ChaliceIntentRecognitionService()
+
+    def _create_medical_service(self) -> ChalliceMedicalInfoService:
+        return ChalliceMedicalInfoService()
+
+    def _create_session_store(self) -> SessionBackend:
+        # Share sessions across containers when configured; in-memory otherwise
+        if os.getenv('SESSION_BACKEND', 'memory').lower() == 'dynamodb':
+            return DynamoDBSessionBackend(timeout=self.session_timeout.total_seconds())
+        return super()._create_session_store()
+
     def initialize(self):
         """Initialize AWS service connections"""
         super().initialize()
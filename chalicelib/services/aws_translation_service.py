@@ -2,28 +2,52 @@
 AWS Translate Service Implementation
 
 Implements the TranslationService interface using AWS Translate.
+Many short strings can be packed into a single TranslateText request with
+numbered markers and split back apart afterwards.
 """
 
-from typing import Tuple
-import boto3
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 import os
-from dotenv import load_dotenv
+import re
+from core.orchestration.lazy_service import LazyService
 from core.services.translation_service_interface import TranslationService
-
-# Load environment variables
-load_dotenv()
+from ..utils.single_flight import SingleFlight
+from .translation_cache import TranslationCache
 
 logger = logging.getLogger(__name__)
 
+# Marker placed before each packed segment; numbered brackets survive translation
+SEGMENT_MARKER = "[[{index}]]"
+SEGMENT_MARKER_PATTERN = re.compile(r'\[\[\s*(\d+)\s*\]\]')
+
+# AWS Translate accepts at most 10,000 bytes of UTF-8 text per TranslateText call
+DEFAULT_MAX_REQUEST_BYTES = 9000
+
 class AWSTranslationService(TranslationService):
     """AWS Translate Service Implementation"""
+
+    # boto3 client, created on the first call that needs AWS Translate
+    translate_client = LazyService()
     
-    def __init__(self):
+    def __init__(self, cache: Optional[TranslationCache] = None):
+        # Concurrent identical translations share one AWS Translate call
+        self.flight = SingleFlight()
+        # Memory + disk cache of previous translations
+        self.cache = cache if cache is not None else TranslationCache(
+            memory_size=int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+        )
+        self.max_request_bytes = int(os.getenv('TRANSLATE_MAX_REQUEST_BYTES', str(DEFAULT_MAX_REQUEST_BYTES)))
+        # TranslateText round trips made by this service
+        self.api_calls = 0
+    
+    def _create_translate_client(self) -> Any:
+        # boto3 takes a noticeable share of Lambda init time, so import it here
+        import boto3
         # Get region from environment variables, with fallback to default
         region_name = os.getenv('TRANSLATE_REGION', os.getenv('AWS_REGION', 'us-east-1'))
-        self.translate_client = boto3.client('translate', region_name=region_name)
-    
+        return boto3.client('translate', region_name=region_name)
+
     def translate(self, text: str, source_lang: str = "auto", target_lang: str = "en") -> Tuple[str, str]:
         """
         Translate text using AWS Translate
@@ -39,16 +63,135 @@ class AWSTranslationService(TranslationService):
         try:
             # Use AWS Translate's auto-detect if source language is 'auto'
             aws_source_lang = 'auto' if source_lang == 'auto' else source_lang
+
+            cached = self.cache.get(text, aws_source_lang, target_lang)
+            if cached is not None:
+                return cached
             
-            response = self.translate_client.translate_text(
-                Text=text,
-                SourceLanguageCode=aws_source_lang,
-                TargetLanguageCode=target_lang
+            return self.flight.do(
+                (text, aws_source_lang, target_lang),
+                self._translate_uncached,
+                text,
+                aws_source_lang,
+                target_lang
             )
-            
-            return response['TranslatedText'], response['SourceLanguageCode']
         
         except Exception as e:
             logger.error(f"AWS Translate error: {str(e)}")
             # Return original text if error occurs
-            return text, source_lang 
\ No newline at end of file
+            return text, source_lang
+
+    def translate_batch(self, texts: List[str], source_lang: str = "auto", target_lang: str = "en") -> List[str]:
+        """
+        Translate many short strings with as few AWS Translate calls as possible
+
+        Cached segments are served from the translation cache. The rest are
+        packed into requests under the byte limit, each segment preceded by a
+        numbered marker, and split back apart on the markers. A pack whose
+        markers do not come back intact is retried one segment at a time.
+
+        Args:
+            texts: Segments to translate
+            source_lang: Source language code (default: auto-detect)
+            target_lang: Target language code (default: English)
+
+        Returns:
+            Translated segments in input order (originals for blank segments
+            or when translation fails)
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        for position, text in enumerate(texts):
+            if not text or not text.strip():
+                results[position] = text
+                continue
+            cached = self.cache.get(text, source_lang, target_lang)
+            if cached is not None:
+                results[position] = cached[0]
+            else:
+                pending.setdefault(text, []).append(position)
+
+        for pack in self._pack_segments(list(pending)):
+            for text, translated in zip(pack, self._translate_pack(pack, source_lang, target_lang)):
+                for position in pending[text]:
+                    results[position] = translated
+        return results
+
+    def _pack_segments(self, segments: List[str]) -> List[List[str]]:
+        """Greedily group segments into packs that fit one request"""
+        packs: List[List[str]] = []
+        current: List[str] = []
+        current_bytes = 0
+        for segment in segments:
+            size = len(segment.encode('utf-8')) + len(SEGMENT_MARKER.format(index=len(current))) + 2
+            # Segments that already contain a marker or fill a request alone travel alone
+            if SEGMENT_MARKER_PATTERN.search(segment) or size >= self.max_request_bytes:
+                packs.append([segment])
+                continue
+            if current and current_bytes + size > self.max_request_bytes:
+                packs.append(current)
+                current, current_bytes = [], 0
+                size = len(segment.encode('utf-8')) + len(SEGMENT_MARKER.format(index=0)) + 2
+            current.append(segment)
+            current_bytes += size
+        if current:
+            packs.append(current)
+        return packs
+
+    def _translate_pack(self, pack: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Translate one pack, falling back to per-segment calls if it can't be re-aligned"""
+        if len(pack) == 1:
+            return [self.translate(pack[0], source_lang, target_lang)[0]]
+
+        packed = "\n".join(
+            f"{SEGMENT_MARKER.format(index=index)} {segment}" for index, segment in enumerate(pack)
+        )
+        try:
+            translated, detected_lang = self.flight.do(
+                (packed, source_lang, target_lang),
+                self._call_translate,
+                packed,
+                source_lang,
+                target_lang
+            )
+            segments = self._split_packed(translated, len(pack))
+        except Exception as e:
+            logger.error(f"AWS Translate error for packed request: {str(e)}")
+            segments = None
+
+        if segments is None:
+            logger.warning(f"Could not re-align {len(pack)} packed segments, translating them one by one")
+            return [self.translate(segment, source_lang, target_lang)[0] for segment in pack]
+
+        for segment, translated_segment in zip(pack, segments):
+            self.cache.put(segment, source_lang, target_lang, translated_segment, detected_lang)
+        return segments
+
+    def _split_packed(self, translated: str, expected: int) -> Optional[List[str]]:
+        """Split a translated pack on its markers; None unless markers 0..expected-1 appear in order"""
+        parts = SEGMENT_MARKER_PATTERN.split(translated)
+        # parts = [prefix, index0, text0, index1, text1, ...]
+        if parts[0].strip() or len(parts) != 2 * expected + 1:
+            return None
+        segments = []
+        for position in range(expected):
+            if int(parts[1 + 2 * position]) != position:
+                return None
+            segments.append(parts[2 + 2 * position].strip())
+        return segments
+
+    def _call_translate(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """Make one TranslateText round trip"""
+        self.api_calls += 1
+        response = self.translate_client.translate_text(
+            Text=text,
+            SourceLanguageCode=source_lang,
+            TargetLanguageCode=target_lang
+        )
+        return response['TranslatedText'], response['SourceLanguageCode']
+
+    def _translate_uncached(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """Call AWS Translate and remember the result"""
+        result = self._call_translate(text, source_lang, target_lang)
+        self.cache.put(text, source_lang, target_lang, *result)
+        return result
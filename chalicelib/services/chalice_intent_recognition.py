@@ -1,64 +1,192 @@
 """
 Chalice Intent Recognition Service Implementation
 
-This service implements the IntentRecognitionService interface using AWS services.
+This service implements the IntentRecognitionService interface with local
+keyword rules. A single keyword automaton holds the intent cue words and
+every medication name and alias in the drug catalog, so one pass over the
+query finds the intent cues and fills the medication slots.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set, Tuple
+from core.orchestration.lazy_service import LazyService
 from core.services.intent_recognition_interface import IntentRecognitionService
+from ..catalog.drug_catalog import DrugCatalog, get_drug_catalog, normalize_name
+from ..catalog.keyword_automaton import KeywordAutomaton, leftmost_longest
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cue words, matched anywhere in the query (so "reactions" and "dosages" count)
+INTENT_CUES = {
+    'which': 'question',
+    'what': 'question',
+    'instead': 'substitute',
+    'substitute': 'substitute',
+    'alternative': 'substitute',
+    'side effect': 'side_effect',
+    'reaction': 'side_effect',
+    'dose': 'dosage',
+    'dosage': 'dosage'
+}
+
+# Cue words matched as whole words only ("because" is not a "cause")
+WHOLE_WORD_CUES = {
+    'cause': 'cause',
+    'causes': 'cause',
+    'caused': 'cause',
+    'causing': 'cause'
+}
+
+# Generic and brand names outside the catalog that the curated entries and
+# OpenFDA answer for
+COMMON_MEDICATIONS = (
+    'acetaminophen', 'advil', 'amlodipine', 'amoxicillin', 'aspirin', 'atorvastatin',
+    'azithromycin', 'cetirizine', 'clopidogrel', 'diphenhydramine', 'gabapentin',
+    'ibuprofen', 'levothyroxine', 'lisinopril', 'loratadine', 'losartan', 'metformin',
+    'motrin', 'naproxen', 'omeprazole', 'pantoprazole', 'paracetamol', 'prednisone',
+    'sertraline', 'simvastatin', 'tylenol', 'warfarin'
+)
+
+# Shorter aliases ("air", "af") are mostly everyday words, not medication mentions
+MIN_ALIAS_LENGTH = 4
+
 class ChaliceIntentRecognitionService(IntentRecognitionService):
-    """AWS Lex-based implementation of the intent recognition service"""
-    
-    def __init__(self):
-        # Initialize AWS services or other dependencies here
-        pass
-        
+    """Keyword-rule implementation of the intent recognition service"""
+
+    # Built on the first query, so creating the service doesn't load the catalog
+    automaton = LazyService()
+
+    def __init__(self, catalog: Optional[DrugCatalog] = None):
+        """
+        Args:
+            catalog: Catalog whose names and aliases are recognized as
+                medications (defaults to the process-wide drug catalog)
+        """
+        self._catalog = catalog
+
+    def _create_automaton(self) -> KeywordAutomaton:
+        automaton = KeywordAutomaton()
+        for cue, kind in INTENT_CUES.items():
+            automaton.add(cue, ('cue', kind))
+        for cue, kind in WHOLE_WORD_CUES.items():
+            automaton.add(cue, ('cue', kind), whole_word=True)
+
+        catalog = self._catalog
+        if catalog is None:
+            try:
+                catalog = get_drug_catalog()
+            except Exception as e:
+                logger.error(f"Failed to load drug catalog, medication slots disabled: {str(e)}")
+                catalog = DrugCatalog([])
+        medications = set(COMMON_MEDICATIONS)
+        medications.update(catalog.by_name)
+        medications.update(alias for alias in catalog.by_alias if len(alias) >= MIN_ALIAS_LENGTH)
+        for name in medications:
+            automaton.add(name, ('medication', name), whole_word=True)
+        logger.info(f"Built intent keyword automaton with {len(automaton)} keywords")
+        return automaton
+
+    def _matches(self, query: str) -> Tuple[str, Set[str], List[Tuple[int, int, Any]]]:
+        """Normalized query, cue kinds and leftmost-longest medication mentions"""
+        text = normalize_name(query)
+        cues = set()
+        mentions = []
+        for start, end, (kind, value) in self.automaton.find(text):
+            if kind == 'cue':
+                cues.add(value)
+            else:
+                mentions.append((start, end, value))
+        return text, cues, leftmost_longest(mentions)
+
+    def scan(self, query: str) -> Dict[str, Any]:
+        """
+        Find the intent cues and medication mentions in a query in one pass
+
+        Returns:
+            {'cues': set of cue kinds, 'medications': names in query order};
+            overlapping names keep the leftmost, longest one
+        """
+        _, cues, mentions = self._matches(query)
+        medications: List[str] = []
+        for _, _, name in mentions:
+            if name not in medications:
+                medications.append(name)
+        return {'cues': cues, 'medications': medications}
+
+    def mask_medications(self, query: str, placeholder: str = 'MEDICATION') -> Tuple[str, List[str]]:
+        """
+        Replace every medication mention with a placeholder
+
+        Returns:
+            The normalized (lowercase) query with mentions replaced, and the
+            names replaced, in order
+        """
+        text, _, mentions = self._matches(query)
+        parts = []
+        names = []
+        position = 0
+        for start, end, name in mentions:
+            parts.append(text[position:start])
+            parts.append(placeholder)
+            names.append(name)
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), names
+
+    def slots_for(self, intent: str, query: str, medications: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Slots for a recognized intent
+
+        Args:
+            intent: Recognized intent name
+            query: User input query
+            medications: Medications named in the query, scanned when not given
+        """
+        if intent == 'FindDrugsBySideEffect':
+            return {'side_effect_query': query}
+        if medications is None:
+            medications = self.scan(query)['medications']
+        if medications:
+            return {'medication': medications[0], 'medications': medications}
+        # Handlers that need a medication get the placeholder they default to
+        return {} if intent == 'GeneralMedicationInfo' else {'medication': 'generic'}
+
     def recognize_intent(self, query: str) -> Dict[str, Any]:
         """
-        Recognize intent from user query using AWS Lex
-        
+        Recognize intent from user query using keyword rules
+
         Args:
             query: User input query
-            
+
         Returns:
-            Dictionary containing recognized intent and related data
+            Dictionary containing recognized intent and related data; the
+            'medication' slot holds the first medication named and
+            'medications' all of them
         """
         try:
-            # Here would be AWS Lex implementation
-            # For now, return dummy data
-            
-            # Simple keyword matching for demo purposes
-            if "side effect" in query.lower() or "reaction" in query.lower():
-                return {
-                    'intent': 'GetSideEffects',
-                    'confidence': 0.9,
-                    'slots': {
-                        'medication': 'generic'
-                    }
-                }
-            elif "dose" in query.lower() or "dosage" in query.lower():
-                return {
-                    'intent': 'GetDosageInfo',
-                    'confidence': 0.85,
-                    'slots': {
-                        'medication': 'generic'
-                    }
-                }
+            found = self.scan(query)
+            cues = found['cues']
+            # "What side effects can aspirin cause?" asks about one medication
+            if 'cause' in cues and 'question' in cues and not found['medications']:
+                intent, confidence = 'FindDrugsBySideEffect', 0.8
+            elif 'substitute' in cues:
+                intent, confidence = 'GetSubstitutes', 0.8
+            elif 'side_effect' in cues:
+                intent, confidence = 'GetSideEffects', 0.9
+            elif 'dosage' in cues:
+                intent, confidence = 'GetDosageInfo', 0.85
             else:
-                return {
-                    'intent': 'GeneralMedicationInfo',
-                    'confidence': 0.7,
-                    'slots': {}
-                }
-                
+                intent, confidence = 'GeneralMedicationInfo', 0.7
+            return {
+                'intent': intent,
+                'confidence': confidence,
+                'slots': self.slots_for(intent, query, found['medications'])
+            }
+
         except Exception as e:
             logger.error(f"Error in intent recognition: {str(e)}")
             return {
                 'intent': 'unknown',
                 'confidence': 0.0,
                 'slots': {}
-            } 
\ No newline at end of file
+            }
@@ -4,16 +4,15 @@ Chalice Medical Information Service Implementation
 This service implements the MedicalInfoService interface using AWS services and OpenFDA API.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from core.services.medical_info_interface import MedicalInfoService
+from ..catalog.drug_catalog import DrugCatalog, DrugRecord, get_drug_catalog
+from ..catalog.side_effect_index import SideEffectIndex
+from ..catalog.substitute_graph import SubstituteGraph
+from ..catalog.fuzzy_matcher import FuzzyMatcher
+from .openfda_client import get_openfda_client
 import logging
-import requests
 import json
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +20,52 @@ class ChalliceMedicalInfoService(MedicalInfoService):
     """AWS-based implementation of medical information service"""
     
     def __init__(self):
-        self.openfda_api_key = os.getenv('OPENFDA_API_KEY', '')
-        self.api_base_url = "https://api.fda.gov/drug"
-        self.drug_database = {}  # In-memory cache, would use DynamoDB in production
+        self.openfda_client = get_openfda_client()
+        self.drug_database = {}  # Curated entries with dosage details
+        self._curated_matcher = FuzzyMatcher([])
+        self._catalog: Optional[DrugCatalog] = None
+        self._side_effect_index: Optional[SideEffectIndex] = None
+        self._substitute_graph: Optional[SubstituteGraph] = None
+        self.max_listed_drugs = 10
         
     def initialize(self):
         """Initialize the service"""
         logger.info("Initializing medical information service with OpenFDA API")
         # Pre-load some common medications
         self._load_common_medications()
+        # Warm the drug catalog so the first request doesn't pay for loading it
+        _ = self.catalog
         
     def cleanup(self):
         """Clean up resources"""
         logger.info("Cleaning up medical information service")
         # Clear in-memory cache
         self.drug_database = {}
+
+    @property
+    def catalog(self) -> DrugCatalog:
+        """Drug catalog built from the processed dataset, loaded once per process"""
+        if self._catalog is None:
+            try:
+                self._catalog = get_drug_catalog()
+            except Exception as e:
+                logger.error(f"Failed to load drug catalog: {str(e)}")
+                self._catalog = DrugCatalog([])
+        return self._catalog
+
+    @property
+    def side_effect_index(self) -> SideEffectIndex:
+        """Inverted side-effect index over the catalog, built on first use"""
+        if self._side_effect_index is None:
+            self._side_effect_index = SideEffectIndex.from_catalog(self.catalog)
+        return self._side_effect_index
+
+    @property
+    def substitute_graph(self) -> SubstituteGraph:
+        """Substitute adjacency graph over the catalog, built on first use"""
+        if self._substitute_graph is None:
+            self._substitute_graph = SubstituteGraph.from_catalog(self.catalog)
+        return self._substitute_graph
         
     def get_medical_info(self, intent_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -65,6 +95,10 @@ class ChalliceMedicalInfoService(MedicalInfoService):
                 return self._get_dosage_info(medication)
             elif intent == 'GetDrugInteractions':
                 return self._get_drug_interactions(medication)
+            elif intent == 'FindDrugsBySideEffect':
+                return self._find_drugs_by_side_effect(intent_data.get('slots', {}))
+            elif intent == 'GetSubstitutes':
+                return self._get_substitutes(medication, intent_data.get('slots', {}).get('max_hops', 1))
             else:
                 # General medication info
                 return self._get_general_info(medication)
@@ -97,10 +131,51 @@ class ChalliceMedicalInfoService(MedicalInfoService):
                 "dosage": "Adults: 200-400 mg every 4-6 hours as needed, not to exceed 1,200 mg per day."
             }
         }
+        self._curated_matcher = FuzzyMatcher(self.drug_database)
+
+    def _curated_name(self, medication: str) -> str:
+        """Map a curated generic or brand name (e.g. "Advil") to its entry; anything else is returned lowercased"""
+        medication = medication.lower()
+        if medication in self.drug_database:
+            return medication
+        for name, info in self.drug_database.items():
+            if medication in (brand.lower() for brand in info['brand_names']):
+                return name
+        return medication
+
+    def _find_catalog_entry(self, medication: str) -> Optional[DrugRecord]:
+        """Find a medication in the drug catalog by its exact name or alias"""
+        return self.catalog.lookup(medication)
+
+    def _suggestions(self, medication: str) -> List[str]:
+        """Curated and catalog names spelled close to an unknown medication"""
+        names = [name for name, _ in self._curated_matcher.match(medication.lower(), limit=3)]
+        names.extend(record.display_name for record in self.catalog.suggest(medication, limit=3))
+        return names
+
+    def _not_found(self, medication: str, response: str) -> Dict[str, Any]:
+        """
+        Reply for a medication no exact source knows
+
+        Close spellings are offered as a question rather than answered for: a
+        one-letter slip can name a different drug.
+        """
+        suggestions = self._suggestions(medication)
+        if suggestions:
+            return {
+                'status': 'success',
+                'response': f"I couldn't find {medication}. Did you mean {' or '.join(suggestions)}?",
+                'data': {'medication': medication, 'suggestions': suggestions}
+            }
+        return {
+            'status': 'success',
+            'response': response,
+            'data': {}
+        }
             
     def _get_side_effects(self, medication: str) -> Dict[str, Any]:
         """Get side effects for a specific medication"""
-        medication = medication.lower()
+        medication = self._curated_name(medication)
         
         # Check in-memory database first
         if medication in self.drug_database:
@@ -112,33 +187,42 @@ class ChalliceMedicalInfoService(MedicalInfoService):
                     'side_effects': self.drug_database[medication]['side_effects']
                 }
             }
+
+        record = self._find_catalog_entry(medication)
+        if record is not None:
+            side_effects = ", ".join(record.side_effects) or "No common side effects reported"
+            return {
+                'status': 'success',
+                'response': f"Side effects of {record.display_name}: {side_effects}",
+                'data': {
+                    'medication': record.name,
+                    'side_effects': record.side_effects,
+                    'source': 'catalog'
+                }
+            }
             
         # Query OpenFDA API if not in local database
         try:
-            url = f"{self.api_base_url}/label.json?search=openfda.generic_name:{medication}&limit=1"
-            if self.openfda_api_key:
-                url += f"&api_key={self.openfda_api_key}"
-                
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('results') and len(data['results']) > 0:
-                    side_effects = data['results'][0].get('adverse_reactions', ["Information not available"])[0]
-                    return {
-                        'status': 'success',
-                        'response': f"Side effects of {medication}: {side_effects}",
-                        'data': {
-                            'medication': medication,
-                            'side_effects': side_effects
-                        }
+            data = self.openfda_client.fetch('label', {
+                'search': f"openfda.generic_name:{medication}",
+                'limit': 1
+            })
+            if data:
+                side_effects = data['results'][0].get('adverse_reactions', ["Information not available"])[0]
+                return {
+                    'status': 'success',
+                    'response': f"Side effects of {medication}: {side_effects}",
+                    'data': {
+                        'medication': medication,
+                        'side_effects': side_effects
                     }
+                }
                     
             # Fallback response if not found
-            return {
-                'status': 'success',
-                'response': f"I couldn't find specific side effect information for {medication}. Please consult with a healthcare professional.",
-                'data': {}
-            }
+            return self._not_found(
+                medication,
+                f"I couldn't find specific side effect information for {medication}. Please consult with a healthcare professional."
+            )
             
         except Exception as e:
             logger.error(f"Error fetching side effects from OpenFDA: {str(e)}")
@@ -150,7 +234,7 @@ class ChalliceMedicalInfoService(MedicalInfoService):
             
     def _get_dosage_info(self, medication: str) -> Dict[str, Any]:
         """Get dosage information for a specific medication"""
-        medication = medication.lower()
+        medication = self._curated_name(medication)
         
         # Check in-memory database first
         if medication in self.drug_database:
@@ -162,13 +246,26 @@ class ChalliceMedicalInfoService(MedicalInfoService):
                     'dosage': self.drug_database[medication]['dosage']
                 }
             }
+
+        # The catalog has no dosing data, but it can still say what the drug is for
+        record = self._find_catalog_entry(medication)
+        if record is not None:
+            uses = ", ".join(record.uses) or "various conditions"
+            return {
+                'status': 'success',
+                'response': f"{record.display_name} is used for: {uses}. I don't have dosing instructions for it, so please follow the label or consult with a healthcare professional for appropriate dosing.",
+                'data': {
+                    'medication': record.name,
+                    'uses': record.uses,
+                    'source': 'catalog'
+                }
+            }
             
         # Fallback response
-        return {
-            'status': 'success',
-            'response': f"I couldn't find specific dosage information for {medication}. Please consult with a healthcare professional for appropriate dosing.",
-            'data': {}
-        }
+        return self._not_found(
+            medication,
+            f"I couldn't find specific dosage information for {medication}. Please consult with a healthcare professional for appropriate dosing."
+        )
         
     def _get_drug_interactions(self, medication: str) -> Dict[str, Any]:
         """Get drug interaction information"""
@@ -179,9 +276,94 @@ class ChalliceMedicalInfoService(MedicalInfoService):
             'data': {}
         }
         
+    def _find_drugs_by_side_effect(self, slots: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find catalog medications that list the requested side effects
+
+        Slots may carry explicit 'side_effects' and 'operator' values; otherwise
+        the terms are parsed from the 'side_effect_query' text.
+        """
+        if slots.get('side_effects'):
+            terms = slots['side_effects']
+            operator = slots.get('operator', 'AND')
+            drug_ids = self.side_effect_index.query(terms, operator)
+        else:
+            terms, operator, drug_ids = self.side_effect_index.search(slots.get('side_effect_query', ''))
+
+        if not terms:
+            return {
+                'status': 'success',
+                'response': "I couldn't recognize any side effects in your question. Please name the side effect you are asking about.",
+                'data': {}
+            }
+
+        joiner = " or " if operator.upper() == 'OR' else " and "
+        described = joiner.join(terms)
+        if not drug_ids:
+            return {
+                'status': 'success',
+                'response': f"I couldn't find any medications in my database that list {described} as a side effect.",
+                'data': {'side_effects': terms, 'operator': operator, 'drug_ids': []}
+            }
+
+        names = [self.catalog.get_by_id(drug_id).display_name for drug_id in drug_ids[:self.max_listed_drugs]]
+        response = f"Medications in my database that list {described} as a side effect: {', '.join(names)}"
+        if len(drug_ids) > len(names):
+            response += f" and {len(drug_ids) - len(names)} more"
+        return {
+            'status': 'success',
+            'response': response + ".",
+            'data': {
+                'side_effects': terms,
+                'operator': operator,
+                'drug_ids': drug_ids,
+                'medications': names,
+                'total': len(drug_ids)
+            }
+        }
+        
+    def _get_substitutes(self, medication: str, max_hops: int = 1) -> Dict[str, Any]:
+        """Get substitutes for a medication from the precomputed substitute graph"""
+        graph = self.substitute_graph
+        record = self._find_catalog_entry(medication)
+        node = record.id if record is not None else graph.find_node(medication)
+        if node is None:
+            return self._not_found(
+                medication,
+                f"I don't have substitute information for {medication}. Please ask your pharmacist about alternatives."
+            )
+
+        if max_hops > 1:
+            related = graph.alternatives_within(node, max_hops=max_hops, limit=self.max_listed_drugs)
+        else:
+            related = [(neighbor, 1) for neighbor in graph.alternatives(node)[:self.max_listed_drugs]]
+
+        name = graph.name_of(node)
+        if not related:
+            return {
+                'status': 'success',
+                'response': f"I don't know of any substitutes for {name}. Please ask your pharmacist about alternatives.",
+                'data': {'medication': name, 'substitutes': []}
+            }
+
+        substitutes = [
+            {
+                'name': graph.name_of(neighbor),
+                'id': neighbor if graph.is_catalog_node(neighbor) else None,
+                'hops': hops
+            }
+            for neighbor, hops in related
+        ]
+        listed = ", ".join(substitute['name'] for substitute in substitutes)
+        return {
+            'status': 'success',
+            'response': f"Possible substitutes for {name}: {listed}. Please check with your pharmacist or doctor before switching medications.",
+            'data': {'medication': name, 'substitutes': substitutes}
+        }
+        
     def _get_general_info(self, medication: str) -> Dict[str, Any]:
         """Get general information about a medication"""
-        medication = medication.lower()
+        medication = self._curated_name(medication)
         
         # Check in-memory database first
         if medication in self.drug_database:
@@ -193,10 +375,16 @@ class ChalliceMedicalInfoService(MedicalInfoService):
                 'response': response,
                 'data': info
             }
+
+        record = self._find_catalog_entry(medication)
+        if record is not None:
+            uses = ", ".join(record.uses) or "Not specified"
+            habit = "It can be habit forming." if record.habit_forming else "It is not habit forming."
+            return {
+                'status': 'success',
+                'response': f"{record.display_name}: Uses: {uses}. {habit}",
+                'data': record.to_dict()
+            }
             
         # Fallback response
-        return {
-            'status': 'success',
-            'response': f"I don't have detailed information about {medication} in my database yet.",
-            'data': {}
-        } 
\ No newline at end of file
+        return self._not_found(medication, f"I don't have detailed information about {medication} in my database yet.") 
\ No newline at end of file
@@ -7,8 +7,8 @@ This is a fallback implementation when AWS Translate is not available.
 
 from typing import Tuple
 from core.services.translation_service_interface import TranslationService
+from core.services.language_detector import get_language_detector, UNKNOWN
 import logging
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +16,7 @@ class ChaliceTranslationService(TranslationService):
     """Simple implementation of translation service without AWS dependencies"""
     
     def __init__(self):
-        # Setup language detection patterns 
-        self.lang_patterns = {
-            'ko': r'[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f\ua960-\ua97f\ud7b0-\ud7ff]+',  # Korean
-            'ja': r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf\u3400-\u4dbf]+',  # Japanese
-            'zh': r'[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff]+',  # Chinese
-            'es': r'[¿¡áéíóúüñ]+',  # Spanish
-            'fr': r'[àâçéèêëîïôùûüÿæœ]+',  # French
-            'de': r'[äöüß]+',  # German
-        }
+        self.language_detector = get_language_detector()
     
     def translate(self, text: str, source_lang: str = "auto", target_lang: str = "en") -> Tuple[str, str]:
         """
@@ -56,14 +48,11 @@ class ChaliceTranslationService(TranslationService):
             return text, "en"
             
     def _detect_language(self, text: str) -> str:
-        """Simple language detection based on character patterns"""
+        """Local language detection based on scripts and character trigrams"""
         try:
-            for lang, pattern in self.lang_patterns.items():
-                if re.search(pattern, text):
-                    return lang
-            
-            # Default to English if no patterns match
-            return "en"
+            language, confidence = self.language_detector.detect(text)
+            # Default to English if nothing could be detected
+            return "en" if language == UNKNOWN else language
         except Exception as e:
             logger.error(f"Language detection error: {str(e)}")
             return "en" 
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+DynamoDB Job Store
+
+Implements the JobStore interface on a DynamoDB table so a job submitted to
+one Lambda container can be polled through any other. Unlike sessions, job
+writes are not buffered: a poller must see a status change as soon as the
+worker records it, so every put goes straight to the table and reads are
+strongly consistent.
+
+Items look like {'job_id': str, 'record': JSON string, 'expires_at': epoch
+seconds}; enable DynamoDB TTL on 'expires_at' so finished jobs are removed.
+"""
+
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import time
+
+from core.services.job_store_interface import JobStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_TABLE = 'pocket_pharmacist_jobs'
+
+
+class DynamoDBJobStore(JobStore):
+    """Job store with write-through puts and consistent reads"""
+
+    def __init__(self, table: Any = None, ttl: float = 3600.0):
+        """
+        Args:
+            table: boto3 DynamoDB Table or a stand-in with get_item and
+                put_item; built from JOBS_TABLE when None
+            ttl: Seconds a job record lives after its last change
+        """
+        if table is None:
+            import boto3
+            dynamodb = boto3.resource('dynamodb', endpoint_url=os.getenv('DYNAMODB_ENDPOINT_URL') or None)
+            table = dynamodb.Table(os.getenv('JOBS_TABLE', DEFAULT_JOBS_TABLE))
+        self.table = table
+        self.ttl = ttl
+
+    def put(self, job_id: str, record: Dict[str, Any]) -> None:
+        self.table.put_item(Item={
+            'job_id': job_id,
+            'record': json.dumps(record, default=str),
+            'expires_at': int(time.time() + self.ttl)
+        })
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = self.table.get_item(Key={'job_id': job_id}, ConsistentRead=True).get('Item')
+        except Exception as e:
+            logger.error(f"Job read failed for {job_id}: {str(e)}")
+            return None
+        # DynamoDB TTL deletes lazily, so expired items can still be returned
+        if not item or int(item.get('expires_at', 0)) <= time.time():
+            return None
+        return json.loads(item['record'])
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        # Only the worker running the job writes after creation, so read-modify-write is safe
+        record = self.get(job_id)
+        if record is None:
+            return
+        record.update(fields)
+        self.put(job_id, record)
@@ -0,0 +1,191 @@
+"""
+DynamoDB Session Backend
+
+Implements the SessionBackend interface on a DynamoDB table so session data
+survives cold starts and is shared between Lambda containers. Writes are
+buffered (write-behind): updates to the same session coalesce in memory and
+are written with batch writes once the buffer holds a full batch or its
+oldest change is older than the flush interval, checked on each update and
+at the end of each query (flush_if_due). Reads go through a small local TTL
+cache. On Lambda the container can be frozen or recycled after any
+response, so the flush interval defaults to 0 there and every query's
+changes are written before it returns; elsewhere buffered changes are lost
+if the process dies before flushing, which is acceptable for conversation
+metadata.
+
+Items look like {'session_id': str, 'data': JSON string, 'expires_at': epoch
+seconds}; enable DynamoDB TTL on 'expires_at' so idle sessions are removed.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import json
+import logging
+import os
+import threading
+import time
+
+from core.services.session_backend_interface import SessionBackend
+from ..utils.ttl_cache import TTLCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSIONS_TABLE = 'pocket_pharmacist_sessions'
+
+# BatchWriteItem accepts at most 25 items per request
+BATCH_SIZE = 25
+
+
+def default_flush_interval() -> float:
+    """SESSION_FLUSH_INTERVAL, or 0 on Lambda and 1 second elsewhere"""
+    default = '0' if os.getenv('AWS_LAMBDA_FUNCTION_NAME') else '1.0'
+    return float(os.getenv('SESSION_FLUSH_INTERVAL', default))
+
+
+class DynamoDBSessionBackend(SessionBackend):
+    """Session backend with a write-behind buffer and a read-through cache"""
+
+    def __init__(
+        self,
+        table: Any = None,
+        timeout: float = 86400.0,
+        flush_interval: Optional[float] = None,
+        max_buffered: Optional[int] = None,
+        cache: Optional[TTLCache] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            table: boto3 DynamoDB Table or a stand-in with get_item and
+                batch_writer; built from SESSIONS_TABLE when None
+            timeout: Seconds a session lives after its last update
+            flush_interval: Maximum seconds a change waits in the buffer
+                (default from default_flush_interval())
+            max_buffered: Buffered sessions that trigger a flush
+            cache: Read-through cache for loaded sessions
+            clock: Monotonic time source for the flush interval
+        """
+        if table is None:
+            import boto3
+            dynamodb = boto3.resource('dynamodb', endpoint_url=os.getenv('DYNAMODB_ENDPOINT_URL') or None)
+            table = dynamodb.Table(os.getenv('SESSIONS_TABLE', DEFAULT_SESSIONS_TABLE))
+        self.table = table
+        self.timeout = timeout
+        self.flush_interval = flush_interval if flush_interval is not None else default_flush_interval()
+        self.max_buffered = max_buffered or int(os.getenv('SESSION_MAX_BUFFERED', str(BATCH_SIZE)))
+        self.cache = cache or TTLCache(
+            maxsize=int(os.getenv('SESSION_CACHE_SIZE', '1024')),
+            ttl=float(os.getenv('SESSION_CACHE_TTL', '30')),
+            negative_ttl=float(os.getenv('SESSION_CACHE_TTL', '30'))
+        )
+        self.clock = clock
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._oldest_pending: Optional[float] = None
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.flushes = 0
+        self.coalesced = 0
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is not None:
+                return dict(pending)
+        cached = self.cache.get(session_id)
+        if cached is not MISSING:
+            return dict(cached) if cached is not None else None
+
+        data = self._load(session_id)
+        if data is None:
+            self.cache.set_negative(session_id)
+            return None
+        self.cache.set(session_id, data)
+        return dict(data)
+
+    def _load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read one session from the table, ignoring items DynamoDB TTL has not removed yet"""
+        self.reads += 1
+        try:
+            item = self.table.get_item(Key={'session_id': session_id}).get('Item')
+        except Exception as e:
+            logger.error(f"Session read failed for {session_id}: {str(e)}")
+            return None
+        if not item or int(item.get('expires_at', 0)) <= time.time():
+            return None
+        return json.loads(item['data'])
+
+    def update(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Loading may hit the table, so it happens outside the lock; the merge
+        # itself starts from the newest copy under the lock, so concurrent
+        # updates to one session keep each other's fields
+        loaded = self.get(session_id)
+        with self._lock:
+            if session_id in self._pending:
+                self.coalesced += 1
+                merged = dict(self._pending[session_id])
+            else:
+                # Written by an update whose flush finished after our read
+                cached = self.cache.get(session_id)
+                merged = dict(cached) if cached is not MISSING and cached is not None else (loaded or {})
+            merged.update(data)
+            self._pending[session_id] = merged
+            self.cache.set(session_id, merged)
+            now = self.clock()
+            if self._oldest_pending is None:
+                self._oldest_pending = now
+            due = len(self._pending) >= self.max_buffered or self._interval_elapsed(now)
+        if due:
+            self.flush()
+        return dict(merged)
+
+    def _interval_elapsed(self, now: float) -> bool:
+        return self._oldest_pending is not None and now - self._oldest_pending >= self.flush_interval
+
+    def flush_if_due(self) -> None:
+        """Flush when the oldest buffered change has waited the flush interval"""
+        with self._lock:
+            due = self._interval_elapsed(self.clock())
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered session with batch writes"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._oldest_pending = None
+
+        expires_at = int(time.time() + self.timeout)
+        try:
+            # batch_writer sends BATCH_SIZE items per request and retries unprocessed ones
+            with self.table.batch_writer(overwrite_by_pkeys=['session_id']) as batch:
+                for session_id, data in pending.items():
+                    batch.put_item(Item={
+                        'session_id': session_id,
+                        'data': json.dumps(data, default=str),
+                        'expires_at': expires_at
+                    })
+        except Exception as e:
+            logger.error(f"Session flush failed for {len(pending)} sessions: {str(e)}")
+            with self._lock:
+                # Keep newer changes made while the flush was running
+                for session_id, data in pending.items():
+                    self._pending.setdefault(session_id, data)
+                if self._oldest_pending is None:
+                    self._oldest_pending = self.clock()
+            return
+
+        self.writes += len(pending)
+        self.flushes += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            buffered = len(self._pending)
+        return {
+            'buffered': buffered,
+            'reads': self.reads,
+            'writes': self.writes,
+            'flushes': self.flushes,
+            'coalesced': self.coalesced
+        }
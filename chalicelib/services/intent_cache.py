@@ -0,0 +1,204 @@
+"""
+Intent Cache
+
+Bounded, expiring cache of Lex recognition results keyed by the normalized
+English utterance: case, whitespace and punctuation are folded, so "What
+are the side effects of aspirin?" and "what are the side effects of
+aspirin" share an entry.
+
+With medication abstraction on, the medications named in the utterance
+(found by the keyword service's catalog scan) become placeholders in the
+key, so "side effects of aspirin" and "side effects of ibuprofen" also
+share an entry. The result is then stored with those names replaced by
+markers and filled in with the new names on a hit. A result is only
+stored that way when every name appears in it and no Lex slot resolved a
+name to a different value (e.g. "tylenol" to "acetaminophen"); otherwise
+it is cached for the exact utterance only.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Pattern, Set, Tuple
+import copy
+import logging
+import os
+import re
+import threading
+
+from core.orchestration.lazy_service import LazyService
+from ..utils.ttl_cache import TTLCache, MISSING
+from .chalice_intent_recognition import ChaliceIntentRecognitionService
+
+logger = logging.getLogger(__name__)
+
+_APOSTROPHE = re.compile(r"['’]")
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+_WHITESPACE = re.compile(r'\s+')
+_MARKER = re.compile('\x00(\\d+)\x00')
+# Medication placeholder in template keys; uppercase never survives normalization of user text
+_PLACEHOLDER = 'MEDICATION'
+
+
+def _fold(text: str) -> str:
+    text = _PUNCTUATION.sub(' ', _APOSTROPHE.sub('', text))
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def normalize_utterance(text: str) -> str:
+    """Cache key for an utterance: case, whitespace and punctuation folded"""
+    return _fold(text.casefold())
+
+
+def _marker(index: int) -> str:
+    return f"\x00{index}\x00"
+
+
+def _template(value: Any, patterns: List[Tuple[int, Pattern]], used: Set[int]) -> Tuple[Any, bool]:
+    """
+    Replace medication names in every string of a result with markers
+
+    Returns:
+        The templated copy, and whether it can be reused for other names
+    """
+    if isinstance(value, str):
+        for index, pattern in patterns:
+            value, count = pattern.subn(_marker(index), value)
+            if count:
+                used.add(index)
+        return value, True
+    if isinstance(value, list):
+        items = [_template(item, patterns, used) for item in value]
+        return [item for item, _ in items], all(reusable for _, reusable in items)
+    if isinstance(value, dict):
+        items = {key: _template(item, patterns, used) for key, item in value.items()}
+        templated = {key: item for key, (item, _) in items.items()}
+        reusable = all(ok for _, ok in items.values())
+        # A Lex slot value whose typed name was templated must resolve to that same name
+        original = value.get('originalValue')
+        if isinstance(original, str) and templated['originalValue'] != original:
+            resolved = [value.get('interpretedValue')] + list(value.get('resolvedValues') or [])
+            if any(isinstance(item, str) and not _MARKER.search(_template(item, patterns, set())[0]) for item in resolved):
+                reusable = False
+        return templated, reusable
+    return value, True
+
+
+def _fill(value: Any, names: List[str]) -> Any:
+    """Copy of a templated result with markers replaced by names"""
+    if isinstance(value, str):
+        return _MARKER.sub(lambda match: names[int(match.group(1))], value)
+    if isinstance(value, list):
+        return [_fill(item, names) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, names) for key, item in value.items()}
+    return value
+
+
+class IntentCache:
+    """Recognition results by normalized utterance, optionally with medications abstracted"""
+
+    # Keyword service whose catalog scan finds the medications to abstract
+    scanner = LazyService()
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        abstract_medications: Optional[bool] = None,
+        scanner: Optional[ChaliceIntentRecognitionService] = None
+    ):
+        """
+        Args:
+            maxsize: Entries kept (default INTENT_CACHE_SIZE or 1024)
+            ttl: Seconds an entry stays valid (default INTENT_CACHE_TTL or 3600)
+            abstract_medications: Share entries across medications (default
+                INTENT_CACHE_ABSTRACT_MEDICATIONS or false)
+            scanner: Keyword service used to find medications
+        """
+        self.cache = TTLCache(
+            maxsize=maxsize if maxsize is not None else int(os.getenv('INTENT_CACHE_SIZE', '1024')),
+            ttl=ttl if ttl is not None else float(os.getenv('INTENT_CACHE_TTL', '3600')),
+            negative_ttl=None
+        )
+        if abstract_medications is None:
+            abstract_medications = os.getenv('INTENT_CACHE_ABSTRACT_MEDICATIONS', 'false').lower() in ('1', 'true', 'yes')
+        self.abstract_medications = abstract_medications
+        if scanner is not None:
+            self.scanner = scanner
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.template_hits = 0
+        self.misses = 0
+        self.exact_only = 0
+
+    def _create_scanner(self) -> ChaliceIntentRecognitionService:
+        return ChaliceIntentRecognitionService()
+
+    def _keys(self, text: str) -> Tuple[Hashable, Optional[Hashable], List[str]]:
+        """Exact-utterance key, template key (None without medications) and the medications"""
+        exact = ('utterance', normalize_utterance(text))
+        if not self.abstract_medications:
+            return exact, None, []
+        try:
+            template, names = self.scanner.mask_medications(text, _PLACEHOLDER)
+        except Exception as e:
+            logger.error(f"Medication scan failed, caching the exact utterance: {str(e)}")
+            return exact, None, []
+        if not names:
+            return exact, None, []
+        return exact, ('template', _fold(template)), names
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """Cached result for an utterance, or None"""
+        exact, template, names = self._keys(text)
+        if template is not None:
+            entry = self.cache.get(template)
+            if entry is not MISSING:
+                with self._lock:
+                    self.hits += 1
+                    self.template_hits += 1
+                return _fill(entry, names)
+        entry = self.cache.get(exact)
+        with self._lock:
+            if entry is MISSING:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, text: str, result: Dict[str, Any]) -> None:
+        """Store a recognition result for an utterance"""
+        exact, template, names = self._keys(text)
+        # The same name twice can't be told apart from two different names once templated
+        if template is not None and len(set(names)) == len(names):
+            # Longest names first, so "augmentin 625 duo" is not split by "augmentin"
+            order = sorted(range(len(names)), key=lambda index: -len(names[index]))
+            patterns = [(index, re.compile(re.escape(names[index]), re.IGNORECASE)) for index in order]
+            used: Set[int] = set()
+            templated, reusable = _template(result, patterns, used)
+            if reusable and len(used) == len(names):
+                self.cache.set(template, templated)
+                return
+        if template is not None:
+            with self._lock:
+                self.exact_only += 1
+        self.cache.set(exact, copy.deepcopy(result))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters and hit rate, plus the size and eviction counters of the underlying cache"""
+        cache_stats = self.cache.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': cache_stats['size'],
+                'maxsize': cache_stats['maxsize'],
+                'hits': self.hits,
+                'template_hits': self.template_hits,
+                'misses': self.misses,
+                'exact_only': self.exact_only,
+                'evictions': cache_stats['evictions'],
+                'expirations': cache_stats['expirations'],
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'abstract_medications': self.abstract_medications
+            }
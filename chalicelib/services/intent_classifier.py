@@ -0,0 +1,356 @@
+"""
+Local Intent Classifier
+
+Multinomial logistic regression over hashed n-gram features, in NumPy.
+Utterances become sparse vectors of word unigrams and bigrams plus character
+3-5 grams of each word (so "doses" and "dosage" share features and typos
+still match), hashed with CRC-32 into a fixed number of signed buckets. The
+model is trained by scripts/models/train_intent_classifier.py from the
+sample utterances in data/intents/, and its probabilities are calibrated by
+temperature scaling on held-out utterances, so a confidence of 0.8 is right
+roughly 80% of the time.
+
+Scoring a batch is one gather and one segmented sum over the nonzero
+features: no network round trip and no per-class Python loop.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import os
+import random
+import re
+import zlib
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'models', 'intent_classifier.npz'
+)
+
+DEFAULT_CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'intents', 'sample_utterances.json'
+)
+
+FORMAT_VERSION = 1
+
+_TOKEN = re.compile(r'\w+')
+_SLOT = re.compile(r'\{(\w+)\}')
+
+
+def expand_utterances(
+    templates: Dict[str, List[str]],
+    slot_values: Dict[str, Sequence[str]],
+    per_template: int,
+    rng: random.Random
+) -> List[Tuple[str, str, int]]:
+    """
+    Fill Lex-style sample utterances ("side effects of {medication}") with slot values
+
+    Args:
+        templates: Sample utterances by intent
+        slot_values: Values for each slot name
+        per_template: Utterances generated from each template that has slots
+        rng: Random source for the slot values
+
+    Returns:
+        (utterance, intent, template number) triples; the template number lets
+        callers split train and test sets by template
+    """
+    utterances = []
+    template_id = 0
+    for intent in sorted(templates):
+        for template in templates[intent]:
+            count = per_template if _SLOT.search(template) else 1
+            for _ in range(count):
+                text = _SLOT.sub(lambda match: rng.choice(slot_values[match.group(1)]), template)
+                utterances.append((text, intent, template_id))
+            template_id += 1
+    return utterances
+
+
+def load_templates(path: str = DEFAULT_CORPUS_PATH) -> Dict[str, List[str]]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class HashedFeatures:
+    """Hashed word and character n-gram featurizer"""
+
+    def __init__(self, n_features: int = 2 ** 16, char_ngrams: Tuple[int, int] = (3, 5)):
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+
+    def features(self, text: str) -> List[str]:
+        words = _TOKEN.findall(text.lower())
+        tokens = ['<s>'] + words + ['</s>']
+        features = ['w:' + token for token in tokens]
+        features.extend(f"b:{left} {right}" for left, right in zip(tokens, tokens[1:]))
+        low, high = self.char_ngrams
+        for word in words:
+            padded = f"<{word}>"
+            for size in range(low, high + 1):
+                features.extend('c:' + padded[i:i + size] for i in range(len(padded) - size + 1))
+        return features
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Featurize a batch as CSR arrays (indptr, indices, values)
+
+        Rows are L2-normalized and never empty (every text has the '<s>' feature).
+        """
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        for text in texts:
+            row: Dict[int, float] = {}
+            for feature in self.features(text):
+                hashed = zlib.crc32(feature.encode('utf-8'))
+                index = hashed % self.n_features
+                # The top bit picks a sign so colliding features tend to cancel out
+                row[index] = row.get(index, 0.0) + (1.0 if hashed & 0x80000000 else -1.0)
+            norm = sum(value * value for value in row.values()) ** 0.5 or 1.0
+            indices.extend(row)
+            values.extend(value / norm for value in row.values())
+            indptr.append(len(indices))
+        return (
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(values, dtype=np.float32)
+        )
+
+
+class IntentClassifier:
+    """Softmax classifier over hashed n-grams with temperature-calibrated confidence"""
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        featurizer: Optional[HashedFeatures] = None,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+        temperature: float = 1.0
+    ):
+        self.labels = list(labels)
+        self.featurizer = featurizer or HashedFeatures()
+        shape = (self.featurizer.n_features, len(self.labels))
+        self.weights = weights if weights is not None else np.zeros(shape, dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.labels), dtype=np.float32)
+        self.temperature = temperature
+
+    def _logits(self, indptr: np.ndarray, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        contributions = self.weights[indices] * values[:, None]
+        return np.add.reduceat(contributions, indptr[:-1], axis=0) + self.bias
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return shifted / shifted.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Calibrated class probabilities, one row per text, columns in self.labels order"""
+        if not texts:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        return self._softmax(self._logits(*self.featurizer.transform(texts)) / self.temperature)
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(intent, confidence) for each text"""
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[label], float(probabilities[row, label])) for row, label in enumerate(best)]
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        epochs: int = 60,
+        learning_rate: float = 0.05,
+        l2: float = 1e-4
+    ) -> List[float]:
+        """
+        Train with full-batch Adam on the softmax cross-entropy
+
+        Returns:
+            Training loss at each epoch
+        """
+        indptr, indices, values = self.featurizer.transform(texts)
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        column = {label: i for i, label in enumerate(self.labels)}
+        targets = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        targets[np.arange(len(texts)), [column[label] for label in labels]] = 1.0
+
+        weights = self.weights.astype(np.float64)
+        bias = self.bias.astype(np.float64)
+        moments = [np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(bias), np.zeros_like(bias)]
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        losses = []
+        for epoch in range(1, epochs + 1):
+            self.weights, self.bias = weights, bias
+            probabilities = self._softmax(self._logits(indptr, indices, values))
+            losses.append(float(-np.mean(np.log(probabilities[targets > 0] + 1e-12))))
+
+            error = (probabilities - targets) / len(texts)
+            weight_grad = np.empty_like(weights)
+            for label in range(len(self.labels)):
+                weight_grad[:, label] = np.bincount(
+                    indices, weights=values * error[rows, label], minlength=weights.shape[0]
+                )
+            weight_grad += l2 * weights
+            bias_grad = error.sum(axis=0)
+
+            for param, grad, first, second in ((weights, weight_grad, moments[0], moments[1]),
+                                               (bias, bias_grad, moments[2], moments[3])):
+                first *= beta1
+                first += (1 - beta1) * grad
+                second *= beta2
+                second += (1 - beta2) * grad * grad
+                step = learning_rate * np.sqrt(1 - beta2 ** epoch) / (1 - beta1 ** epoch)
+                param -= step * first / (np.sqrt(second) + epsilon)
+
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.temperature = 1.0
+        return losses
+
+    def calibrate(self, texts: Sequence[str], labels: Sequence[str]) -> float:
+        """
+        Fit the softmax temperature on held-out utterances (minimum log loss)
+
+        Returns:
+            The chosen temperature
+        """
+        logits = self._logits(*self.featurizer.transform(texts))
+        column = {label: i for i, label in enumerate(self.labels)}
+        truth = np.array([column[label] for label in labels])
+        best, best_loss = 1.0, float('inf')
+        for temperature in np.exp(np.linspace(np.log(0.05), np.log(5.0), 200)):
+            probabilities = self._softmax(logits / temperature)
+            loss = -np.mean(np.log(probabilities[np.arange(len(truth)), truth] + 1e-12))
+            if loss < best_loss:
+                best, best_loss = float(temperature), loss
+        self.temperature = best
+        return best
+
+    def evaluate(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        threshold: float = 0.6,
+        bins: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Accuracy, macro F1, per-intent F1 and expected calibration error
+
+        The calibration error is the confidence-weighted gap between
+        confidence and accuracy over equal-width confidence bins. Coverage is
+        the share of predictions at or above threshold, the ones a caller
+        would accept without falling back, and confident_accuracy their accuracy.
+        """
+        predictions = self.predict(texts)
+        predicted = [intent for intent, _ in predictions]
+        confidences = np.array([confidence for _, confidence in predictions])
+        correct = np.array([guess == truth for guess, truth in zip(predicted, labels)])
+
+        per_intent = {}
+        for label in self.labels:
+            true_positive = sum(1 for guess, truth in zip(predicted, labels) if guess == truth == label)
+            guessed = predicted.count(label)
+            actual = list(labels).count(label)
+            precision = true_positive / guessed if guessed else 0.0
+            recall = true_positive / actual if actual else 0.0
+            per_intent[label] = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+        calibration_error = 0.0
+        edges = np.linspace(0.0, 1.0, bins + 1)
+        for low, high in zip(edges[:-1], edges[1:]):
+            in_bin = (confidences > low) & (confidences <= high)
+            if in_bin.any():
+                gap = abs(confidences[in_bin].mean() - correct[in_bin].mean())
+                calibration_error += in_bin.mean() * gap
+
+        confident = confidences >= threshold
+        return {
+            'count': len(labels),
+            'accuracy': float(correct.mean()) if len(labels) else 0.0,
+            'macro_f1': sum(per_intent.values()) / len(per_intent) if per_intent else 0.0,
+            'per_intent_f1': per_intent,
+            'calibration_error': float(calibration_error),
+            'coverage': float(confident.mean()) if len(labels) else 0.0,
+            'confident_accuracy': float(correct[confident].mean()) if confident.any() else 0.0
+        }
+
+    def save(self, path: str) -> None:
+        """Write the model as a compressed .npz file, replaced atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        partial = path + '.partial'
+        with open(partial, 'wb') as f:
+            np.savez_compressed(
+                f,
+                version=np.int64(FORMAT_VERSION),
+                labels=np.array(self.labels),
+                weights=self.weights,
+                bias=self.bias,
+                temperature=np.float64(self.temperature),
+                n_features=np.int64(self.featurizer.n_features),
+                char_ngrams=np.array(self.featurizer.char_ngrams, dtype=np.int64)
+            )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'IntentClassifier':
+        """
+        Raises:
+            ValueError: If the file is not a model of this version
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported intent model version in {path}")
+            featurizer = HashedFeatures(int(data['n_features']), tuple(int(n) for n in data['char_ngrams']))
+            return cls(
+                labels=[str(label) for label in data['labels']],
+                featurizer=featurizer,
+                weights=data['weights'],
+                bias=data['bias'],
+                temperature=float(data['temperature'])
+            )
+
+
+def split_by_template(
+    utterances: Iterable[Tuple[str, str, int]],
+    fractions: Tuple[float, float],
+    rng: random.Random
+) -> Tuple[List[Tuple[str, str]], ...]:
+    """
+    Split expanded utterances into train, calibration and test sets
+
+    Whole templates go to one set, so held-out scores measure wordings the
+    model has not seen rather than new slot values in a seen wording.
+
+    Args:
+        fractions: Shares of each intent's templates for calibration and test
+    """
+    by_intent: Dict[str, List[int]] = {}
+    grouped: Dict[int, List[Tuple[str, str]]] = {}
+    for text, intent, template_id in utterances:
+        if template_id not in grouped:
+            by_intent.setdefault(intent, []).append(template_id)
+            grouped[template_id] = []
+        grouped[template_id].append((text, intent))
+
+    train: List[Tuple[str, str]] = []
+    calibration: List[Tuple[str, str]] = []
+    test: List[Tuple[str, str]] = []
+    for intent in sorted(by_intent):
+        template_ids = by_intent[intent]
+        rng.shuffle(template_ids)
+        calibration_count = max(1, round(len(template_ids) * fractions[0]))
+        test_count = max(1, round(len(template_ids) * fractions[1]))
+        for position, template_id in enumerate(template_ids):
+            if position < calibration_count:
+                calibration.extend(grouped[template_id])
+            elif position < calibration_count + test_count:
+                test.extend(grouped[template_id])
+            else:
+                train.extend(grouped[template_id])
+    return train, calibration, test
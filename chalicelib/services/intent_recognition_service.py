@@ -19,16 +19,18 @@ Implementation Notes:
    - Implement context awareness
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import boto3
 from botocore.config import Config
 import logging
 import os
+from ..utils.single_flight import SingleFlight
+from .intent_cache import IntentCache, normalize_utterance
 
 logger = logging.getLogger(__name__)
 
 class IntentRecognitionService:
-    def __init__(self):
+    def __init__(self, cache: Optional[IntentCache] = None):
         self.client = boto3.client(
             'lexv2-runtime',
             config=Config(
@@ -40,6 +42,10 @@ class IntentRecognitionService:
         # Get bot configuration from environment variables
         self.bot_id = os.getenv('LEX_BOT_ID', 'YOUR_BOT_ID')
         self.bot_alias_id = os.getenv('LEX_BOT_ALIAS_ID', 'YOUR_BOT_ALIAS_ID')
+        # Concurrent identical (normalized) utterances share one Lex call
+        self.flight = SingleFlight()
+        # Results of earlier utterances, keyed by the normalized utterance
+        self.cache = cache if cache is not None else IntentCache()
 
         if self.bot_id == 'YOUR_BOT_ID' or self.bot_alias_id == 'YOUR_BOT_ALIAS_ID':
             logger.warning("Lex bot configuration not set. Please set LEX_BOT_ID and LEX_BOT_ALIAS_ID environment variables.")
@@ -57,8 +63,14 @@ class IntentRecognitionService:
                 logger.warning("Empty text provided for intent recognition")
                 return {'intent': None, 'slots': {}}
 
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+
             logger.info(f"Recognizing intent for text: {text[:50]}...")
-            response = self.client.recognize_text(
+            response = self.flight.do(
+                normalize_utterance(text),
+                self.client.recognize_text,
                 botId=self.bot_id,
                 botAliasId=self.bot_alias_id,
                 localeId='en_US',
@@ -73,7 +85,9 @@ class IntentRecognitionService:
 
             if intent_data['intent']:
                 logger.info(f"Recognized intent: {intent_data['intent'].get('name', 'unknown')}")
+                self.cache.put(text, intent_data)
             else:
+                # Not cached, so a later call can still get an answer from Lex
                 logger.warning("No intent recognized")
 
             return intent_data
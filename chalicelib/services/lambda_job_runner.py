@@ -0,0 +1,48 @@
+"""
+Lambda Job Runner
+
+Implements the JobRunner interface by invoking the chat job worker Lambda
+function (chat_job_worker in app.py) asynchronously. The invocation is
+queued by Lambda and runs in its own container with its own timeout, so
+the submitting request returns at once and the job finishes even if the
+submitting container is frozen. The worker records the outcome in the job
+store, which therefore has to be shared (JOB_STORE=dynamodb).
+"""
+
+from typing import Any, Optional
+import json
+import logging
+import os
+
+from core.orchestration.lazy_service import LazyService
+from core.services.job_runner_interface import JobRunner
+
+logger = logging.getLogger(__name__)
+
+
+class LambdaJobRunner(JobRunner):
+    """Hands each job to the worker function with an 'Event' invocation"""
+
+    # boto3 Lambda client, created on the first submitted job
+    client = LazyService()
+
+    def __init__(self, function_name: Optional[str] = None):
+        """
+        Args:
+            function_name: Name or ARN of the worker function (default
+                CHAT_JOB_FUNCTION)
+        """
+        self.function_name = function_name or os.getenv('CHAT_JOB_FUNCTION', '')
+
+    def _create_client(self) -> Any:
+        import boto3
+        return boto3.client('lambda')
+
+    def submit(self, job_id: str, message: str, language: str) -> None:
+        payload = {'job_id': job_id, 'message': message, 'language': language}
+        self.client.invoke(
+            FunctionName=self.function_name,
+            InvocationType='Event',
+            Payload=json.dumps(payload).encode('utf-8')
+        )
+        logger.info(f"Job {job_id} handed to {self.function_name}")
@@ -0,0 +1,90 @@
+"""
+Local Intent Recognition Service Implementation
+
+Implements the IntentRecognitionService interface with the local NumPy
+intent classifier instead of a Lex round trip. The classifier picks the
+intent; the keyword service fills the slots from its medication scan and
+also answers for utterances the classifier is not confident about.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from core.orchestration.lazy_service import LazyService
+from core.services.intent_recognition_interface import IntentRecognitionService
+from .chalice_intent_recognition import ChaliceIntentRecognitionService
+from .intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Held-out answers from the shipped corpus at or above this confidence are
+# about 95% correct, above the keyword rules' 83% when a rule fires (0.6 gave 86%)
+DEFAULT_MIN_CONFIDENCE = 0.8
+
+
+class LocalIntentRecognitionService(IntentRecognitionService):
+    """Intent recognition with the local hashed n-gram classifier"""
+
+    # Loaded on the first query
+    classifier = LazyService()
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        rules: Optional[ChaliceIntentRecognitionService] = None,
+        min_confidence: Optional[float] = None
+    ):
+        """
+        Args:
+            model_path: Trained model (default INTENT_MODEL_PATH or
+                data/models/intent_classifier.npz)
+            rules: Keyword service used for slots and as the fallback
+            min_confidence: Predictions below this confidence are answered by
+                the keyword rules instead (default INTENT_MIN_CONFIDENCE or
+                DEFAULT_MIN_CONFIDENCE)
+        """
+        self.model_path = model_path or os.getenv('INTENT_MODEL_PATH', DEFAULT_MODEL_PATH)
+        self.rules = rules or ChaliceIntentRecognitionService()
+        if min_confidence is None:
+            min_confidence = float(os.getenv('INTENT_MIN_CONFIDENCE', DEFAULT_MIN_CONFIDENCE))
+        self.min_confidence = min_confidence
+        self.fallbacks = 0
+
+    def _create_classifier(self) -> IntentClassifier:
+        classifier = IntentClassifier.load(self.model_path)
+        logger.info(f"Loaded intent classifier {self.model_path} ({len(classifier.labels)} intents)")
+        return classifier
+
+    def recognize_intent(self, query: str) -> Dict[str, Any]:
+        """
+        Recognize intent from user query with the local classifier
+
+        Args:
+            query: User input query
+
+        Returns:
+            Dictionary containing recognized intent, calibrated confidence and slots
+        """
+        return self.recognize_intents([query])[0]
+
+    def recognize_intents(self, queries: Sequence[str]) -> List[Dict[str, Any]]:
+        """Recognize a batch of queries with one classifier pass"""
+        try:
+            predictions = self.classifier.predict(list(queries))
+        except Exception as e:
+            logger.error(f"Local intent classification failed, using keyword rules: {str(e)}")
+            self.fallbacks += len(queries)
+            return [self.rules.recognize_intent(query) for query in queries]
+
+        results = []
+        for query, (intent, confidence) in zip(queries, predictions):
+            if confidence < self.min_confidence:
+                self.fallbacks += 1
+                results.append(self.rules.recognize_intent(query))
+                continue
+            results.append({
+                'intent': intent,
+                'confidence': round(confidence, 4),
+                'slots': self.rules.slots_for(intent, query)
+            })
+        return results
@@ -23,26 +23,25 @@ Implementation Notes:
 """
 
 from typing import Dict, Any, Optional
-import requests
 import logging
 from datetime import datetime
+from ..catalog.drug_catalog import get_drug_catalog
+from .openfda_client import OpenFDAError, get_openfda_client
 
 logger = logging.getLogger(__name__)
 
 class MedicalInfoService:
     def __init__(self):
-        # Get OpenFDA API configuration from environment variables
-        self.base_url = os.getenv('OPENFDA_API_URL', 'https://api.fda.gov/drug')
-        self.session = requests.Session()
+        # Shared, cached OpenFDA client (configured from environment variables)
+        self.openfda_client = get_openfda_client()
 
     def initialize(self):
         """Initialize the service"""
-        # No initialization needed for requests.Session()
+        # No initialization needed for the shared OpenFDA client
 
     def cleanup(self):
         """Cleanup resources"""
-        if self.session:
-            self.session.close()
+        # The OpenFDA client and its cache are shared by all services and outlive this one
 
     def get_medical_info(
         self, 
@@ -61,30 +60,52 @@ class MedicalInfoService:
             # Get data based on intent
             intent_name = intent_data.get('intent', {}).get('name', '')
             drug_name = intent_data.get('slots', {}).get('drug_name', '')
+
+            # Answer from the local catalog when it knows the exact name before calling FDA
+            catalog_response = self._get_catalog_info(intent_name, drug_name)
+            if catalog_response:
+                return catalog_response
             
             # Build FDA API query
             search_params = self._build_search_params(intent_name, drug_name)
             endpoint = self._get_endpoint_for_intent(intent_name)
             
-            # Get data from FDA
-            response = self.session.get(
-                f"{self.base_url}/{endpoint}.json",
-                params=search_params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_fda_response(data, intent_name)
-                
-            # TODO: Implement S3 fallback here when FDA API fails
-            logger.error(f"FDA API error: {response.status_code}")
-            return self._create_error_response("Unable to retrieve drug information")
+            # Get data from FDA (cached, including "not found" answers)
+            try:
+                data = self.openfda_client.fetch(endpoint, search_params)
+            except OpenFDAError as e:
+                # TODO: Implement S3 fallback here when FDA API fails
+                logger.error(str(e))
+                return self._create_error_response("Unable to retrieve drug information")
+
+            return self._process_fda_response(data or {}, intent_name)
 
         except Exception as e:
             logger.error(f"Error getting medical info: {str(e)}", exc_info=True)
             return self._create_error_response("An unexpected error occurred")
 
+    def _get_catalog_info(self, intent_name: str, drug_name: str) -> Optional[Dict[str, Any]]:
+        """Answer side effect questions from the local drug catalog when it knows the drug"""
+        if intent_name != "GetDrugSideEffects" or not drug_name:
+            return None
+        try:
+            record = get_drug_catalog().lookup(drug_name)
+        except Exception as e:
+            logger.error(f"Drug catalog unavailable: {str(e)}")
+            return None
+        if record is None:
+            return None
+
+        return {
+            "status": "success",
+            "response": f"Side Effects: {', '.join(record.side_effects) or 'No information available'}",
+            "metadata": {
+                "drug_name": record.display_name,
+                "timestamp": datetime.utcnow().isoformat(),
+                "data_source": "Catalog"
+            }
+        }
+
     def _build_search_params(self, intent_name: str, drug_name: str) -> Dict[str, str]:
         """Build FDA API search parameters"""
         params = {"limit": 1}
@@ -0,0 +1,151 @@
+"""
+OpenFDA Client
+
+Shared access point for OpenFDA API calls made by the medical information
+services. Responses are kept in a bounded LRU+TTL cache, and "not found"
+answers are cached for a shorter time, so repeat questions about the same
+drug are answered without leaving the process. Concurrent cache misses for
+the same query are coalesced into a single upstream call. Label queries are
+answered from the offline label store when one has been built; only what it
+cannot answer goes out through the shared pooled HTTP client (timeouts and
+retries included), and with OPENFDA_OFFLINE set nothing does.
+"""
+
+from typing import Any, Dict, Hashable, Optional
+import copy
+import logging
+import os
+import threading
+
+from core.orchestration.lazy_service import LazyService
+from ..catalog.label_store import LabelStore, get_label_store
+from ..utils.http_client import HTTPClient, get_http_client
+from ..utils.ttl_cache import TTLCache, MISSING
+from ..utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class OpenFDAError(Exception):
+    """Raised when OpenFDA returns an unexpected status code"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class OpenFDAClient:
+    """Cached client for the OpenFDA drug API"""
+
+    # Offline label store (None when not built), opened on the first query
+    label_store: Optional[LabelStore] = LazyService()
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache: Optional[TTLCache] = None,
+        http_client: Optional[HTTPClient] = None,
+        label_store: Optional[LabelStore] = None,
+        offline: Optional[bool] = None
+    ):
+        self.base_url = base_url or os.getenv('OPENFDA_API_URL', 'https://api.fda.gov/drug')
+        self.api_key = api_key if api_key is not None else os.getenv('OPENFDA_API_KEY', '')
+        self.cache = cache or TTLCache(
+            maxsize=int(os.getenv('OPENFDA_CACHE_SIZE', '1024')),
+            ttl=float(os.getenv('OPENFDA_CACHE_TTL', '86400')),
+            negative_ttl=float(os.getenv('OPENFDA_NEGATIVE_CACHE_TTL', '600'))
+        )
+        self.http = http_client or get_http_client()
+        if label_store is not None:
+            self.label_store = label_store
+        # Never call api.fda.gov; queries the label store cannot answer find nothing
+        self.offline = offline if offline is not None else os.getenv('OPENFDA_OFFLINE', 'false').lower() in ('1', 'true', 'yes')
+        self.flight = SingleFlight()
+
+    def fetch(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Query an OpenFDA endpoint (e.g. 'label') through the cache
+
+        Args:
+            endpoint: Endpoint name under the drug API
+            params: Query parameters such as search and limit
+
+        Returns:
+            Parsed JSON response, or None when OpenFDA has no matching results.
+            Each caller gets its own copy, so changing it leaves the cache alone
+
+        Raises:
+            OpenFDAError: On any other non-200 response (never cached)
+        """
+        key = self._cache_key(endpoint, params)
+        data = self.cache.get(key)
+        if data is MISSING:
+            # Coalesced callers share one result, so it is copied for them too
+            data = self.flight.do(key, self._fetch_uncached, key, endpoint, params)
+        return copy.deepcopy(data)
+
+    def _create_label_store(self) -> Optional[LabelStore]:
+        return get_label_store()
+
+    def _fetch_uncached(self, key: Hashable, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Answer from the label store or call OpenFDA, and store the outcome in the cache"""
+        local = self._fetch_local(endpoint, params)
+        if local is not None:
+            self.cache.set(key, local)
+            return local
+        if self.offline:
+            self.cache.set_negative(key)
+            return None
+
+        query = dict(params)
+        if self.api_key:
+            query['api_key'] = self.api_key
+
+        response = self.http.get(f"{self.base_url}/{endpoint}.json", params=query)
+        if response.status_code == 404:
+            self.cache.set_negative(key)
+            return None
+        if response.status_code != 200:
+            raise OpenFDAError(f"FDA API error: {response.status_code}", response.status_code)
+
+        data = response.json()
+        if not data.get('results'):
+            self.cache.set_negative(key)
+            return None
+
+        self.cache.set(key, data)
+        return data
+
+    def _fetch_local(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """openFDA-shaped response from the label store, or None to fall through"""
+        if endpoint != 'label' or self.label_store is None:
+            return None
+        try:
+            results = self.label_store.query(str(params.get('search', '')), limit=int(params.get('limit', 1)))
+        except Exception as e:
+            logger.error(f"Label store query failed: {str(e)}")
+            return None
+        if not results:
+            return None
+        return {'meta': {'source': 'label_store'}, 'results': results}
+
+    def _cache_key(self, endpoint: str, params: Dict[str, Any]) -> Hashable:
+        return endpoint, tuple(sorted((name, str(value)) for name, value in params.items()))
+
+    def close(self) -> None:
+        self.http.close()
+
+
+_client: Optional[OpenFDAClient] = None
+_client_lock = threading.Lock()
+
+
+def get_openfda_client() -> OpenFDAClient:
+    """Return the process-wide OpenFDA client shared by all medical info services"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenFDAClient()
+    return _client
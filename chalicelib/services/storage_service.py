@@ -1,18 +1,14 @@
-import requests
 import logging
-import os
 import boto3
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..catalog.drug_catalog import get_drug_catalog
+from .openfda_client import get_openfda_client
 
 logger = logging.getLogger(__name__)
 
 class MedicalInfoService:
     def __init__(self):
-        """Initialize the FDA API base URL and S3 client."""
-        self.fda_base_url = os.getenv('OPENFDA_API_URL', 'https://api.fda.gov/drug') + "/label.json"
+        """Initialize the shared, cached FDA API client."""
+        self.openfda_client = get_openfda_client()
         
     def get_basic_info(self, intent_data):
         """
@@ -66,18 +62,39 @@ class MedicalInfoService:
         return {"response": symptom_info.get(symptom.lower(), 
                 "For information about this symptom, please consult with a healthcare professional.")}
     
+    def _get_catalog_info(self, medication):
+        """Look the medication up in the local drug catalog by exact name or alias."""
+        try:
+            record = get_drug_catalog().lookup(medication)
+        except Exception as e:
+            logger.error(f"Drug catalog unavailable: {str(e)}")
+            return None
+        if record is None:
+            return None
+
+        return {
+            "brand_name": record.display_name,
+            "indications": record.uses or ['No information available'],
+            "side_effects": record.side_effects,
+            "substitutes": record.substitutes,
+            "data_source": "Catalog"
+        }
+
     def _query_fda_api(self, medication):
         """Query the FDA API for medication information."""
+        catalog_info = self._get_catalog_info(medication) if isinstance(medication, str) and medication else None
+        if catalog_info:
+            return catalog_info
+
         try:
             params = {
                 'search': f'openfda.brand_name:"{medication}" AND openfda.product_type:otc',
                 'limit': 1
             }
             
-            response = requests.get(self.fda_base_url, params=params)
+            data = self.openfda_client.fetch('label', params)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data:
                 results = data.get('results', [])
                 
                 if results:
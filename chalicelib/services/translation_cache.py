@@ -0,0 +1,203 @@
+"""
+Translation Cache
+
+Two-tier cache for AWS Translate results keyed by (normalized text, source
+language, target language): a hot in-memory LRU in front of a persistent
+SQLite store on local disk that survives restarts. Entries keep the source
+language AWS detected for 'auto' calls, so a cache hit returns the same
+(translated_text, source_language) tuple as a live call.
+
+The disk tier lives in the temp directory, which on Lambda is a small
+/tmp, so it is bounded by a row limit and a TTL: expired rows are never
+returned, and writes that take the table past the row limit delete the
+expired rows and then the oldest ones.
+"""
+
+from typing import Optional, Tuple
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+
+from ..utils.ttl_cache import TTLCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'pocket-pharmacist', 'translation_cache.sqlite3')
+
+DEFAULT_DISK_MAX_ROWS = 50000
+DEFAULT_DISK_TTL = 7 * 24 * 3600
+# Pruning trims the table to this share of the row limit, so it runs once
+# per tenth of the limit in writes rather than on every write
+_PRUNE_TO = 0.9
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace; case is kept since it can change a translation"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class TranslationCache:
+    """In-memory LRU backed by an on-disk SQLite table"""
+
+    def __init__(
+        self,
+        memory_size: int = 2048,
+        path: Optional[str] = None,
+        disk_max_rows: Optional[int] = None,
+        disk_ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            memory_size: Entries kept in the in-memory tier
+            path: SQLite file for the disk tier; '' disables it, None uses
+                TRANSLATION_CACHE_PATH or a file under the temp directory
+            disk_max_rows: Rows kept in the disk tier (default
+                TRANSLATION_CACHE_DISK_ROWS or 50000)
+            disk_ttl: Seconds a disk row stays valid; 0 keeps rows until they
+                are pruned by the row limit (default TRANSLATION_CACHE_DISK_TTL
+                or 7 days)
+        """
+        self.memory = TTLCache(maxsize=memory_size, ttl=None, negative_ttl=None)
+        self.disk_hits = 0
+        self.disk_pruned = 0
+        self.disk_max_rows = disk_max_rows if disk_max_rows is not None else int(
+            os.getenv('TRANSLATION_CACHE_DISK_ROWS', str(DEFAULT_DISK_MAX_ROWS))
+        )
+        self.disk_ttl = disk_ttl if disk_ttl is not None else float(
+            os.getenv('TRANSLATION_CACHE_DISK_TTL', str(DEFAULT_DISK_TTL))
+        )
+        self._disk_rows = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path is None:
+            path = os.getenv('TRANSLATION_CACHE_PATH', DEFAULT_CACHE_PATH)
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " text TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,"
+                " translated TEXT NOT NULL, detected TEXT NOT NULL, created_at REAL NOT NULL,"
+                " PRIMARY KEY (text, source, target))"
+            )
+            db.commit()
+            self._db = db
+            with self._lock:
+                self._disk_rows = db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                self._prune()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation disk cache unavailable at {path}, using memory only: {str(e)}")
+            self._db = None
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a translation
+
+        Returns:
+            (translated_text, source_language) or None on a miss
+        """
+        key = (normalize_text(text), source_lang, target_lang)
+        cached = self.memory.get(key)
+        if cached is not MISSING:
+            return cached
+
+        if self._db is None:
+            return None
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT translated, detected FROM translations"
+                    " WHERE text = ? AND source = ? AND target = ? AND created_at >= ?",
+                    key + (self._oldest_valid(),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation disk cache read failed: {str(e)}")
+            return None
+        if row is None:
+            return None
+
+        self.disk_hits += 1
+        result = (row[0], row[1])
+        self.memory.set(key, result)
+        return result
+
+    def put(self, text: str, source_lang: str, target_lang: str, translated: str, detected_lang: str) -> None:
+        """Store a translation in both tiers"""
+        normalized = normalize_text(text)
+        result = (translated, detected_lang)
+        keys = [(normalized, source_lang, target_lang)]
+        # An 'auto' call also answers later calls that name the detected language
+        if source_lang == 'auto' and detected_lang and detected_lang != 'auto':
+            keys.append((normalized, detected_lang, target_lang))
+
+        for key in keys:
+            self.memory.set(key, result)
+
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations (text, source, target, translated, detected, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [key + (translated, detected_lang, now) for key in keys]
+                )
+                # Replaced rows are counted too; pruning recounts exactly
+                self._disk_rows += len(keys)
+                if self._disk_rows > self.disk_max_rows:
+                    self._prune()
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation disk cache write failed: {str(e)}")
+
+    def _oldest_valid(self) -> float:
+        return time.time() - self.disk_ttl if self.disk_ttl > 0 else float('-inf')
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest rows past the row limit (caller holds the lock)"""
+        deleted = self._db.execute("DELETE FROM translations WHERE created_at < ?", (self._oldest_valid(),)).rowcount
+        rows = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if rows > self.disk_max_rows:
+            # INSERT OR REPLACE gives a rewritten row a new, highest rowid, so
+            # rowid order is write order
+            keep = int(self.disk_max_rows * _PRUNE_TO)
+            deleted += self._db.execute(
+                "DELETE FROM translations WHERE rowid <="
+                " (SELECT rowid FROM translations ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (keep,)
+            ).rowcount
+            rows = keep
+        self._db.commit()
+        self._disk_rows = rows
+        self.disk_pruned += deleted
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats['disk_hits'] = self.disk_hits
+        stats['disk_enabled'] = self._db is not None
+        stats['disk_rows'] = self._disk_rows
+        stats['disk_pruned'] = self.disk_pruned
+        return stats
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
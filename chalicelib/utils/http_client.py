@@ -0,0 +1,174 @@
+"""
+Shared HTTP Client
+
+One pooled requests.Session for every outbound HTTP call in the process, so
+connections (and their TLS handshakes) are reused across requests while a
+Lambda container stays warm. Every request gets explicit connect and read
+timeouts. Idempotent requests answered with 429 or 5xx, or failing to
+connect, are retried with capped exponential backoff and full jitter,
+honoring Retry-After when the server sends one. One overall deadline spans
+every attempt and delay, so a call gives up before API Gateway's 29 second
+integration timeout instead of the client seeing a gateway timeout.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import os
+import random
+import threading
+import time
+
+from core.orchestration.lazy_service import LazyService
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Only methods that are safe to send twice are retried
+RETRYABLE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP client with timeouts and jittered retries"""
+
+    # requests.Session with a sized connection pool, created on the first call
+    session = LazyService()
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            pool_size: Connections kept alive per host
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries after the first attempt
+            backoff_base: Upper bound of the first retry delay in seconds;
+                doubles on every retry
+            backoff_max: Longest delay between attempts in seconds
+            deadline: Seconds a request may take across all attempts and
+                delays; each attempt's timeouts are cut to what is left
+            sleep: Delay function, replaceable in tests
+            rng: Random source for jitter
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.pool_size = pool_size or int(os.getenv('HTTP_POOL_SIZE', '10'))
+        self.timeout: Tuple[float, float] = (
+            connect_timeout if connect_timeout is not None else float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05')),
+            read_timeout if read_timeout is not None else float(os.getenv('HTTP_READ_TIMEOUT', '10'))
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '2'))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv('HTTP_BACKOFF_BASE', '0.2'))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv('HTTP_BACKOFF_MAX', '2'))
+        self.deadline = deadline if deadline is not None else float(os.getenv('HTTP_DEADLINE', '20'))
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self.requests = 0
+        self.retries = 0
+
+    def _create_session(self) -> Any:
+        # requests is imported on first use to keep it out of cold starts
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # Retries are handled here, with jitter, rather than by urllib3
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        """Send a GET request; see request()"""
+        return self.request('GET', url, params=params, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """
+        Send a request through the shared pool
+
+        Returns:
+            The final response, which may still carry a retryable status
+            once the retries or the deadline are used up
+
+        Raises:
+            requests.RequestException: If the last attempt fails to connect
+                or times out
+        """
+        import requests
+
+        timeout = kwargs.pop('timeout', self.timeout)
+        retries = self.max_retries if method.upper() in RETRYABLE_METHODS else 0
+        give_up_at = self.clock() + self.deadline
+        attempt = 0
+        while True:
+            self.requests += 1
+            remaining = max(give_up_at - self.clock(), 0.001)
+            try:
+                response = getattr(self.session, method.lower())(url, timeout=self._cap(timeout, remaining), **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self._backoff(attempt)
+                if attempt >= retries or self.clock() + delay >= give_up_at:
+                    raise
+                logger.warning(f"{method} {url} failed ({str(e)}), retrying")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                    return response
+                delay = max(self._backoff(attempt), self._retry_after(response))
+                if self.clock() + delay >= give_up_at:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+            attempt += 1
+            self.retries += 1
+            self.sleep(delay)
+
+    @staticmethod
+    def _cap(timeout: Any, remaining: float) -> Any:
+        """Connect and read timeouts cut to the time left before the deadline"""
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform between 0 and the capped exponential delay"""
+        return self.rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response: Any) -> float:
+        """Seconds requested by a numeric Retry-After header, capped at backoff_max"""
+        try:
+            value = float(response.headers.get('Retry-After', 0))
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+        return min(max(value, 0.0), self.backoff_max)
+
+    def stats(self) -> Dict[str, int]:
+        return {'requests': self.requests, 'retries': self.retries}
+
+    def close(self) -> None:
+        if HTTPClient.session.is_built(self):
+            self.session.close()
+            del self.session
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Return the process-wide HTTP client shared by all outbound callers"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
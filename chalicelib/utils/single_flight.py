@@ -0,0 +1,87 @@
+"""
+Single-Flight Request Coalescing
+
+When several threads ask for the same outbound request at once, only the
+first one (the leader) performs it; the others wait for the leader and
+receive the same result, or the same exception.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+
+class _Call:
+    """An in-flight call that followers can wait on"""
+
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run func(*args, **kwargs) unless an identical call is already running
+
+        Args:
+            key: Identity of the outbound request
+            func: Callable performing the request
+
+        Returns:
+            The leader's result
+
+        Raises:
+            Whatever the leader's call raised, in the leader and every follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls)
+            }
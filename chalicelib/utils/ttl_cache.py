@@ -0,0 +1,119 @@
+"""
+Bounded LRU Cache with TTL
+
+Thread-safe in-process cache with a maximum size, a per-entry time to live,
+a shorter time to live for negative ("not found") entries, and hit/miss
+counters.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import threading
+import time
+
+# Returned by get() when a key is absent or expired
+MISSING = object()
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after a TTL"""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 3600,
+        negative_ttl: Optional[float] = 300,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds a positive entry stays valid (None for no expiry)
+            negative_ttl: Seconds a negative entry stays valid (None for no expiry)
+            clock: Monotonic time source, injectable for tests
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Look up a key
+
+        Returns:
+            The cached value (None for a negative entry), or default when the
+            key is absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, negative = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            if negative:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a positive entry, overriding the default TTL if ttl is given"""
+        self._store(key, value, ttl if ttl is not None else self.ttl, False)
+
+    def set_negative(self, key: Hashable) -> None:
+        """Remember that a key has no value, using the shorter negative TTL"""
+        self._store(key, None, self.negative_ttl, True)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float], negative: bool) -> None:
+        with self._lock:
+            expires_at = self._clock() + ttl if ttl is not None else None
+            self._entries[key] = (value, expires_at, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not MISSING
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring; hit_rate counts negative hits as hits"""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': (self.hits + self.negative_hits) / lookups if lookups else 0.0
+            }
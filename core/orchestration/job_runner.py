@@ -0,0 +1,42 @@
+"""
+Thread Job Runner
+
+Implements the JobRunner interface with a thread pool in the current
+process. A job only makes progress while the process keeps running, so this
+suits local and development servers, not AWS Lambda, which freezes the
+container once the response is sent.
+"""
+
+from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from ..services.job_runner_interface import JobRunner
+
+
+class ThreadJobRunner(JobRunner):
+    """Runs jobs on a lazily created thread pool"""
+
+    def __init__(self, run: Callable[[str, str, str], None], workers: int = 4):
+        """
+        Args:
+            run: Called with (job_id, message, language) to run one job
+            workers: Jobs run at the same time
+        """
+        self.run = run
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, message: str, language: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='chat-job')
+            executor = self._executor
+        executor.submit(self.run, job_id, message, language)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,38 @@
+"""
+In-Memory Job Store
+
+Implements the JobStore interface on top of SessionStore, which already
+provides merged updates, heap-based TTL expiry and a hard size cap.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..services.job_store_interface import JobStore
+from .session_store import SessionStore
+
+
+class InMemoryJobStore(JobStore):
+    """Job records kept in process memory with TTL-based cleanup"""
+
+    def __init__(self, ttl: float = 3600.0, max_jobs: int = 10000):
+        """
+        Args:
+            ttl: Seconds a job record lives after its last change
+            max_jobs: Records kept before the oldest is evicted
+        """
+        self.records = SessionStore(timeout=ttl, max_sessions=max_jobs)
+
+    def put(self, job_id: str, record: Dict[str, Any]) -> None:
+        self.records.delete(job_id)
+        self.records.update(job_id, record)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(job_id)
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        # An expired job stays expired rather than coming back as a partial record
+        if self.records.get(job_id) is not None:
+            self.records.update(job_id, fields)
+
+    def cleanup(self) -> int:
+        return self.records.expire()
@@ -0,0 +1,58 @@
+"""
+Lazy Service Attribute
+
+Descriptor for service attributes that are expensive to build (AWS clients,
+HTTP sessions, DynamoDB tables). The service is created by the owner's
+_create_<name>() factory the first time it is read, exactly once even when
+several threads race for it, and can be replaced by plain assignment.
+Subclasses change the implementation by overriding the factory, so nothing
+is built only to be thrown away.
+"""
+
+from typing import Any, Optional
+import threading
+
+# One lock for all lazy attributes: construction is rare and short-lived
+_construction_lock = threading.RLock()
+
+
+class LazyService:
+    """Instance attribute built on first access by a factory method"""
+
+    def __init__(self, factory: Optional[str] = None):
+        """
+        Args:
+            factory: Name of the owner method that builds the service;
+                defaults to _create_<attribute name>
+        """
+        self.factory = factory
+        self.name = ''
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        if self.factory is None:
+            self.factory = f"_create_{name}"
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        values = instance.__dict__
+        try:
+            return values[self.name]
+        except KeyError:
+            pass
+        with _construction_lock:
+            if self.name not in values:
+                values[self.name] = getattr(instance, self.factory)()
+            return values[self.name]
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        # Forget the service; the next read builds a fresh one
+        instance.__dict__.pop(self.name, None)
+
+    def is_built(self, instance: Any) -> bool:
+        """Whether the service exists, without building it"""
+        return self.name in instance.__dict__
@@ -11,22 +11,71 @@ Responsibilities:
 - Handle errors and logging
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from ..services.translation_service_interface import TranslationService
 from ..services.intent_recognition_interface import IntentRecognitionService
 from ..services.medical_info_interface import MedicalInfoService
+from ..services.language_detector import get_language_detector
+from ..services.session_backend_interface import SessionBackend
+from .session_store import SessionStore
+from .lazy_service import LazyService
+from .stage_timer import StageTimer, NULL_TIMER
+import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Response data fields holding short user-facing strings worth translating
+TRANSLATABLE_DATA_FIELDS = ('uses', 'side_effects')
+
+# Sessions kept in memory before the least recently used one is evicted
+MAX_SESSIONS = 100000
+
+# Local detection confidence needed to skip the translation call entirely
+SKIP_TRANSLATION_CONFIDENCE = 0.7
+# Lower confidence that is still worth a speculative intent recognition
+SPECULATION_CONFIDENCE = 0.4
+
 class QueryHandler:
+    # Services are built on first use by the _create_* factories below;
+    # subclasses override the factories to plug in other implementations
+    translation_service: TranslationService = LazyService()
+    intent_service: IntentRecognitionService = LazyService()
+    medical_service: MedicalInfoService = LazyService()
+    session_store: SessionBackend = LazyService()
+
     def __init__(self):
-        self.translation_service = TranslationService()
-        self.intent_service = IntentRecognitionService()
-        self.medical_service = MedicalInfoService()
-        self.session_data: Dict[str, Any] = {}
         self.session_timeout = timedelta(hours=24)  # Session timeout after 24 hours
+        self.language_detector = get_language_detector()
+        self._last_detection: Tuple[str, Tuple[str, float]] = ("", ("und", 0.0))
+        # Recognize intent on the raw query while translation runs when it is probably English
+        self.speculative_intent = True
+        self._speculation_executor: Optional[ThreadPoolExecutor] = None
+        self._speculation_lock = threading.Lock()
+        self._speculation = {'attempts': 0, 'wins': 0, 'saved_seconds': 0.0}
+        # Per-stage timings, returned under "timings" in the response when enabled
+        self.stage_timing = False
+        # Requests slower than this are logged with their stage timings (None disables)
+        self.slow_query_threshold_ms: Optional[float] = None
+
+    def _create_translation_service(self) -> TranslationService:
+        return TranslationService()
+
+    def _create_intent_service(self) -> IntentRecognitionService:
+        return IntentRecognitionService()
+
+    def _create_medical_service(self) -> MedicalInfoService:
+        return MedicalInfoService()
+
+    def _create_session_store(self) -> SessionBackend:
+        return SessionStore(
+            timeout=self.session_timeout.total_seconds(),
+            max_sessions=MAX_SESSIONS
+        )
 
     def initialize(self):
         """Initialize all services"""
@@ -35,7 +84,14 @@ class QueryHandler:
 
     def cleanup(self):
         """Cleanup all services"""
-        self.medical_service.cleanup()
+        # Services that were never used have nothing to clean up
+        if QueryHandler.medical_service.is_built(self):
+            self.medical_service.cleanup()
+        if QueryHandler.session_store.is_built(self):
+            self.session_store.close()
+        if self._speculation_executor is not None:
+            self._speculation_executor.shutdown(wait=False)
+            self._speculation_executor = None
         # Other services will be cleaned up by their respective teams
 
     def process_query(
@@ -55,41 +111,64 @@ class QueryHandler:
         Returns:
             Processed response with medical information
         """
+        timed = self.stage_timing or self.slow_query_threshold_ms is not None
+        timer = StageTimer() if timed else NULL_TIMER
+        response = self._process_query(query, session_id, source_lang, target_lang, timer)
+        # Counted with the session update it writes out
+        with timer.stage("session_update"):
+            self._flush_sessions()
+        if timed:
+            timings = timer.as_dict()
+            if self.stage_timing:
+                response["timings"] = timings
+            if self.slow_query_threshold_ms is not None and timings["total"] >= self.slow_query_threshold_ms:
+                self._log_slow_query(session_id, source_lang, response, timings)
+        return response
+
+    def _process_query(
+        self,
+        query: str,
+        session_id: str,
+        source_lang: str,
+        target_lang: str,
+        timer: StageTimer
+    ) -> Dict[str, Any]:
         try:
             logger.info(f"Processing query for session {session_id}: {query}")
             
             # Clean up expired sessions
-            self._cleanup_expired_sessions()
+            with timer.stage("session_cleanup"):
+                self._cleanup_expired_sessions()
             
-            # Step 1: Translate query to English for processing
-            translated_query = self._handle_translation(query, source_lang, "en")
+            # Steps 1-2: Translate query to English and get intent
+            translated_query, intent_data = self._translate_and_recognize(query, source_lang, timer)
             if not translated_query:
                 return self._create_error_response("Translation failed", source_lang)
-
-            # Step 2: Get intent
-            intent_data = self.intent_service.recognize_intent(translated_query)
             if not intent_data.get('intent'):
                 return self._create_error_response("Could not understand the query", source_lang)
 
             # Step 3: Get information based on intent
-            medical_response = self._get_medical_info(intent_data, session_id)
+            with timer.stage("medical_lookup"):
+                medical_response = self._get_medical_info(intent_data, session_id)
             if medical_response.get("status") == "error":
                 return self._create_error_response(medical_response.get("message", "Unknown error"), source_lang)
 
             # Step 4: Translate response to target language
-            final_response = self._prepare_final_response(
-                medical_response,
-                source_lang,
-                target_lang
-            )
+            with timer.stage("translate_out"):
+                final_response = self._prepare_final_response(
+                    medical_response,
+                    source_lang,
+                    target_lang
+                )
 
             # Step 5: Update session data
-            self._update_session_data(session_id, {
-                "last_query": query,
-                "last_intent": intent_data.get('intent'),
-                "timestamp": datetime.utcnow().isoformat(),
-                "query_count": self.session_data.get(session_id, {}).get("query_count", 0) + 1
-            })
+            with timer.stage("session_update"):
+                self._update_session_data(session_id, {
+                    "last_query": query,
+                    "last_intent": intent_data.get('intent'),
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "query_count": (self.session_store.get(session_id) or {}).get("query_count", 0) + 1
+                })
 
             return final_response
 
@@ -97,6 +176,129 @@ class QueryHandler:
             logger.error(f"Error processing query: {str(e)}", exc_info=True)
             return self._create_error_response("An unexpected error occurred", source_lang)
 
+    def _log_slow_query(
+        self,
+        session_id: str,
+        source_lang: str,
+        response: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> None:
+        """Emit one structured log entry for a request over the slow-query threshold"""
+        entry = {
+            "event": "slow_query",
+            "session_id": session_id,
+            "source_lang": source_lang,
+            "status": response.get("status"),
+            "threshold_ms": self.slow_query_threshold_ms,
+            "timings_ms": timings
+        }
+        logger.warning(f"Slow query: {json.dumps(entry)}", extra={"slow_query": entry})
+
+    def _translate_and_recognize(
+        self,
+        query: str,
+        source_lang: str,
+        timer: StageTimer = NULL_TIMER
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Translate the query to English and recognize its intent
+
+        When the query is probably English already, intent recognition starts
+        on the raw text in parallel with translation. The speculative result
+        is kept if translation leaves the text unchanged; otherwise
+        recognition is redone on the translated text. In that case the
+        "intent" stage only counts the wait after translation finished.
+        """
+        # Nothing to overlap when no translation call is made
+        if self._skip_translation(query, source_lang, "en") or not (self.speculative_intent and self._probably_english(query, source_lang)):
+            with timer.stage("translate_in"):
+                translated_query = self._handle_translation(query, source_lang, "en")
+            if not translated_query:
+                return None, {}
+            with timer.stage("intent"):
+                return translated_query, self.intent_service.recognize_intent(translated_query)
+
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def recognize() -> Dict[str, Any]:
+            intent_data = self.intent_service.recognize_intent(query)
+            timings['recognize'] = time.perf_counter() - start
+            return intent_data
+
+        speculative = self._get_speculation_executor().submit(recognize)
+        with timer.stage("translate_in"):
+            translated_query = self._handle_translation(query, source_lang, "en")
+        translate_seconds = time.perf_counter() - start
+        if not translated_query:
+            speculative.cancel()
+            return None, {}
+
+        with timer.stage("intent"):
+            if self._same_text(query, translated_query):
+                intent_data = speculative.result()
+                won = True
+            else:
+                speculative.cancel()
+                intent_data = self.intent_service.recognize_intent(translated_query)
+                won = False
+
+        # A sequential run would have paid for translation and recognition back to back
+        saved = translate_seconds + timings.get('recognize', 0.0) - (time.perf_counter() - start) if won else 0.0
+        with self._speculation_lock:
+            self._speculation['attempts'] += 1
+            if won:
+                self._speculation['wins'] += 1
+                self._speculation['saved_seconds'] += max(saved, 0.0)
+        return translated_query, intent_data
+
+    def _probably_english(self, text: str, source_lang: str) -> bool:
+        """Guess whether translation to English is likely to leave text unchanged"""
+        if source_lang.lower().startswith("en"):
+            return True
+        if source_lang != "auto":
+            return False
+        language, confidence = self._detect_language(text)
+        return language == "en" and confidence >= SPECULATION_CONFIDENCE
+
+    def _detect_language(self, text: str) -> Tuple[str, float]:
+        """Detect locally, reusing the result for the text most recently checked"""
+        last_text, result = self._last_detection
+        if text != last_text:
+            result = self.language_detector.detect(text)
+            self._last_detection = (text, result)
+        return result
+
+    def _skip_translation(self, text: str, source_lang: str, target_lang: str) -> bool:
+        """True when text is already in the target language, so no remote call is needed"""
+        if source_lang == target_lang:
+            return True
+        if source_lang != "auto":
+            return False
+        language, confidence = self._detect_language(text)
+        return language == target_lang.split("-")[0] and confidence >= SKIP_TRANSLATION_CONFIDENCE
+
+    def _same_text(self, original: str, translated: str) -> bool:
+        return " ".join(original.split()).casefold() == " ".join(translated.split()).casefold()
+
+    def _get_speculation_executor(self) -> ThreadPoolExecutor:
+        if self._speculation_executor is None:
+            with self._speculation_lock:
+                if self._speculation_executor is None:
+                    self._speculation_executor = ThreadPoolExecutor(
+                        max_workers=4,
+                        thread_name_prefix="speculative-intent"
+                    )
+        return self._speculation_executor
+
+    def speculation_stats(self) -> Dict[str, Any]:
+        """How often speculative intent recognition was kept and the latency it saved"""
+        with self._speculation_lock:
+            stats = dict(self._speculation)
+        stats['win_rate'] = stats['wins'] / stats['attempts'] if stats['attempts'] else 0.0
+        stats['saved_ms'] = round(stats.pop('saved_seconds') * 1000, 3)
+        return stats
+
     def _handle_translation(
         self, 
         text: str, 
@@ -107,7 +309,7 @@ class QueryHandler:
         Handle translation of text between languages
         """
         try:
-            if source_lang == target_lang:
+            if self._skip_translation(text, source_lang, target_lang):
                 return text
                 
             translated_text, detected_lang = self.translation_service.translate(text, source_lang, target_lang)
@@ -138,16 +340,38 @@ class QueryHandler:
     ) -> Dict[str, Any]:
         """
         Prepare the final response with translations
+
+        The response text and the short strings in its data are translated
+        together so the translation service can pack them into one call.
         """
         try:
             if source_lang != target_lang:
-                translated_response = self._handle_translation(
-                    medical_response.get("response", ""),
-                    "en",
-                    target_lang
-                )
-                if translated_response:
-                    medical_response["translated_response"] = translated_response
+                data = medical_response.get("data") or {}
+                fields = [
+                    field for field in TRANSLATABLE_DATA_FIELDS
+                    if isinstance(data.get(field), list) and data[field]
+                    and all(isinstance(item, str) for item in data[field])
+                ]
+                segments: List[str] = [medical_response.get("response", "")]
+                for field in fields:
+                    segments.extend(data[field])
+
+                # Responses are written in English, so an English target needs no call
+                if target_lang.split("-")[0] == "en":
+                    translated = segments
+                else:
+                    translated = self.translation_service.translate_batch(segments, "en", target_lang)
+                if translated and translated[0]:
+                    medical_response["translated_response"] = translated[0]
+
+                translated_data = {}
+                offset = 1
+                for field in fields:
+                    count = len(data[field])
+                    translated_data[field] = translated[offset:offset + count]
+                    offset += count
+                if translated_data:
+                    medical_response["translated_data"] = translated_data
 
             return medical_response
         except Exception as e:
@@ -158,21 +382,25 @@ class QueryHandler:
         """
         Update session data with new information
         """
-        if session_id not in self.session_data:
-            self.session_data[session_id] = {}
-        self.session_data[session_id].update(data)
+        self.session_store.update(session_id, data)
+
+    def _flush_sessions(self) -> None:
+        """
+        Let a buffering session backend write changes that are due, so they
+        don't wait in a process that may be frozen once the response is sent
+        """
+        if not QueryHandler.session_store.is_built(self):
+            return
+        try:
+            self.session_store.flush_if_due()
+        except Exception as e:
+            logger.error(f"Session flush failed: {str(e)}")
 
     def _cleanup_expired_sessions(self) -> None:
         """
         Remove expired sessions from session data
         """
-        current_time = datetime.utcnow()
-        expired_sessions = [
-            session_id for session_id, data in self.session_data.items()
-            if current_time - datetime.fromisoformat(data["timestamp"]) > self.session_timeout
-        ]
-        for session_id in expired_sessions:
-            del self.session_data[session_id]
+        self.session_store.expire()
 
     def _create_error_response(self, error_message: str, language: str) -> Dict[str, Any]:
         """
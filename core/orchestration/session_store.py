@@ -0,0 +1,146 @@
+"""
+Session Store
+
+Bounded in-memory store for per-session data with idle expiry. Expiry
+deadlines live in a min-heap next to the session dict, so removing expired
+sessions costs O(log n) per removed session instead of a scan over every
+session, and checking when nothing has expired is O(1). Updating a session
+pushes a new heap entry; the superseded one is skipped when it surfaces and
+the heap is rebuilt once stale entries outnumber live ones. When the store
+is full, the session closest to expiry (the least recently updated) is
+evicted. Deadlines use a monotonic clock, so nothing is parsed on the hot
+path.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import heapq
+import itertools
+import threading
+import time
+
+from ..services.session_backend_interface import SessionBackend
+
+
+class SessionStore(SessionBackend):
+    """In-memory session backend with heap-based expiry and a hard size cap"""
+
+    def __init__(
+        self,
+        timeout: float = 86400.0,
+        max_sessions: int = 100000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            timeout: Seconds a session lives after its last update
+            max_sessions: Sessions kept before the oldest is evicted
+            clock: Monotonic time source, replaceable in tests
+        """
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be positive")
+        self.timeout = timeout
+        self.max_sessions = max_sessions
+        self.clock = clock
+        # session_id -> (deadline, sequence, data); sequence matches its live heap entry
+        self._sessions: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the session's data, or None if it is unknown or expired"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+            return dict(entry[2])
+
+    def update(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge data into a session and restart its timeout
+
+        Returns:
+            A copy of the session's data after the update
+        """
+        with self._lock:
+            now = self.clock()
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[0] > now:
+                merged = entry[2]
+            else:
+                merged = {}
+            merged.update(data)
+
+            deadline = now + self.timeout
+            sequence = next(self._sequence)
+            self._sessions[session_id] = (deadline, sequence, merged)
+            heapq.heappush(self._heap, (deadline, sequence, session_id))
+
+            while len(self._sessions) > self.max_sessions:
+                if self._pop_oldest():
+                    self.evicted += 1
+            if len(self._heap) > 2 * len(self._sessions) + 64:
+                self._compact()
+            return dict(merged)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            # Its heap entry goes stale and is skipped later
+            return self._sessions.pop(session_id, None) is not None
+
+    def expire(self) -> int:
+        """
+        Remove every session whose timeout has passed
+
+        Returns:
+            Number of sessions removed
+        """
+        removed = 0
+        with self._lock:
+            now = self.clock()
+            while self._heap and self._heap[0][0] <= now:
+                if self._pop_oldest():
+                    removed += 1
+            self.expired += removed
+        return removed
+
+    def _pop_oldest(self) -> bool:
+        """Pop the earliest heap entry, removing its session if the entry is current"""
+        deadline, sequence, session_id = heapq.heappop(self._heap)
+        entry = self._sessions.get(session_id)
+        if entry is not None and entry[1] == sequence:
+            del self._sessions[session_id]
+            return True
+        return False
+
+    def _compact(self) -> None:
+        """Rebuild the heap from live sessions, dropping stale entries"""
+        self._heap = [(deadline, sequence, session_id) for session_id, (deadline, sequence, _) in self._sessions.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._heap.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'heap_entries': len(self._heap),
+                'max_sessions': self.max_sessions,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
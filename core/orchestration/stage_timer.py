@@ -0,0 +1,75 @@
+"""
+Stage Timer
+
+Records how long each step of a request takes, using the monotonic
+perf_counter clock, and formats the result as a Server-Timing header.
+NULL_TIMER is a shared do-nothing timer used when timing is disabled, so
+instrumented code costs one method call per stage.
+"""
+
+from typing import ContextManager, Dict, Iterator, Optional
+from contextlib import contextmanager, nullcontext
+import time
+
+# Reusable no-op context manager handed out by the disabled timer
+_NO_STAGE = nullcontext()
+
+
+class StageTimer:
+    """Per-request stage durations in milliseconds"""
+
+    enabled = True
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated names accumulate"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + duration_ms
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations plus 'total', rounded to microseconds"""
+        timings = {name: round(duration, 3) for name, duration in self.stages.items()}
+        timings['total'] = round(self.total_ms(), 3)
+        return timings
+
+
+class _NullTimer(StageTimer):
+    """Timer that records nothing"""
+
+    enabled = False
+
+    def __init__(self):
+        self.start = 0.0
+        self.stages = {}
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return _NO_STAGE
+
+    def record(self, name: str, duration_ms: float) -> None:
+        pass
+
+    def total_ms(self) -> float:
+        return 0.0
+
+
+NULL_TIMER = _NullTimer()
+
+
+def format_server_timing(timings: Optional[Dict[str, float]]) -> str:
+    """Render {'stage': ms} as a Server-Timing header value"""
+    if not timings:
+        return ""
+    return ", ".join(f"{name};dur={duration:.3f}" for name, duration in timings.items())
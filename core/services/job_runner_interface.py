@@ -0,0 +1,26 @@
+"""
+Job Runner Interface
+
+This service is responsible for running submitted chat jobs after the
+request that submitted them has returned.
+It is not dependent on any specific execution environment (e.g., AWS Lambda).
+"""
+
+class JobRunner:
+    """Defines the interface for job runners"""
+
+    def submit(self, job_id: str, message: str, language: str) -> None:
+        """
+        Hand a job off to run in the background
+
+        Returns once the job is handed off, not when it finishes; the runner
+        records progress in the job store.
+
+        Args:
+            job_id: Job whose record is already in the job store
+            message: User text input
+            language: Source language code
+        """
+        # This interface requires actual implementation
+        # Basic implementation runs nothing
+        pass
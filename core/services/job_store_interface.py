@@ -0,0 +1,47 @@
+"""
+Job Store Interface
+
+This service is responsible for keeping the state of asynchronous chat jobs
+so a client can submit a query and poll for its result later.
+It is not dependent on any specific storage implementation (e.g., DynamoDB).
+"""
+
+from typing import Any, Dict, Optional
+
+# Job lifecycle: pending -> running -> succeeded | failed
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+class JobStore:
+    """Defines the interface for job stores"""
+
+    def put(self, job_id: str, record: Dict[str, Any]) -> None:
+        """
+        Create or replace a job record and restart its time to live
+
+        Args:
+            job_id: Unique job identifier
+            record: Job fields (status, message, language, result, error, ...)
+        """
+        # This interface requires actual implementation
+        # Basic implementation keeps nothing
+        pass
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a job record
+
+        Returns:
+            Copy of the record, or None if the job is unknown or expired
+        """
+        return None
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Merge fields into an existing job record"""
+        pass
+
+    def cleanup(self) -> int:
+        """Remove expired jobs and return how many were removed"""
+        return 0
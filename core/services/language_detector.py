@@ -0,0 +1,177 @@
+"""
+Local Language Detector
+
+Guesses the language of a short query without calling a remote service.
+A single pass over the text counts characters per script (Hangul, kana,
+Han, Cyrillic, Arabic, Thai, Latin) and, for Latin letters, scores the
+character trigrams seen against small per-language frequency profiles.
+Script shares decide non-Latin languages; trigram scores and language
+specific letters separate the Latin ones. Every result carries a
+confidence between 0 and 1.
+"""
+
+from typing import Dict, Tuple
+
+UNKNOWN = "und"
+
+# Most frequent character trigrams per language, most frequent first; '_' marks a word boundary
+TRIGRAM_PROFILES = {
+    'en': "_th the he_ _an and nd_ _of of_ ing ng_ _to _in ion ed_ on_ is_ _is er_ re_ es_ at_ _a_ "
+          "tio ent _wh hat _ar are _do _ca _fo for or_ _it _be _ho how ct_ ts_ ide _si eff ffe "
+          "ect cts _ef _ta ake _wi wit ith _yo you ou_ _my my_ ly_ an_ _me _wh whi hic ich "
+          "_dr dru rug ugs gs_ _ca cau aus use se_ _an any ny_ ss_ _sh sho hou oul uld ld_ "
+          "ter _af aft fte _us _ma man muc uch ch_ _mu _ge _ot oth her _ab abo out ut_",
+    'es': "_de de_ _la la_ os_ _el el_ es_ _qu que ue_ _en en_ as_ _lo los ion on_ _co _se "
+          "ent _pa par ar_ _un ado _ef efe fec ect cto tos sec ecu cun und nda dar ari ios "
+          "_cu cua ual ale les _po por or_ _pu ued ede _to _me med edi dic ica _ca _ti "
+          "_do dos osi sis is_ _su sus _pu pue ued edo do_ _ha hay _si sin _mi mis ant",
+    'fr': "_de de_ es_ _le le_ ent _la la_ _et et_ les _qu que ue_ _un _pa _po _du du_ "
+          "ion on_ re_ ur_ _ef eff ffe fet ets ts_ _se sec eco con ond nda dai air ire "
+          "_me med edi dic ica _pr _qu uel els _so son ont _ce ces _je _pe peu eut "
+          "_co com omb mbi bie ien _pu pui uis is_ _pr pre ren end dre _av ave vec ec_",
+    'de': "_de der er_ _di die ie_ en_ ch_ ein _ei _un und nd_ sch che ich _be cht _ne "
+          "neb ebe ben enw nwi wir irk rku kun ung ngen _wi _we wel elc lch _ka kan ann "
+          "_ic _me med edi dik ame men ent _is ist st_ _da das as_ _mi mit _ve",
+    'it': "_di di_ _ch che he_ _la la_ _il il_ _de del ell lla _co _pe per er_ _ef eff "
+          "ffe fet ett tti ti_ _ca col oll lla lat ter era ral ali li_ _qu qua ual ono "
+          "_so son _me med edi dic ica _un _po pos oss _ho _pr ato _si",
+    'pt': "_de de_ _qu que ue_ _o_ _a_ os_ _do do_ _da da_ ao_ _co _se _ef efe fei eit "
+          "ito tos _pa par ara ra_ col ola lat ter era rai ais is_ _sa sao _me med edi "
+          "dic ica _po pos oss _um uma _na nao _to _te tom oma",
+}
+
+# Letters that occur in only one or two of the profiled languages
+SIGNATURE_LETTERS = {
+    'es': "ñ¿¡",
+    'fr': "çèêëîœ",
+    'de': "äöß",
+    'it': "ìò",
+    'pt': "ãõ",
+}
+
+SIGNATURE_WEIGHT = 3.0
+
+# Trigram hits needed before a Latin guess is fully trusted
+FULL_CONFIDENCE_HITS = 8
+
+
+def _script_of(char: str) -> str:
+    """Name the script of a letter, or '' for anything else"""
+    code = ord(char)
+    if code < 0x80:
+        return 'latin' if char.isalpha() else ''
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return 'hangul'
+    if 0x3040 <= code <= 0x30FF:
+        return 'kana'
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0xF900 <= code <= 0xFAFF:
+        return 'han'
+    if 0x0400 <= code <= 0x04FF:
+        return 'cyrillic'
+    if 0x0600 <= code <= 0x06FF:
+        return 'arabic'
+    if 0x0E00 <= code <= 0x0E7F:
+        return 'thai'
+    if 0x00C0 <= code <= 0x024F:
+        return 'latin'
+    return ''
+
+
+SCRIPT_LANGUAGES = {
+    'hangul': 'ko',
+    'cyrillic': 'ru',
+    'arabic': 'ar',
+    'thai': 'th',
+}
+
+
+class LanguageDetector:
+    """Single-pass script and trigram language detector"""
+
+    def __init__(self):
+        # trigram -> {language: weight}, weights falling from 1.0 with profile rank
+        self.trigram_weights: Dict[str, Dict[str, float]] = {}
+        for language, profile in TRIGRAM_PROFILES.items():
+            trigrams = profile.split()
+            for rank, gram in enumerate(trigrams):
+                weight = 1.0 - rank / (2 * len(trigrams))
+                self.trigram_weights.setdefault(gram.replace('_', ' '), {})[language] = weight
+
+        self.signature_languages: Dict[str, str] = {}
+        for language, letters in SIGNATURE_LETTERS.items():
+            for letter in letters:
+                self.signature_languages[letter] = language
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detect the language of text
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Tuple of (language code, confidence); ('und', 0.0) when the text
+            has no letters
+        """
+        scripts: Dict[str, int] = {}
+        scores: Dict[str, float] = {}
+        hits = 0
+        window = " "
+        letters = 0
+
+        # A trailing space closes the last word so its final trigram counts
+        for char in text.lower() + " ":
+            script = _script_of(char)
+            if script:
+                letters += 1
+                scripts[script] = scripts.get(script, 0) + 1
+            if script != 'latin':
+                char = " "
+            else:
+                language = self.signature_languages.get(char)
+                if language is not None:
+                    scores[language] = scores.get(language, 0.0) + SIGNATURE_WEIGHT
+
+            if char == " " and window[-1] == " ":
+                continue
+            window = (window + char)[-3:]
+            if len(window) == 3:
+                weights = self.trigram_weights.get(window)
+                if weights is not None:
+                    hits += 1
+                    for language, weight in weights.items():
+                        scores[language] = scores.get(language, 0.0) + weight
+
+        if letters == 0:
+            return UNKNOWN, 0.0
+
+        script, count = max(scripts.items(), key=lambda item: item[1])
+        share = count / letters
+        if 'kana' in scripts:
+            # Japanese mixes kana with Han characters
+            return 'ja', (scripts['kana'] + scripts.get('han', 0)) / letters
+        if script == 'han':
+            return 'zh', share
+        if script != 'latin':
+            return SCRIPT_LANGUAGES.get(script, UNKNOWN), share
+
+        if not scores:
+            return UNKNOWN, 0.0
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        language, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        margin = (best - runner_up) / best
+        coverage = min(1.0, hits / FULL_CONFIDENCE_HITS)
+        confidence = share * (0.5 + 0.5 * margin) * (0.5 + 0.5 * coverage)
+        return language, round(confidence, 3)
+
+
+_detector = None
+
+
+def get_language_detector() -> LanguageDetector:
+    """Return a shared detector; building the trigram tables once is enough"""
+    global _detector
+    if _detector is None:
+        _detector = LanguageDetector()
+    return _detector
@@ -0,0 +1,54 @@
+"""
+Session Backend Interface
+
+This service is responsible for storing per-session conversation data.
+It is not dependent on any specific storage implementation (e.g., DynamoDB).
+"""
+
+from typing import Any, Dict, Optional
+
+class SessionBackend:
+    """Defines the interface for session storage backends"""
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a session's data
+
+        Args:
+            session_id: Unique session identifier
+
+        Returns:
+            Copy of the session data, or None if the session is unknown or expired
+        """
+        # This interface requires actual implementation
+        # Basic implementation keeps no sessions
+        return None
+
+    def update(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge data into a session and restart its timeout
+
+        Args:
+            session_id: Unique session identifier
+            data: Fields to set
+
+        Returns:
+            The session data after the update
+        """
+        return dict(data)
+
+    def expire(self) -> int:
+        """Remove expired sessions and return how many were removed"""
+        return 0
+
+    def flush(self) -> None:
+        """Write out any buffered changes"""
+        pass
+
+    def flush_if_due(self) -> None:
+        """Write out buffered changes that have waited long enough; called at the end of each query"""
+        pass
+
+    def close(self) -> None:
+        """Flush and release resources"""
+        self.flush()
@@ -5,7 +5,7 @@ This service is responsible for translating text between different languages.
 It is not dependent on any specific translation service implementation (e.g., AWS Translate).
 """
 
-from typing import Tuple
+from typing import List, Tuple
 
 class TranslationService:
     """Defines the interface for the translation service"""
@@ -24,4 +24,19 @@ class TranslationService:
         """
         # This interface requires actual implementation
         # Basic implementation returns the original text without translation        
-        return text, source_lang 
\ No newline at end of file
+        return text, source_lang
+
+    def translate_batch(self, texts: List[str], source_lang: str = "auto", target_lang: str = "en") -> List[str]:
+        """
+        Translate several short segments at once
+
+        Args:
+            texts: Segments to translate
+            source_lang: Source language code (default: auto-detect)
+            target_lang: Target language code (default: English)
+
+        Returns:
+            Translated segments in input order
+        """
+        # Implementations that can pack segments into fewer calls override this
+        return [self.translate(text, source_lang, target_lang)[0] for text in texts]
@@ -0,0 +1,95 @@
+"""
+Benchmark the DynamoDB bulk loader against one put_item per record
+
+Loads --items synthetic records (shaped like dynamodb_ready_data.json) into
+an in-process DynamoDB stand-in that sleeps for --latency per request and
+leaves a fraction of each batch unprocessed. Compares the old sequential
+put_item loop with the bulk loader at several worker counts.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
+
+from upload_to_dynamodb import upload_data, convert_floats_to_decimals, print_summary
+
+
+class StandInDynamoDB:
+    """Sleeps like a DynamoDB round trip and keeps written items in a dict"""
+
+    def __init__(self, latency, unprocessed_rate):
+        self.latency = latency
+        self.unprocessed_rate = unprocessed_rate
+        self.items = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(7)
+
+    def batch_write_item(self, RequestItems):
+        time.sleep(self.latency)
+        unprocessed = {}
+        with self._lock:
+            self.requests += 1
+            for table_name, requests in RequestItems.items():
+                for request in requests:
+                    if self._random.random() < self.unprocessed_rate:
+                        unprocessed.setdefault(table_name, []).append(request)
+                    else:
+                        item = request['PutRequest']['Item']
+                        self.items[item['id']['N']] = item
+        return {'UnprocessedItems': unprocessed}
+
+    def put_item(self, Item):
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            self.items[str(Item['id'])] = Item
+
+
+def synthetic_items(count):
+    return [
+        {
+            'id': float(i),
+            'name': f"medicine {i} 500mg tablet",
+            'Uses': "Treatment of Bacterial infections",
+            'SideEffects': "Vomiting Nausea Diarrhea",
+            'Substitute': float('nan') if i % 3 else f"substitute {i}",
+            'Habit Forming': 'No'
+        }
+        for i in range(count)
+    ]
+
+
+def run_benchmark(count, latency, unprocessed_rate, worker_counts):
+    items = synthetic_items(count)
+
+    table = StandInDynamoDB(latency, 0.0)
+    sequential_count = min(count, 500)
+    start = time.perf_counter()
+    for item in items[:sequential_count]:
+        table.put_item(Item=convert_floats_to_decimals(item))
+    elapsed = time.perf_counter() - start
+    print(f"sequential put_item: {sequential_count} items in {elapsed:.2f}s: {sequential_count / elapsed:.0f} items/s")
+
+    for workers in worker_counts:
+        table = StandInDynamoDB(latency, unprocessed_rate)
+        summary = upload_data(json_path='bench', table_name='medical_info', workers=workers,
+                              checkpoint_path='', client=table, items=items)
+        print(f"bulk loader, {workers:>2} workers: ", end='')
+        print_summary(summary)
+        assert len(table.items) == count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=20000, help='Synthetic records to load')
+    parser.add_argument('--latency', type=float, default=0.01, help='Simulated request latency in seconds')
+    parser.add_argument('--unprocessed-rate', type=float, default=0.02, help='Fraction of items left unprocessed per request')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32], help='Worker counts to try')
+    args = parser.parse_args()
+    run_benchmark(args.items, args.latency, args.unprocessed_rate, args.workers)
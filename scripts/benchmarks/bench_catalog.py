@@ -0,0 +1,82 @@
+"""
+Benchmark drug catalog lookups against the OpenFDA path
+
+Times ChalliceMedicalInfoService._get_side_effects for medications answered
+from the catalog and for medications that fall through to OpenFDA, both on
+the first (uncached) call and on repeats served by the OpenFDA cache. The
+OpenFDA call is simulated with a fixed latency unless --live is given.
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.services.chalice_medical_info import ChalliceMedicalInfoService
+from chalicelib.services.openfda_client import OpenFDAClient
+from chalicelib.utils.http_client import HTTPClient
+
+
+def time_calls(func, names, iterations):
+    """Return per-call latencies in microseconds"""
+    latencies = []
+    for _ in range(iterations):
+        for name in names:
+            start = time.perf_counter()
+            func(name)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return latencies
+
+
+def summarize(label, latencies):
+    count = len(latencies)
+    p50 = latencies[count // 2]
+    p99 = latencies[min(count - 1, int(count * 0.99))]
+    print(f"{label:<28} calls={count:<7} mean={sum(latencies) / count:>10.1f}us p50={p50:>10.1f}us p99={p99:>10.1f}us")
+
+
+def fake_openfda(latency):
+    """Build a stand-in for requests.get that sleeps like a network round trip"""
+    def get(url, *args, **kwargs):
+        time.sleep(latency)
+        response = MagicMock()
+        response.status_code = 404
+        return response
+    return get
+
+
+def run_benchmark(iterations, openfda_latency, live):
+    start = time.perf_counter()
+    catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+    print(f"Catalog build: {len(catalog)} records in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    service = ChalliceMedicalInfoService()
+    service._catalog = catalog
+    service.openfda_client = OpenFDAClient(http_client=HTTPClient())
+    if not live:
+        service.openfda_client.http.session.get = fake_openfda(openfda_latency)
+
+    hit_names = [record.name for record in catalog.records]
+    alias_names = [record.aliases[-1] for record in catalog.records if record.aliases]
+    summarize("catalog exact name", time_calls(service._get_side_effects, hit_names, iterations))
+    summarize("catalog alias", time_calls(service._get_side_effects, alias_names, iterations))
+
+    miss_names = ["tylenol", "lisinopril", "metformin"]
+    label = "openfda (live)" if live else f"openfda (simulated {openfda_latency * 1000:.0f}ms)"
+    summarize(label, time_calls(service._get_side_effects, miss_names, 1))
+    summarize("openfda cached repeat", time_calls(service._get_side_effects, miss_names, iterations))
+    print(f"OpenFDA cache: {service.openfda_client.cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20, help='Passes over the catalog names')
+    parser.add_argument('--openfda-latency', type=float, default=0.15, help='Simulated OpenFDA latency in seconds')
+    parser.add_argument('--live', action='store_true', help='Call the real OpenFDA API for catalog misses')
+    args = parser.parse_args()
+    run_benchmark(args.iterations, args.openfda_latency, args.live)
@@ -0,0 +1,100 @@
+"""
+Benchmark the compiled catalog artifact against parsing the JSON dataset
+
+For the bundled dataset, or a synthetic one with --records rows, measures
+the time until the catalog can answer a lookup and the Python heap it keeps
+(tracemalloc). It then times --lookups name/alias lookups on each catalog.
+The artifact is built once up front, as the deployment build step would.
+get_drug_catalog() is timed too, with the packaged dataset (size check
+only) and with DRUG_CATALOG_PATH set (the dataset is hashed first).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import chalicelib.catalog.drug_catalog as drug_catalog
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.catalog.compiled_catalog import CompiledCatalog, compile_catalog
+
+
+def write_dataset(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([
+            {
+                'id': float(i),
+                'name': f"medicine{i} {i % 7 * 125 + 125}mg tablet",
+                'Uses': "Treatment of Bacterial infections, Treatment of Pain relief",
+                'SideEffects': "Vomiting, Nausea, Diarrhea, Headache, Dizziness (sense of spinning, light-headedness)",
+                'Substitute': f"Substitute{i}a 500 Tablet, Substitute{i}b 250 Tablet",
+                'Habit Forming': 'it cannot form a habit'
+            }
+            for i in range(count)
+        ], f)
+
+
+def process_catalog(source, artifact, configured):
+    """Loader running get_drug_catalog() as a fresh process would"""
+    def load():
+        with patch.dict(os.environ, {'DRUG_CATALOG_ARTIFACT': artifact}), \
+                patch.object(drug_catalog, 'DEFAULT_CATALOG_PATH', source), \
+                patch.object(drug_catalog, '_catalog', None):
+            if configured:
+                os.environ['DRUG_CATALOG_PATH'] = source
+            else:
+                os.environ.pop('DRUG_CATALOG_PATH', None)
+            return drug_catalog.get_drug_catalog()
+    return load
+
+
+def measure(label, load, names, lookups):
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = load()
+    catalog.lookup(names[0])
+    ready = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rng = random.Random(5)
+    sample = [rng.choice(names) for _ in range(lookups)]
+    start = time.perf_counter()
+    for name in sample:
+        catalog.lookup(name)
+    per_lookup = (time.perf_counter() - start) / lookups * 1e6
+    print(f"{label:<16} ready={ready * 1000:>9.2f}ms heap={retained / 1e6:>7.2f}MB lookup={per_lookup:>6.2f}us")
+
+
+def run_benchmark(records, lookups):
+    with tempfile.TemporaryDirectory() as directory:
+        source = DEFAULT_CATALOG_PATH
+        if records:
+            source = os.path.join(directory, 'dataset.json')
+            write_dataset(source, records)
+        artifact = os.path.join(directory, 'drug_catalog.bin')
+        parsed = DrugCatalog.from_file(source)
+        size = compile_catalog(parsed, artifact, source)
+        names = list(parsed.by_name) + list(parsed.by_alias)
+        print(f"Dataset: {len(parsed)} records, {os.path.getsize(source) / 1e6:.1f}MB JSON, {size / 1e6:.1f}MB artifact")
+        del parsed
+
+        measure("json parse", lambda: DrugCatalog.from_file(source), names, lookups)
+        measure("mmap artifact", lambda: CompiledCatalog(artifact), names, lookups)
+        measure("get (packaged)", process_catalog(source, artifact, False), names, lookups)
+        measure("get (configured)", process_catalog(source, artifact, True), names, lookups)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=0, help='Synthetic records (0 uses the bundled dataset)')
+    parser.add_argument('--lookups', type=int, default=20000, help='Lookups timed per catalog')
+    args = parser.parse_args()
+    run_benchmark(args.records, args.lookups)
@@ -0,0 +1,217 @@
+"""
+End-to-end benchmark of the chat pipeline
+
+Drives ChatbotInterface.handle_user_input and the /api/chat route (through
+chalice.test.Client) end to end through QueryHandler.process_query. The
+remote services are stand-ins with configurable latency: AWS Translate
+behind the real AWSTranslationService and its cache, Lex behind a stub
+intent service, and OpenFDA behind the real OpenFDAClient and its cache.
+The drug catalog is the real one.
+
+Two scenarios are measured for each entry point:
+- cache-miss: translation and OpenFDA caches are cleared before every request
+- cache-hit: the same queries repeated after a warm-up pass
+
+Each scenario reports p50/p95/p99 latency and throughput. A JSON record per
+run (with the configuration and git revision) is appended to --output so
+runs can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.services.intent_recognition_interface import IntentRecognitionService
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService
+from chalicelib.services.chalice_medical_info import ChalliceMedicalInfoService
+from chalicelib.services.openfda_client import OpenFDAClient
+from chalicelib.utils.http_client import HTTPClient
+from chalicelib.services.translation_cache import TranslationCache
+
+DEFAULT_OUTPUT = os.path.join('bench_results', 'chat_pipeline.jsonl')
+
+# (message, language) pairs: catalog answers, OpenFDA answers and translated queries
+QUERIES = [
+    ("What are the side effects of augmentin?", "auto"),
+    ("What are the side effects of lisinopril?", "auto"),
+    ("How much azithral should I take?", "en-US"),
+    ("Which drugs cause dizziness?", "auto"),
+    ("What can I take instead of augmentin?", "auto"),
+    ("¿Cuáles son los efectos secundarios de metformin?", "auto"),
+    ("Quels sont les effets secondaires de atorvastatin ?", "fr"),
+    ("What are the side effects of omeprazole?", "auto"),
+]
+
+
+class StubIntentService(IntentRecognitionService):
+    """Lex stand-in: sleeps, then uses the local keyword rules (which fill the medication slot)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.rules = ChaliceIntentRecognitionService()
+
+    def recognize_intent(self, query):
+        time.sleep(self.latency)
+        return self.rules.recognize_intent(query)
+
+
+def fake_translate(latency):
+    def translate_text(Text, SourceLanguageCode, TargetLanguageCode):
+        time.sleep(latency)
+        return {'TranslatedText': Text, 'SourceLanguageCode': 'es' if SourceLanguageCode == 'auto' else SourceLanguageCode}
+    return translate_text
+
+
+def fake_openfda(latency):
+    def get(url, *args, **kwargs):
+        time.sleep(latency)
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'results': [{'adverse_reactions': ["Headache, nausea and dizziness."]}]}
+        return response
+    return get
+
+
+def build_chatbot(args):
+    """ChatbotInterface whose ChaliceQueryHandler talks to the stand-ins"""
+    from chalicelib.interfaces.chalice_chatbot_adapter import ChatbotInterface
+    chatbot = ChatbotInterface()
+
+    handler = chatbot.query_handler
+    handler.translation_service.translate_client = MagicMock()
+    handler.translation_service.translate_client.translate_text.side_effect = fake_translate(args.translate_latency)
+    handler.translation_service.cache = TranslationCache(path='')
+    handler.intent_service = StubIntentService(args.intent_latency)
+    medical = ChalliceMedicalInfoService()
+    medical.openfda_client = OpenFDAClient(base_url='https://fda.invalid/drug', api_key='', http_client=HTTPClient())
+    medical.openfda_client.http.session.get = fake_openfda(args.openfda_latency)
+    medical.initialize()
+    handler.medical_service = medical
+    return chatbot
+
+
+def clear_caches(chatbot):
+    handler = chatbot.query_handler
+    handler.translation_service.cache.memory.clear()
+    handler.medical_service.openfda_client.cache.clear()
+
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+def run_scenario(send, requests, concurrency, before_each=None):
+    """Send every request and summarize latency (ms) and throughput (requests/s)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def one(request):
+        if before_each is not None:
+            before_each()
+        start = time.perf_counter()
+        send(*request)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(one, requests))
+    else:
+        for request in requests:
+            one(request)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'throughput_rps': round(len(latencies) / wall, 1)
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(args):
+    chatbot = build_chatbot(args)
+    requests = QUERIES * args.iterations
+
+    def via_chatbot(message, language):
+        response = chatbot.handle_user_input(message, language)
+        assert response.get('status') != 'error', response
+
+    import app
+    from chalice.test import Client
+    app.chatbot = chatbot
+    client = Client(app.app)
+
+    def via_api(message, language):
+        response = client.http.post(
+            '/api/chat',
+            headers={'Content-Type': 'application/json'},
+            body=json.dumps({'message': message, 'language': language})
+        )
+        assert response.status_code == 200, response.body
+
+    results = {}
+    for entry_point, send in (('chatbot', via_chatbot), ('api', via_api)):
+        # Misses run sequentially: clearing shared caches mid-flight would mix the scenarios
+        results[f"{entry_point}/cache-miss"] = run_scenario(send, requests, 1, lambda: clear_caches(chatbot))
+        for request in QUERIES:
+            send(*request)
+        results[f"{entry_point}/cache-hit"] = run_scenario(send, requests, args.concurrency)
+
+    for name, summary in results.items():
+        print(f"{name:<20} n={summary['requests']:<5} p50={summary['p50_ms']:>8.2f}ms p95={summary['p95_ms']:>8.2f}ms "
+              f"p99={summary['p99_ms']:>8.2f}ms throughput={summary['throughput_rps']:>8.1f}/s")
+
+    record = {
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'config': {
+            'iterations': args.iterations,
+            'concurrency': args.concurrency,
+            'translate_latency': args.translate_latency,
+            'intent_latency': args.intent_latency,
+            'openfda_latency': args.openfda_latency
+        },
+        'results': results
+    }
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10, help='Passes over the query mix per scenario')
+    parser.add_argument('--concurrency', type=int, default=1, help='Concurrent requests in the cache-hit scenarios')
+    parser.add_argument('--translate-latency', type=float, default=0.08, help='Simulated AWS Translate latency in seconds')
+    parser.add_argument('--intent-latency', type=float, default=0.06, help='Simulated Lex latency in seconds')
+    parser.add_argument('--openfda-latency', type=float, default=0.15, help='Simulated OpenFDA latency in seconds')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON Lines file the run record is appended to')
+    args = parser.parse_args()
+    run_benchmark(args)
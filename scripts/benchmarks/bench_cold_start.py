@@ -0,0 +1,83 @@
+"""
+Benchmark Lambda cold-start cost of the Chalice app
+
+Each run starts a fresh Python interpreter, like a new Lambda container,
+and measures:
+- import: time to import app (what Lambda init pays for every container)
+- first services: time to build the query handler's services, which
+  happens on the first request instead of at import
+- first clients: time to create the boto3 Translate client and the
+  OpenFDA HTTP session, paid by the first request that needs each one
+
+It also lists which heavy dependencies (boto3, botocore, requests) were
+already loaded after the import. They should be absent. With
+--max-import-ms, the script exits non-zero when the median import time
+exceeds the budget or a heavy module is imported eagerly, so CI can catch
+regressions.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+HEAVY_MODULES = ('boto3', 'botocore', 'requests')
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+eager = [name for name in {heavy!r} if name in sys.modules]
+handler = app.chatbot.query_handler
+handler.translation_service, handler.intent_service, handler.medical_service, handler.session_store
+built = time.perf_counter()
+handler.translation_service.translate_client, handler.medical_service.openfda_client.http.session
+connected = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'services_ms': (built - imported) * 1000,
+    'clients_ms': (connected - built) * 1000,
+    'eager_modules': eager
+}}))
+"""
+
+
+def run_once():
+    env = dict(os.environ, AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'), LOG_LEVEL='WARNING')
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=ROOT, env=env, text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark(runs, max_import_ms):
+    samples = [run_once() for _ in range(runs)]
+    import_ms = statistics.median(sample['import_ms'] for sample in samples)
+    services_ms = statistics.median(sample['services_ms'] for sample in samples)
+    clients_ms = statistics.median(sample['clients_ms'] for sample in samples)
+    eager = sorted({name for sample in samples for name in sample['eager_modules']})
+
+    print(f"import app:      median {import_ms:>8.1f}ms over {runs} runs")
+    print(f"first services:  median {services_ms:>8.1f}ms")
+    print(f"first clients:   median {clients_ms:>8.1f}ms")
+    print(f"eager heavy imports: {', '.join(eager) or 'none'}")
+
+    if max_import_ms is not None and (import_ms > max_import_ms or eager):
+        print(f"FAIL: import budget is {max_import_ms:.0f}ms with no eager heavy imports")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters to start')
+    parser.add_argument('--max-import-ms', type=float, default=None, help='Fail when the median import time exceeds this')
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.runs, args.max_import_ms))
@@ -0,0 +1,100 @@
+"""
+Benchmark fuzzy medication-name matching
+
+Builds the trigram matcher over the 500-name catalog and over a synthetic
+catalog of generated drug-like names, then times queries carrying one or two
+random typos against each. The synthetic catalog is also searched with the
+opt-in max_postings bound, to show what it costs in recall and saves in
+latency, and each row is checked against the sub-millisecond p99 target.
+Recall counts queries whose source name is among the matches; typos beyond
+the length-based edit budget are misses by design.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.catalog.fuzzy_matcher import FuzzyMatcher
+
+TARGET_P99_US = 1000
+
+SYLLABLES = ['a', 'ab', 'ac', 'al', 'am', 'an', 'ar', 'az', 'bi', 'ca', 'ce', 'ci', 'cla', 'co', 'da',
+             'de', 'di', 'do', 'fe', 'flo', 'ga', 'gli', 'hy', 'ka', 'la', 'le', 'li', 'lo', 'ma', 'me',
+             'mi', 'mo', 'na', 'ne', 'ni', 'no', 'pa', 'pe', 'pi', 'pra', 'ro', 'sa', 'se', 'si', 'ta',
+             'te', 'ti', 'tra', 'va', 'vi', 'xa', 'zo', 'zy']
+SUFFIXES = ['', '', ' 5', ' 10', ' 20', ' 40', ' 100', ' 250mg', ' 500', ' sr', ' plus', ' forte', ' ds']
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def synthetic_names(count, rng):
+    names = set()
+    while len(names) < count:
+        stem = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        names.add(stem + rng.choice(SUFFIXES))
+    return sorted(names)
+
+
+def add_typos(name, edits, rng):
+    chars = list(name)
+    for _ in range(edits):
+        position = rng.randrange(len(chars))
+        operation = rng.choice(('substitute', 'insert', 'delete'))
+        if operation == 'substitute':
+            chars[position] = rng.choice(LETTERS)
+        elif operation == 'insert':
+            chars.insert(position, rng.choice(LETTERS))
+        elif len(chars) > 1:
+            del chars[position]
+    return ''.join(chars)
+
+
+def run_queries(label, terms, query_count, rng, max_postings=None):
+    start = time.perf_counter()
+    matcher = FuzzyMatcher(terms, max_postings=max_postings)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Misspell terms long enough to get an edit budget
+    sources = [term for term in terms if len(term) >= 6]
+    queries = []
+    for _ in range(query_count):
+        source = rng.choice(sources)
+        queries.append((source, add_typos(source, rng.choice((1, 1, 2)), rng)))
+
+    latencies = []
+    found = 0
+    for source, query in queries:
+        start = time.perf_counter()
+        matches = matcher.match(query)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        if any(term == source for term, _ in matches):
+            found += 1
+
+    latencies.sort()
+    count = len(latencies)
+    p99 = latencies[min(count - 1, int(count * 0.99))]
+    target = "meets" if p99 < TARGET_P99_US else "MISSES"
+    print(f"{label:<32} terms={len(matcher):<7} build={build_ms:>8.1f}ms "
+          f"mean={sum(latencies) / count:>7.1f}us p50={latencies[count // 2]:>7.1f}us "
+          f"p99={p99:>7.1f}us recall={found / count:.1%} ({target} the {TARGET_P99_US}us p99 target)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000, help='Misspelled queries per catalog')
+    parser.add_argument('--synthetic-size', type=int, default=50000, help='Names in the synthetic catalog')
+    parser.add_argument('--max-postings', type=int, default=1000, help='Posting entries merged per query in the bounded run')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+    run_queries("catalog (500)", list(catalog.by_name) + list(catalog.by_alias), args.queries, rng)
+    synthetic = synthetic_names(args.synthetic_size, rng)
+    label = f"synthetic ({args.synthetic_size // 1000}k)"
+    run_queries(label, synthetic, args.queries, random.Random(args.seed))
+    run_queries(f"{label}, bounded merge", synthetic, args.queries, random.Random(args.seed), args.max_postings)
@@ -0,0 +1,114 @@
+"""
+Benchmark the normalized-utterance cache in front of Lex
+
+Replays a skewed stream of chat questions (a few wordings asked about many
+medications, with varied case and punctuation) through the Lex
+IntentRecognitionService using a stand-in client that sleeps like a
+recognize_text round trip. The stream is run without a cache, with exact
+normalized-utterance keys and with medications abstracted into placeholders.
+Each run reports the Lex call count, the cache hit rate and the mean latency.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService, COMMON_MEDICATIONS
+from chalicelib.services.intent_cache import IntentCache
+from chalicelib.services.intent_recognition_service import IntentRecognitionService
+
+WORDINGS = [
+    ("What are the side effects of {}?", 'GetSideEffects'),
+    ("How much {} should I take?", 'GetDosageInfo'),
+    ("What can I take instead of {}?", 'GetSubstitutes'),
+    ("What is {} used for?", 'GeneralMedicationInfo'),
+    ("Can I drink alcohol with {}?", 'GetDrugInteractions'),
+    ("Is {} safe during pregnancy?", 'GeneralMedicationInfo'),
+]
+
+
+def surface(text, rng):
+    """Vary case, spacing and punctuation the way users type"""
+    if rng.random() < 0.5:
+        text = text.lower()
+    if rng.random() < 0.3:
+        text = text.rstrip('?')
+    if rng.random() < 0.2:
+        text = text.replace(' ', '  ', 1)
+    return text
+
+
+def make_stream(count, medications, rng):
+    # Zipf-like popularity over wordings and medications
+    wording_weights = [1 / (rank + 1) for rank in range(len(WORDINGS))]
+    medication_weights = [1 / (rank + 1) for rank in range(len(medications))]
+    stream = []
+    for _ in range(count):
+        wording, intent = rng.choices(WORDINGS, wording_weights)[0]
+        medication = rng.choices(medications, medication_weights)[0]
+        stream.append((surface(wording.format(medication), rng), intent, medication))
+    return stream
+
+
+def lex_service(cache, latency, answers):
+    def recognize_text(text, **kwargs):
+        time.sleep(latency)
+        intent, medication = answers[text]
+        value = {'originalValue': medication, 'interpretedValue': medication, 'resolvedValues': [medication]}
+        return {'interpretations': [{'intent': {'name': intent, 'slots': {'Medication': {'value': value}}}}]}
+
+    with patch('chalicelib.services.intent_recognition_service.boto3'):
+        service = IntentRecognitionService(cache=cache)
+    service.client = MagicMock()
+    service.client.recognize_text.side_effect = recognize_text
+    return service
+
+
+def run(label, cache, stream, latency):
+    answers = {text: (intent, medication) for text, intent, medication in stream}
+    service = lex_service(cache, latency, answers)
+    start = time.perf_counter()
+    wrong = 0
+    for text, intent, medication in stream:
+        result = service.recognize_intent(text)
+        value = result['intent']['slots']['Medication']['value']
+        if result['intent']['name'] != intent or value['interpretedValue'] != medication:
+            wrong += 1
+    elapsed = time.perf_counter() - start
+    hit_rate = service.cache.stats()['hit_rate'] if cache.cache.maxsize else 0.0
+    print(f"{label:<22} lex_calls={service.client.recognize_text.call_count:<6} hit_rate={hit_rate:>6.1%} "
+          f"mean={elapsed / len(stream) * 1000:>7.2f}ms wrong_slots={wrong}")
+
+
+def run_benchmark(requests, medication_count, latency, cache_size, seed):
+    rng = random.Random(seed)
+    catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+    scanner = ChaliceIntentRecognitionService(catalog=catalog)
+    medications = (list(COMMON_MEDICATIONS) + [record.aliases[-1] if record.aliases else record.normalized_name
+                                               for record in catalog])[:medication_count]
+    stream = make_stream(requests, medications, rng)
+    print(f"{requests} requests, {len(set(text for text, _, _ in stream))} distinct strings, "
+          f"{len(medications)} medications, Lex latency {latency * 1000:.0f}ms")
+
+    run("no cache", IntentCache(maxsize=0, ttl=3600, abstract_medications=False), stream, latency)
+    run("exact utterance", IntentCache(maxsize=cache_size, ttl=3600, abstract_medications=False), stream, latency)
+    run("medications abstracted", IntentCache(maxsize=cache_size, ttl=3600, abstract_medications=True, scanner=scanner),
+        stream, latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--medications', type=int, default=200, help='Distinct medications asked about')
+    parser.add_argument('--lex-latency', type=float, default=0.01, help='Simulated Lex recognize_text latency in seconds')
+    parser.add_argument('--cache-size', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    run_benchmark(args.requests, args.medications, args.lex_latency, args.cache_size, args.seed)
@@ -0,0 +1,113 @@
+"""
+Benchmark the local intent classifier against the Lex path
+
+Times intent recognition for a mix of chat queries:
+- Lex: the Lex IntentRecognitionService with a stand-in client that sleeps
+  like a recognize_text round trip
+- keyword rules: ChaliceIntentRecognitionService
+- local: LocalIntentRecognitionService, one query per call
+- local batch: LocalIntentRecognitionService.recognize_intents over batches
+
+The trained model at --model is used when it exists; otherwise a model is
+trained in memory from the sample utterances first.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService, COMMON_MEDICATIONS
+from chalicelib.services.intent_classifier import (
+    DEFAULT_MODEL_PATH, IntentClassifier, expand_utterances, load_templates
+)
+from chalicelib.services.local_intent_recognition import LocalIntentRecognitionService
+
+QUERIES = [
+    "What are the side effects of augmentin?",
+    "How much ibuprofen can I take in a day?",
+    "Which drugs cause dizziness?",
+    "What can I take instead of azithral 500?",
+    "Can I take aspirin with warfarin?",
+    "What is metformin used for?",
+    "is dolo 650 safe during pregnancy",
+    "my child has a fever how much paracetamol should i give",
+]
+
+
+def lex_service(latency):
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    from chalicelib.services.intent_recognition_service import IntentRecognitionService
+
+    def recognize_text(**kwargs):
+        time.sleep(latency)
+        return {'interpretations': [{'intent': {'name': 'GetSideEffects', 'slots': {}}}]}
+
+    service = IntentRecognitionService()
+    service.client = MagicMock()
+    service.client.recognize_text.side_effect = recognize_text
+    return service
+
+
+def load_or_train(path, catalog):
+    if os.path.exists(path):
+        return IntentClassifier.load(path)
+    print(f"{path} not found, training a model in memory")
+    slots = {'medication': sorted(set(COMMON_MEDICATIONS) | set(catalog.by_alias)), 'side_effect': ['nausea', 'headache', 'dizziness', 'rash']}
+    texts, labels, _ = zip(*expand_utterances(load_templates(), slots, 8, random.Random(7)))
+    model = IntentClassifier(sorted(set(labels)))
+    model.fit(texts, labels)
+    return model
+
+
+def summarize(label, latencies_ms, per_query=1):
+    latencies_ms = sorted(latency / per_query for latency in latencies_ms)
+    count = len(latencies_ms)
+    print(f"{label:<22} mean={sum(latencies_ms) / count:>9.3f}ms p50={latencies_ms[count // 2]:>9.3f}ms "
+          f"p99={latencies_ms[min(count - 1, int(count * 0.99))]:>9.3f}ms per query")
+
+
+def time_calls(function, inputs):
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        function(item)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run_benchmark(iterations, lex_latency, model_path, batch_sizes):
+    catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+    rules = ChaliceIntentRecognitionService(catalog=catalog)
+    local = LocalIntentRecognitionService(model_path=model_path, rules=rules, min_confidence=0.0)
+    local.classifier = load_or_train(model_path, catalog)
+    for query in QUERIES:
+        local.recognize_intent(query)  # warm up the automaton and the model
+
+    queries = QUERIES * iterations
+    lex = lex_service(lex_latency)
+    summarize("lex", time_calls(lex.recognize_intent, QUERIES * max(1, iterations // 10)))
+    summarize("keyword rules", time_calls(rules.recognize_intent, queries))
+    summarize("local", time_calls(local.recognize_intent, queries))
+    for size in batch_sizes:
+        batches = [queries[i:i + size] for i in range(0, len(queries) - size + 1, size)] or [queries]
+        summarize(f"local batch of {size}", time_calls(local.recognize_intents, batches), per_query=size)
+
+    for query, result in zip(QUERIES, local.recognize_intents(QUERIES)):
+        print(f"  {result['intent']:<22} {result['confidence']:.2f}  {query}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=100, help='Passes over the query mix')
+    parser.add_argument('--lex-latency', type=float, default=0.08, help='Simulated Lex recognize_text latency in seconds')
+    parser.add_argument('--model', default=os.getenv('INTENT_MODEL_PATH', DEFAULT_MODEL_PATH), help='Trained model')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[16, 128])
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations, args.lex_latency, args.model, args.batch_sizes)
@@ -0,0 +1,121 @@
+"""
+Benchmark single-pass intent and medication extraction
+
+Compares the keyword automaton behind ChaliceIntentRecognitionService with
+the straightforward alternative of testing every cue word and medication
+name against the query in turn. Both are run over short chat queries, over
+long pasted texts and over batches of queries, first with the bundled
+catalog and then with a synthetic catalog of generated drug names.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH, normalize_name
+from chalicelib.services.chalice_intent_recognition import (
+    ChaliceIntentRecognitionService, INTENT_CUES, WHOLE_WORD_CUES, MIN_ALIAS_LENGTH, COMMON_MEDICATIONS
+)
+
+SYLLABLES = ['ab', 'ac', 'al', 'am', 'ar', 'az', 'bi', 'ca', 'cla', 'co', 'de', 'di', 'flo', 'gli',
+             'hy', 'ka', 'li', 'lo', 'ma', 'mi', 'mo', 'ne', 'pa', 'pra', 'ro', 'se', 'ta', 'tra',
+             'va', 'xa', 'zo', 'zy']
+FILLER = ("my doctor said i should ask what the usual dose is and whether there is anything i can "
+          "take instead because last time i had a reaction").split()
+TEMPLATES = [
+    "What are the side effects of {}?",
+    "How much {} should I take?",
+    "What can I take instead of {}?",
+    "Which drugs cause dizziness?",
+    "Tell me about {} and {}",
+]
+
+
+def synthetic_catalog(count, rng):
+    names = set()
+    while len(names) < count:
+        names.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + rng.choice(['', ' 500 tablet', ' syrup']))
+    return DrugCatalog.from_items({'id': i, 'name': name} for i, name in enumerate(sorted(names)))
+
+
+def naive_scan(query, cues, medications):
+    """One substring test per keyword"""
+    text = normalize_name(query)
+    found_cues = {kind for cue, kind in cues.items() if cue in text}
+    mentions = []
+    for name in medications:
+        start = text.find(name)
+        while start != -1:
+            end = start + len(name)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                mentions.append(name)
+                break
+            start = text.find(name, start + 1)
+    return found_cues, mentions
+
+
+def make_queries(names, count, rng):
+    queries = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        queries.append(template.format(*(rng.choice(names) for _ in range(template.count('{}')))))
+    return queries
+
+
+def make_text(names, words, rng):
+    text = []
+    for _ in range(words):
+        text.append(rng.choice(names) if rng.random() < 0.02 else rng.choice(FILLER))
+    return ' '.join(text)
+
+
+def time_per_call(function, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            function(item)
+    return (time.perf_counter() - start) / (repeat * len(inputs))
+
+
+def run_catalog(label, catalog, args, rng):
+    service = ChaliceIntentRecognitionService(catalog=catalog)
+    start = time.perf_counter()
+    service.recognize_intent("warm up")
+    build_ms = (time.perf_counter() - start) * 1000
+    medications = sorted(set(COMMON_MEDICATIONS) | set(catalog.by_name) |
+                         {alias for alias in catalog.by_alias if len(alias) >= MIN_ALIAS_LENGTH})
+    names = list(catalog.by_name) + list(COMMON_MEDICATIONS)
+    cues = {**INTENT_CUES, **WHOLE_WORD_CUES}
+
+    short = make_queries(names, args.batch_size, rng)
+    long_texts = [make_text(names, args.long_words, rng) for _ in range(5)]
+    print(f"{label}: {len(medications)} medication keywords, automaton built in {build_ms:.1f}ms")
+
+    for case, inputs, repeat in (("short query", short, 3), (f"{args.long_words}-word text", long_texts, 1)):
+        naive = time_per_call(lambda query: naive_scan(query, cues, medications), inputs, repeat)
+        automaton = time_per_call(service.scan, inputs, repeat)
+        print(f"  {case:<16} naive={naive * 1e6:>10.1f}us automaton={automaton * 1e6:>8.1f}us "
+              f"speedup={naive / automaton:>6.1f}x")
+
+    start = time.perf_counter()
+    for query in short:
+        service.recognize_intent(query)
+    elapsed = time.perf_counter() - start
+    print(f"  batch of {len(short)}: recognize_intent {elapsed * 1000:.1f}ms ({len(short) / elapsed:,.0f} queries/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=1000, help='Short queries per batch')
+    parser.add_argument('--long-words', type=int, default=5000, help='Words in each long text')
+    parser.add_argument('--synthetic-size', type=int, default=20000, help='Names in the synthetic catalog')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    run_catalog("catalog", DrugCatalog.from_file(DEFAULT_CATALOG_PATH), args, rng)
+    run_catalog(f"synthetic ({args.synthetic_size // 1000}k)", synthetic_catalog(args.synthetic_size, rng), args, rng)
@@ -0,0 +1,89 @@
+"""
+Benchmark SessionStore against the old full-scan session cleanup
+
+Fills a SessionStore with --sessions entries and times updates, the
+per-request expire() call when nothing is due, a mass expiry, and eviction
+at the size cap. For comparison it times one pass of the previous cleanup,
+which parsed the ISO timestamp of every session in a plain dict.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.orchestration.session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    per_op = elapsed / count * 1e6 if count else 0.0
+    print(f"{label:<34} total={elapsed * 1000:>10.1f}ms per-op={per_op:>8.3f}us")
+    return result
+
+
+def full_scan_cleanup(session_data, timeout):
+    """The cleanup QueryHandler used to run on every request"""
+    current_time = datetime.utcnow()
+    expired_sessions = [
+        session_id for session_id, data in session_data.items()
+        if current_time - datetime.fromisoformat(data["timestamp"]) > timeout
+    ]
+    for session_id in expired_sessions:
+        del session_data[session_id]
+
+
+def run_benchmark(sessions, cleanup_calls):
+    clock = FakeClock()
+    store = SessionStore(timeout=3600, max_sessions=sessions, clock=clock)
+    ids = [f"chalice-session-{i}" for i in range(sessions)]
+
+    def fill():
+        for i, session_id in enumerate(ids):
+            clock.now = i * 0.001
+            store.update(session_id, {"last_intent": "GetSideEffects", "query_count": 1})
+
+    timed(f"insert {sessions} sessions", fill, sessions)
+
+    def touch():
+        for session_id in ids[::10]:
+            store.update(session_id, {"query_count": 2})
+
+    timed("update 10% of sessions", touch, len(ids[::10]))
+    timed(f"expire() x{cleanup_calls}, none due", lambda: [store.expire() for _ in range(cleanup_calls)], cleanup_calls)
+
+    def overflow():
+        for i in range(sessions // 10):
+            store.update(f"overflow-{i}", {})
+
+    timed("insert 10% past cap (evicting)", overflow, sessions // 10)
+    print(f"Store: {store.stats()}")
+
+    clock.now += 3600 * 2
+    removed = timed("expire() all sessions", store.expire, len(store))
+    print(f"Expired {removed} sessions, {len(store)} left")
+
+    timestamp = datetime.utcnow().isoformat()
+    session_data = {session_id: {"timestamp": timestamp, "query_count": 1} for session_id in ids}
+    timed("old full-scan cleanup, one call", lambda: full_scan_cleanup(session_data, timedelta(hours=24)), 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=1000000, help='Sessions to store')
+    parser.add_argument('--cleanup-calls', type=int, default=100000, help='Per-request expire() calls to time')
+    args = parser.parse_args()
+    run_benchmark(args.sessions, args.cleanup_calls)
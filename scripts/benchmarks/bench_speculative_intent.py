@@ -0,0 +1,83 @@
+"""
+Benchmark speculative intent recognition in QueryHandler
+
+Runs a mix of English and non-English queries through
+QueryHandler._translate_and_recognize with speculation off and on, using
+stand-ins that sleep like AWS Translate and Lex round trips, and reports
+latency along with how often speculation wins. English queries are sent
+with language "en-US" so they are not answered by the local detector's
+skip-translation fast path.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.orchestration.query_handler_interface import QueryHandler
+
+QUERIES = {
+    "What are the side effects of aspirin?": "What are the side effects of aspirin?",
+    "How much ibuprofen can I take?": "How much ibuprofen can I take?",
+    "Which drugs cause dizziness?": "Which drugs cause dizziness?",
+    "what can i take instead of augmentin": "What can I take instead of Augmentin?",
+    "¿Cuáles son los efectos secundarios del paracetamol?": "What are the side effects of paracetamol?",
+    "Quels sont les effets secondaires de l'aspirine ?": "What are the side effects of aspirin?",
+}
+
+
+class SimulatedTranslation:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def translate(self, text, source_lang="auto", target_lang="en"):
+        time.sleep(self.latency)
+        return QUERIES.get(text, text), "en"
+
+
+class SimulatedIntent:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def recognize_intent(self, query):
+        time.sleep(self.latency)
+        return {'intent': 'GeneralMedicationInfo', 'confidence': 0.7, 'slots': {}}
+
+
+def run_mode(label, speculative, iterations, translate_latency, intent_latency):
+    handler = QueryHandler()
+    handler.translation_service = SimulatedTranslation(translate_latency)
+    handler.intent_service = SimulatedIntent(intent_latency)
+    handler.speculative_intent = speculative
+
+    latencies = []
+    for _ in range(iterations):
+        for query in QUERIES:
+            start = time.perf_counter()
+            handler._translate_and_recognize(query, "en-US" if query.isascii() else "auto")
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    count = len(latencies)
+    print(f"{label:<16} calls={count:<5} mean={sum(latencies) / count:>7.1f}ms "
+          f"p50={latencies[count // 2]:>7.1f}ms p99={latencies[min(count - 1, int(count * 0.99))]:>7.1f}ms")
+    stats = handler.speculation_stats()
+    handler.cleanup()
+    return stats
+
+
+def run_benchmark(iterations, translate_latency, intent_latency):
+    run_mode("sequential", False, iterations, translate_latency, intent_latency)
+    stats = run_mode("speculative", True, iterations, translate_latency, intent_latency)
+    print(f"Speculation: attempts={stats['attempts']} wins={stats['wins']} "
+          f"win_rate={stats['win_rate']:.0%} saved={stats['saved_ms']:.1f}ms total")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10, help='Passes over the query mix')
+    parser.add_argument('--translate-latency', type=float, default=0.08, help='Simulated AWS Translate latency in seconds')
+    parser.add_argument('--intent-latency', type=float, default=0.06, help='Simulated Lex latency in seconds')
+    args = parser.parse_args()
+    run_benchmark(args.iterations, args.translate_latency, args.intent_latency)
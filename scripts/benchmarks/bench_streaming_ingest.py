@@ -0,0 +1,77 @@
+"""
+Benchmark streaming ingestion against json.load
+
+Writes a synthetic dataset of --records rows shaped like
+dynamodb_ready_data.json, then measures the peak Python heap (tracemalloc)
+and wall time of reading it whole with json.load plus the old recursive
+Decimal conversion, versus streaming it through the parse, convert and
+batch pipeline used by the DynamoDB loader. Times include
+tracemalloc overhead.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
+
+from upload_to_dynamodb import convert_floats_to_decimals, load_items, make_batches
+
+
+def write_dataset(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(count):
+            if i:
+                f.write(',\n')
+            f.write(json.dumps({
+                'id': float(i),
+                'name': f"medicine {i} 500mg tablet",
+                'Uses': "Treatment of Bacterial infections, Treatment of Pain relief",
+                'SideEffects': "Vomiting, Nausea, Diarrhea, Headache, Dizziness",
+                'Substitute': float('nan') if i % 3 else f"substitute {i}a, substitute {i}b",
+                'Habit Forming': 'No'
+            }))
+        f.write(']')
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    batches = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} batches={batches:<7} peak={peak / 1e6:>8.1f}MB time={elapsed:.2f}s")
+
+
+def load_whole(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    items = [convert_floats_to_decimals(item) for item in data]
+    return len(range(0, len(items), 25))
+
+
+def load_streaming(path):
+    return sum(1 for _ in make_batches(load_items(path)))
+
+
+def run_benchmark(records):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'dataset.json')
+        write_dataset(path, records)
+        print(f"Dataset: {records} records, {os.path.getsize(path) / 1e6:.1f}MB")
+        measure("json.load (old)", lambda: load_whole(path))
+        measure("streaming pipeline", lambda: load_streaming(path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=200000, help='Synthetic records to write')
+    args = parser.parse_args()
+    run_benchmark(args.records)
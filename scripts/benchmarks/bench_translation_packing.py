@@ -0,0 +1,94 @@
+"""
+Benchmark AWS Translate round trips saved by segment packing
+
+Builds the general-information response for every catalog drug, then runs
+QueryHandler._prepare_final_response with per-segment translation and with
+packed translation, counting TranslateText calls per response. The
+translation cache is cleared before each response so only packing is
+measured. AWS Translate is replaced by a stand-in that upper-cases its input
+(or, with --mangle, drops the segment markers to exercise the fallback).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.orchestration.query_handler_interface import QueryHandler
+from core.services.translation_service_interface import TranslationService
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.services.aws_translation_service import AWSTranslationService
+from chalicelib.services.chalice_medical_info import ChalliceMedicalInfoService
+from chalicelib.services.translation_cache import TranslationCache
+
+
+def fake_translate(latency, mangle):
+    """Build a stand-in for translate_text that sleeps like a network round trip"""
+    def translate_text(Text, SourceLanguageCode, TargetLanguageCode):
+        time.sleep(latency)
+        translated = Text.upper()
+        if mangle:
+            translated = translated.replace('[[', '(').replace(']]', ')')
+        return {'TranslatedText': translated, 'SourceLanguageCode': SourceLanguageCode}
+    return translate_text
+
+
+class PerSegmentTranslation:
+    """Wraps the AWS service but translates batches one segment per call"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def translate(self, text, source_lang="auto", target_lang="en"):
+        return self.service.translate(text, source_lang, target_lang)
+
+    def translate_batch(self, texts, source_lang="auto", target_lang="en"):
+        return TranslationService.translate_batch(self, texts, source_lang, target_lang)
+
+
+def run_mode(label, handler, service, responses):
+    calls = []
+    start = time.perf_counter()
+    for response in responses:
+        service.cache.memory.clear()
+        before = service.api_calls
+        handler._prepare_final_response(dict(response), "en", "es")
+        calls.append(service.api_calls - before)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} responses={len(calls):<5} calls/response mean={statistics.mean(calls):>5.2f} "
+          f"max={max(calls):<3} total={sum(calls):<6} wall={elapsed:.2f}s")
+    return sum(calls)
+
+
+def run_benchmark(latency, mangle, limit):
+    catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+    medical = ChalliceMedicalInfoService()
+    medical._catalog = catalog
+    responses = [medical._get_general_info(record.name) for record in catalog.records[:limit]]
+    segments = [1 + len(r['data'].get('uses', [])) + len(r['data'].get('side_effects', [])) for r in responses]
+    print(f"{len(responses)} responses, {statistics.mean(segments):.1f} segments/response on average")
+
+    service = AWSTranslationService(cache=TranslationCache(path=''))
+    service.translate_client = MagicMock()
+    service.translate_client.translate_text.side_effect = fake_translate(latency, mangle)
+
+    handler = QueryHandler()
+    handler.translation_service = PerSegmentTranslation(service)
+    per_segment = run_mode("per-segment", handler, service, responses)
+    handler.translation_service = service
+    packed = run_mode("packed", handler, service, responses)
+    print(f"Round trips saved: {per_segment - packed} of {per_segment} "
+          f"({(per_segment - packed) / per_segment * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated TranslateText latency in seconds')
+    parser.add_argument('--mangle', action='store_true', help='Drop segment markers to force the per-segment fallback')
+    parser.add_argument('--limit', type=int, default=500, help='Catalog drugs to build responses for')
+    args = parser.parse_args()
+    run_benchmark(args.latency, args.mangle, args.limit)
@@ -0,0 +1,53 @@
+"""
+Compile the processed medication dataset into a memory-mappable catalog artifact
+
+Parses data/processed/dynamodb_ready_data.json once, exactly as the runtime
+catalog does, and writes data/processed/drug_catalog.bin. The runtime maps
+that file instead of parsing JSON. At startup only the dataset's size is
+compared with the one recorded in the artifact (the digest too when
+DRUG_CATALOG_PATH is set), so run this after every dataset update, and run
+it with --check before packaging a deployment to verify the digest.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.catalog.compiled_catalog import CompiledCatalog, DEFAULT_ARTIFACT_PATH, compile_catalog, is_fresh
+
+
+def build_artifact(source, output):
+    start = time.perf_counter()
+    catalog = DrugCatalog.from_file(source)
+    size = compile_catalog(catalog, output, source)
+
+    # Read the artifact back and compare every record with the parsed catalog
+    compiled = CompiledCatalog(output)
+    try:
+        assert len(compiled) == len(catalog)
+        for original, mapped in zip(catalog.records, compiled.records):
+            assert mapped.to_dict() == original.to_dict() and mapped.aliases == original.aliases, original.name
+    finally:
+        compiled.close()
+    return len(catalog), size, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=os.getenv('DRUG_CATALOG_PATH', DEFAULT_CATALOG_PATH), help='Processed dataset (JSON array or JSON Lines)')
+    parser.add_argument('--output', default=os.getenv('DRUG_CATALOG_ARTIFACT', DEFAULT_ARTIFACT_PATH), help='Artifact to write')
+    parser.add_argument('--check', action='store_true', help='Only verify that the artifact matches the dataset')
+    args = parser.parse_args()
+
+    if args.check:
+        if not is_fresh(args.output, args.source):
+            sys.exit(f"{args.output} was not built from {args.source}; rebuild it")
+        print(f"{args.output} matches {args.source}")
+        sys.exit(0)
+
+    records, size, elapsed = build_artifact(args.source, args.output)
+    print(f"Compiled {records} medications into {args.output} ({size / 1024:.1f}KB) in {elapsed:.2f}s")
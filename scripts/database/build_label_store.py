@@ -0,0 +1,173 @@
+"""
+Build the offline OpenFDA label store from openFDA bulk download files
+
+Reads drug-label export files from local disk (drug-label-0001-of-0012.json.zip
+and friends, as downloaded from https://open.fda.gov/data/downloads/; plain
+.json and .json.gz files work too) and writes the SQLite store read by
+chalicelib/catalog/label_store.py.
+
+Each file is streamed label by label, never loaded whole, by a worker process
+that writes its own shard database, so files are parsed on all cores. The
+shards are then merged into one store (newest version of each set id wins),
+the name and full-text indexes are built, and the result replaces the output
+file atomically.
+"""
+
+import argparse
+import glob
+import gzip
+import io
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.label_store import (
+    DEFAULT_LABEL_STORE_PATH, LABEL_COLUMNS, LABEL_CONFLICT_SQL, UPSERT_LABEL_SQL,
+    build_label_indexes, create_label_schema, label_row
+)
+from chalicelib.catalog.streaming import iter_json_field
+
+# Rows written per shard transaction
+BATCH_SIZE = 1000
+
+
+def find_inputs(paths):
+    """Expand directories into the export files they contain"""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ('*.json.zip', '*.json', '*.json.gz'):
+                inputs.extend(glob.glob(os.path.join(path, pattern)))
+        else:
+            inputs.append(path)
+    return sorted(set(inputs))
+
+
+def iter_labels(path):
+    """Stream the labels of one export file (zip archives may hold several JSON files)"""
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if member.endswith('.json'):
+                    with archive.open(member) as raw:
+                        yield from iter_json_field(io.TextIOWrapper(raw, encoding='utf-8'), 'results')
+        return
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as stream:
+        yield from iter_json_field(stream, 'results')
+
+
+def ingest_file(task):
+    """Worker: write the labels of one file into a shard database"""
+    path, shard_path = task
+    conn = sqlite3.connect(shard_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    create_label_schema(conn, indexes=False)
+    labels = skipped = 0
+    batch = []
+    for label in iter_labels(path):
+        row = label_row(label) if isinstance(label, dict) else None
+        if row is None:
+            skipped += 1
+            continue
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            with conn:
+                conn.executemany(UPSERT_LABEL_SQL, batch)
+            labels += len(batch)
+            batch = []
+    if batch:
+        with conn:
+            conn.executemany(UPSERT_LABEL_SQL, batch)
+        labels += len(batch)
+    conn.close()
+    return path, shard_path, labels, skipped
+
+
+def merge_shard(conn, shard_path):
+    """Copy one shard into the store, keeping the newest version of each label"""
+    conn.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+    columns = ', '.join(LABEL_COLUMNS)
+    with conn:
+        # "WHERE true" lets SQLite parse the conflict clause after a SELECT
+        conn.execute(
+            f"INSERT INTO labels ({columns}) SELECT {columns} FROM shard.labels WHERE true {LABEL_CONFLICT_SQL}"
+        )
+    conn.execute("DETACH DATABASE shard")
+
+
+def build_label_store(inputs, output=DEFAULT_LABEL_STORE_PATH, workers=None):
+    """
+    Build the store at output from export files
+
+    Returns:
+        Summary with file, label and skipped counts and the elapsed time
+    """
+    start = time.perf_counter()
+    inputs = find_inputs(inputs)
+    if not inputs:
+        raise ValueError("No openFDA export files found")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs)))
+
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    partial = output + '.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    summary = {'files': len(inputs), 'labels_read': 0, 'skipped': 0, 'workers': workers}
+    with tempfile.TemporaryDirectory(dir=directory) as shards:
+        tasks = [(path, os.path.join(shards, f"shard-{index}.sqlite3")) for index, path in enumerate(inputs)]
+        conn = sqlite3.connect(partial)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        create_label_schema(conn)
+
+        if workers == 1:
+            results = map(ingest_file, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers)
+            results = pool.imap_unordered(ingest_file, tasks)
+        try:
+            # Shards are merged as they finish, while other files are still parsing
+            for path, shard_path, labels, skipped in results:
+                merge_shard(conn, shard_path)
+                os.remove(shard_path)
+                summary['labels_read'] += labels
+                summary['skipped'] += skipped
+                print(f"  {os.path.basename(path)}: {labels} labels")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        with conn:
+            build_label_indexes(conn)
+        summary['labels'] = conn.execute("SELECT count(*) FROM labels").fetchone()[0]
+        conn.execute("VACUUM")
+        conn.close()
+
+    os.replace(partial, output)
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='Export files or directories containing them')
+    parser.add_argument('--output', default=os.getenv('OPENFDA_LABEL_STORE', DEFAULT_LABEL_STORE_PATH), help='Store to write')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel file readers (default: CPU count)')
+    args = parser.parse_args()
+
+    summary = build_label_store(args.inputs, args.output, args.workers)
+    print(f"Built {args.output}: {summary['labels']} labels from {summary['files']} files "
+          f"({summary['labels_read']} read, {summary['skipped']} skipped) "
+          f"with {summary['workers']} workers in {summary['elapsed']:.1f}s")
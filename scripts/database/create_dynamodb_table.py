@@ -1,5 +1,5 @@
 """
-Script to create DynamoDB table for medical information
+Script to create DynamoDB tables for medical information, chat sessions and chat jobs
 """
 
 import boto3
@@ -43,5 +43,51 @@ def create_table():
         else:
             print(f"Error creating table: {e}")
 
+def create_sessions_table():
+    """Create DynamoDB table for chat sessions, with TTL on expires_at"""
+    create_ttl_table(os.environ.get('SESSIONS_TABLE', 'pocket_pharmacist_sessions'), 'session_id')
+
+def create_jobs_table():
+    """Create DynamoDB table for asynchronous chat jobs, with TTL on expires_at"""
+    create_ttl_table(os.environ.get('JOBS_TABLE', 'pocket_pharmacist_jobs'), 'job_id')
+
+def create_ttl_table(table_name, key_name):
+    """Create an on-demand table keyed by a string, with TTL on expires_at"""
+    dynamodb = boto3.resource('dynamodb', endpoint_url=os.environ.get('DYNAMODB_ENDPOINT_URL') or None)
+
+    try:
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {
+                    'AttributeName': key_name,
+                    'KeyType': 'HASH'  # Partition key
+                }
+            ],
+            AttributeDefinitions=[
+                {
+                    'AttributeName': key_name,
+                    'AttributeType': 'S'  # String type
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        # Wait until the table exists
+        table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
+        table.meta.client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'}
+        )
+        print(f"Table {table_name} created successfully!")
+
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceInUseException':
+            print(f"Table {table_name} already exists.")
+        else:
+            print(f"Error creating table: {e}")
+
 if __name__ == "__main__":
-    create_table() 
\ No newline at end of file
+    create_table()
+    create_sessions_table()
+    create_jobs_table()
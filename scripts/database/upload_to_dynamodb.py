@@ -1,14 +1,45 @@
 """
 Script to upload medical information data to DynamoDB
+
+Bulk loader: the dataset (JSON array or JSON Lines) is streamed through a
+generator pipeline (parse, NaN and Decimal conversion, batching) so
+memory stays flat regardless of file size, and batches are written with
+BatchWriteItem, 25 items per request, by a pool of worker threads.
+Unprocessed items are retried with jittered exponential backoff. Completed
+batches are recorded in a checkpoint file so an interrupted load resumes
+where it stopped, and a throughput summary is printed at the end.
+
+Usage:
+    python scripts/database/upload_to_dynamodb.py [--workers 8] [--endpoint-url http://localhost:8000]
 """
 
+import argparse
 import boto3
 import json
 import os
 import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeSerializer
 from decimal import Decimal
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.streaming import iter_records, batched
+
+DEFAULT_DATA_PATH = os.path.join('data', 'processed', 'dynamodb_ready_data.json')
+
+# BatchWriteItem accepts at most 25 put requests
+BATCH_SIZE = 25
+MAX_RETRIES = 8
+BASE_RETRY_DELAY = 0.05
+RETRYABLE_ERRORS = {'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded', 'InternalServerError'}
+
+
 def convert_floats_to_decimals(obj):
     """Recursively convert all float values to Decimal and handle NaN values"""
     if isinstance(obj, float):
@@ -21,40 +52,194 @@ def convert_floats_to_decimals(obj):
         return [convert_floats_to_decimals(i) for i in obj]
     return obj
 
-def upload_data():
-    """Upload medical information data to DynamoDB"""
-    dynamodb = boto3.resource('dynamodb')
-    table_name = os.environ.get('DYNAMODB_TABLE', 'medical_info')
-    table = dynamodb.Table(table_name)
-    
-    # Read the JSON data
-    json_path = os.path.join('data', 'processed', 'dynamodb_ready_data.json')
-    
-    # Custom JSON decoder to handle NaN values
-    class NaNDecoder(json.JSONDecoder):
-        def default(self, obj):
-            if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
-                return None
-            return obj
-    
-    with open(json_path, 'r', encoding='utf-8') as f:
-        # Load JSON but handle NaN values by replacing them with None
-        data = json.load(f)
-    
-    # Process each item and upload to DynamoDB
-    for item in data:
+
+def load_items(json_path):
+    """Stream the processed dataset one item at a time"""
+    # NaN cleanup happens in convert_floats_to_decimals, so rows are only filtered here
+    return (item for item in iter_records(json_path) if isinstance(item, dict))
+
+
+def make_batches(items, batch_size=BATCH_SIZE):
+    """Yield (batch_number, items) groups in file order, with values ready for DynamoDB"""
+    return enumerate(batched((convert_floats_to_decimals(item) for item in items), batch_size))
+
+
+class Checkpoint:
+    """
+    Completed batches persisted to a JSON file
+
+    Stored as a watermark (every batch below it is done) plus the few
+    batches finished out of order above it, so the file stays small.
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.watermark = 0
+        self.completed = set()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('source') == source and state.get('batch_size') == BATCH_SIZE:
+                self.watermark = state.get('watermark', 0)
+                self.completed = set(state.get('completed', []))
+            else:
+                print(f"Ignoring checkpoint {path}: it was written for a different load")
+
+    def is_done(self, number):
+        return number < self.watermark or number in self.completed
+
+    def done(self, number):
+        with self._lock:
+            self.completed.add(number)
+            while self.watermark in self.completed:
+                self.completed.remove(self.watermark)
+                self.watermark += 1
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({
+                'source': self.source,
+                'batch_size': BATCH_SIZE,
+                'watermark': self.watermark,
+                'completed': sorted(self.completed)
+            }, f)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_batch(client, table_name, items, stats, serializer=None):
+    """
+    Write one batch, retrying unprocessed items and throttling errors
+
+    Raises:
+        RuntimeError: If items are still unprocessed after MAX_RETRIES attempts
+    """
+    serializer = serializer or TypeSerializer()
+    requests = [
+        {'PutRequest': {'Item': {key: serializer.serialize(value) for key, value in item.items()}}}
+        for item in items
+    ]
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            stats.add('retries', 1)
+            time.sleep(random.uniform(0, BASE_RETRY_DELAY * (2 ** attempt)))
         try:
-            # Convert all numeric values to Decimal for DynamoDB and handle NaN
-            item = convert_floats_to_decimals(item)
-            
-            # Upload the item
-            table.put_item(Item=item)
-            print(f"Successfully uploaded item with id: {item['id']}")
-            
+            response = client.batch_write_item(RequestItems={table_name: requests})
         except ClientError as e:
-            print(f"Error uploading item {item.get('id', 'unknown')}: {e}")
-        except Exception as e:
-            print(f"Unexpected error uploading item {item.get('id', 'unknown')}: {e}")
+            if e.response['Error']['Code'] not in RETRYABLE_ERRORS:
+                raise
+            continue
+        stats.add('requests', 1)
+        requests = response.get('UnprocessedItems', {}).get(table_name, [])
+        if not requests:
+            return
+    raise RuntimeError(f"{len(requests)} items still unprocessed after {MAX_RETRIES} retries")
+
+
+class LoadStats:
+    """Thread-safe counters for the throughput summary"""
+
+    def __init__(self):
+        self.counts = {'items': 0, 'batches': 0, 'requests': 0, 'retries': 0, 'failed_batches': 0, 'skipped_batches': 0}
+        self._lock = threading.Lock()
+
+    def add(self, name, amount):
+        with self._lock:
+            self.counts[name] += amount
+
+
+def upload_data(json_path=DEFAULT_DATA_PATH, table_name=None, workers=8, checkpoint_path=None,
+                endpoint_url=None, client=None, items=None):
+    """
+    Upload medical information data to DynamoDB
+
+    Args:
+        json_path: Dataset to load, streamed (JSON array or JSON Lines, optionally .gz)
+        table_name: Target table (default: DYNAMODB_TABLE or medical_info)
+        workers: Concurrent BatchWriteItem requests
+        checkpoint_path: Checkpoint file ('' disables; default: <json_path>.checkpoint)
+        endpoint_url: DynamoDB endpoint, e.g. DynamoDB Local
+        client: Low-level DynamoDB client or a stand-in with batch_write_item
+        items: Items to load instead of reading json_path
+
+    Returns:
+        Dictionary of counters plus elapsed seconds and items per second
+    """
+    table_name = table_name or os.environ.get('DYNAMODB_TABLE', 'medical_info')
+    if client is None:
+        client = boto3.client('dynamodb', endpoint_url=endpoint_url)
+    if checkpoint_path is None:
+        checkpoint_path = json_path + '.checkpoint'
+    checkpoint = Checkpoint(checkpoint_path, os.path.abspath(json_path))
+    if items is None:
+        items = load_items(json_path)
+
+    stats = LoadStats()
+    serializer = TypeSerializer()
+    start = time.perf_counter()
+
+    def run(number, batch):
+        write_batch(client, table_name, batch, stats, serializer)
+        checkpoint.done(number)
+        stats.add('items', len(batch))
+        stats.add('batches', 1)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        for number, batch in make_batches(items):
+            if checkpoint.is_done(number):
+                stats.add('skipped_batches', 1)
+                continue
+            # Keep a bounded number of batches queued
+            while len(in_flight) >= workers * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    _report_failure(future, in_flight.pop(future), stats)
+            in_flight[executor.submit(run, number, batch)] = number
+        for future in list(in_flight):
+            future.exception()
+            _report_failure(future, in_flight.pop(future), stats)
+
+    summary = dict(stats.counts)
+    summary['elapsed'] = time.perf_counter() - start
+    summary['items_per_second'] = summary['items'] / summary['elapsed'] if summary['elapsed'] else 0.0
+    if summary['failed_batches'] == 0:
+        checkpoint.clear()
+    return summary
+
+
+def _report_failure(future, number, stats):
+    error = future.exception()
+    if error is not None:
+        stats.add('failed_batches', 1)
+        print(f"Batch {number} failed: {error}")
+
+
+def print_summary(summary):
+    print(f"Uploaded {summary['items']} items in {summary['batches']} batches "
+          f"({summary['requests']} requests, {summary['retries']} retries) "
+          f"in {summary['elapsed']:.2f}s: {summary['items_per_second']:.0f} items/s")
+    if summary['skipped_batches']:
+        print(f"Skipped {summary['skipped_batches']} batches already recorded in the checkpoint")
+    if summary['failed_batches']:
+        print(f"{summary['failed_batches']} batches failed; run again to resume from the checkpoint")
+
 
 if __name__ == "__main__":
-    upload_data() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Bulk load medical information data into DynamoDB")
+    parser.add_argument('--file', default=DEFAULT_DATA_PATH, help='Processed dataset to upload')
+    parser.add_argument('--table', default=None, help='Target table (default: DYNAMODB_TABLE or medical_info)')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel BatchWriteItem requests')
+    parser.add_argument('--checkpoint', default=None, help='Checkpoint file (default: <file>.checkpoint)')
+    parser.add_argument('--endpoint-url', default=os.environ.get('DYNAMODB_ENDPOINT_URL'), help='DynamoDB endpoint, e.g. DynamoDB Local')
+    args = parser.parse_args()
+    print_summary(upload_data(args.file, args.table, args.workers, args.checkpoint, args.endpoint_url))
@@ -0,0 +1,114 @@
+"""
+Train and evaluate the local intent classifier
+
+Expands the Lex-style sample utterances in data/intents/sample_utterances.json
+with medication names from the drug catalog and side effects from its side
+effect index, splits them by template into train, calibration and test sets,
+trains the hashed n-gram classifier, fits its confidence temperature on the
+calibration set and reports accuracy, macro F1 and calibration error on the
+test set before writing data/models/intent_classifier.npz. The keyword
+rules are scored on the same test set for comparison.
+
+With --evaluate, an existing model is scored on the whole corpus instead.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.catalog.side_effect_index import SideEffectIndex
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService, COMMON_MEDICATIONS
+from chalicelib.services.intent_classifier import (
+    DEFAULT_CORPUS_PATH, DEFAULT_MODEL_PATH, HashedFeatures, IntentClassifier,
+    expand_utterances, load_templates, split_by_template
+)
+from chalicelib.services.local_intent_recognition import DEFAULT_MIN_CONFIDENCE
+
+
+# Confidence below which the service falls back to the keyword rules
+THRESHOLD = float(os.getenv('INTENT_MIN_CONFIDENCE', DEFAULT_MIN_CONFIDENCE))
+
+
+def slot_values(catalog_path):
+    catalog = DrugCatalog.from_file(catalog_path)
+    medications = sorted(set(COMMON_MEDICATIONS) | set(catalog.by_alias) | set(catalog.by_name))
+    side_effects = [term for term in SideEffectIndex.from_catalog(catalog).terms() if len(term.split()) <= 3]
+    return {'medication': medications, 'side_effect': side_effects}
+
+
+def print_report(label, metrics):
+    print(f"{label}: n={metrics['count']} accuracy={metrics['accuracy']:.3f} "
+          f"macro_f1={metrics['macro_f1']:.3f} calibration_error={metrics['calibration_error']:.3f}")
+    print(f"  confidence >= {THRESHOLD}: coverage={metrics['coverage']:.3f} accuracy={metrics['confident_accuracy']:.3f}")
+    for intent, f1 in sorted(metrics['per_intent_f1'].items()):
+        print(f"  {intent:<24} f1={f1:.3f}")
+
+
+def catalog_rules(catalog_path):
+    return ChaliceIntentRecognitionService(catalog=DrugCatalog.from_file(catalog_path))
+
+
+def print_rules(rules, texts, labels):
+    """Accuracy of the keyword rules, and their precision when a rule fires (not the catch-all)"""
+    results = [rules.recognize_intent(text) for text in texts]
+    correct = [result['intent'] == label for result, label in zip(results, labels)]
+    fired = [ok for ok, result in zip(correct, results) if result['intent'] != 'GeneralMedicationInfo']
+    precision = sum(fired) / len(fired) if fired else 0.0
+    print(f"keyword rules: accuracy={sum(correct) / len(correct):.3f} "
+          f"fired={len(fired) / len(correct):.3f} precision={precision:.3f}")
+
+
+def train(args):
+    rng = random.Random(args.seed)
+    utterances = expand_utterances(load_templates(args.corpus), slot_values(args.catalog), args.per_template, rng)
+    train_set, calibration_set, test_set = split_by_template(utterances, (0.15, 0.15), rng)
+    print(f"{len(utterances)} utterances: train={len(train_set)} calibration={len(calibration_set)} test={len(test_set)}")
+
+    texts, labels = zip(*train_set)
+    model = IntentClassifier(sorted(set(labels)), HashedFeatures(args.features))
+    start = time.perf_counter()
+    losses = model.fit(texts, labels, epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2)
+    print(f"Trained in {time.perf_counter() - start:.1f}s, loss {losses[0]:.3f} -> {losses[-1]:.3f}")
+
+    test_texts, test_labels = zip(*test_set)
+    print_report("test (uncalibrated)", model.evaluate(test_texts, test_labels, THRESHOLD))
+    temperature = model.calibrate(*zip(*calibration_set))
+    print(f"Temperature: {temperature:.3f}")
+    print_report("test", model.evaluate(test_texts, test_labels, THRESHOLD))
+    print_rules(catalog_rules(args.catalog), test_texts, test_labels)
+
+    model.save(args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:.0f}KB)")
+
+
+def evaluate(args):
+    rng = random.Random(args.seed)
+    utterances = expand_utterances(load_templates(args.corpus), slot_values(args.catalog), args.per_template, rng)
+    model = IntentClassifier.load(args.evaluate)
+    texts, labels, _ = zip(*utterances)
+    print_report(f"corpus ({args.evaluate})", model.evaluate(texts, labels, THRESHOLD))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_PATH, help='Sample utterances by intent (JSON)')
+    parser.add_argument('--catalog', default=os.getenv('DRUG_CATALOG_PATH', DEFAULT_CATALOG_PATH), help='Dataset providing slot values')
+    parser.add_argument('--output', default=os.getenv('INTENT_MODEL_PATH', DEFAULT_MODEL_PATH), help='Model to write')
+    parser.add_argument('--evaluate', metavar='MODEL', help='Score an existing model on the corpus instead of training')
+    parser.add_argument('--per-template', type=int, default=8, help='Utterances generated from each template with slots')
+    parser.add_argument('--features', type=int, default=2 ** 16, help='Hash buckets')
+    parser.add_argument('--epochs', type=int, default=60)
+    parser.add_argument('--learning-rate', type=float, default=0.05)
+    parser.add_argument('--l2', type=float, default=1e-4, help='L2 penalty on the weights')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.evaluate:
+        evaluate(args)
+    else:
+        train(args)
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the database scripts directory to path to import the loader
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts', 'database')))
+
+import upload_to_dynamodb
+from upload_to_dynamodb import upload_data, BATCH_SIZE
+
+
+class StandInClient:
+    def __init__(self, unprocessed_first=0, fail_batches=()):
+        self.items = {}
+        self.requests = []
+        self.unprocessed_first = unprocessed_first
+        self.fail_batches = set(fail_batches)
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems['medical_info']
+        self.requests.append(len(requests))
+        first_id = int(float(requests[0]['PutRequest']['Item']['id']['N']))
+        if first_id // BATCH_SIZE in self.fail_batches:
+            raise RuntimeError('connection reset')
+        held = requests[:self.unprocessed_first]
+        self.unprocessed_first = 0
+        for request in requests[len(held):]:
+            item = request['PutRequest']['Item']
+            self.items[item['id']['N']] = item
+        return {'UnprocessedItems': {'medical_info': held} if held else {}}
+
+
+class TestBulkLoader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.directory.name, 'data.json')
+        self.checkpoint = self.data_path + '.checkpoint'
+        self.items = [{'id': float(i), 'name': f"drug {i}", 'Substitute': float('nan')} for i in range(110)]
+        upload_to_dynamodb.BASE_RETRY_DELAY = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_batches_of_25_with_unprocessed_retry(self):
+        client = StandInClient(unprocessed_first=3)
+        summary = upload_data(self.data_path, 'medical_info', workers=4, client=client, items=self.items)
+
+        self.assertEqual(len(client.items), 110)
+        self.assertTrue(all(size <= BATCH_SIZE for size in client.requests))
+        self.assertEqual(summary['batches'], 5)
+        self.assertEqual(summary['retries'], 1)
+        self.assertEqual(client.items['0.0']['Substitute'], {'NULL': True})
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_interrupted_load_resumes_from_checkpoint(self):
+        client = StandInClient(fail_batches={2})
+        summary = upload_data(self.data_path, 'medical_info', workers=1, client=client, items=self.items)
+        self.assertEqual(summary['failed_batches'], 1)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)['watermark'], 2)
+
+        retry = StandInClient()
+        summary = upload_data(self.data_path, 'medical_info', workers=1, client=retry, items=self.items)
+        self.assertEqual(summary['skipped_batches'], 4)
+        self.assertEqual(sorted(int(float(key)) for key in retry.items), list(range(50, 75)))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+
+if __name__ == '__main__':
+    unittest.main()
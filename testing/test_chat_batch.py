@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import json
+import threading
+from unittest.mock import patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalice.test import Client
+import app
+
+
+class CountingHandler:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def process_query(self, query, session_id, source_lang="auto", target_lang="en"):
+        with self.lock:
+            self.calls.append((query, source_lang))
+        if query == 'boom':
+            raise RuntimeError('upstream failed')
+        return {'status': 'success', 'response': f"answer to {query}", 'language': source_lang}
+
+
+class TestChatBatch(unittest.TestCase):
+    def post(self, body):
+        with Client(app.app) as client:
+            return client.http.post(
+                '/api/chat/batch',
+                headers={'Content-Type': 'application/json'},
+                body=json.dumps(body)
+            )
+
+    def test_results_are_deduplicated_and_in_input_order(self):
+        handler = CountingHandler()
+        items = [
+            {'message': 'side effects of aspirin', 'language': 'en'},
+            {'message': 'dose of ibuprofen'},
+            {'message': 'side effects of aspirin ', 'language': 'en'},
+            {'message': ''},
+            {'message': 'boom'},
+        ]
+        with patch.object(app.chatbot, 'query_handler', handler):
+            response = self.post({'items': items})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json_body['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual(results[0]['response']['response'], 'answer to side effects of aspirin')
+        self.assertEqual(results[2], dict(results[0], index=2))
+        self.assertEqual(results[1]['response']['language'], 'auto')
+        self.assertEqual(results[3], {'status': 'error', 'error': 'Invalid message format', 'index': 3})
+        self.assertEqual(results[4]['status'], 'error')
+        self.assertEqual(len(handler.calls), 3)
+
+    def test_rejects_missing_or_oversized_batches(self):
+        self.assertEqual(self.post({'items': []}).status_code, 400)
+        too_many = [{'message': str(i)} for i in range(app.CHAT_BATCH_MAX_ITEMS + 1)]
+        self.assertEqual(self.post({'items': too_many}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+import sys
+import os
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalice.test import Client
+import app
+from core.orchestration.job_runner import ThreadJobRunner
+from core.orchestration.job_store import InMemoryJobStore
+from chalicelib.interfaces.chalice_chatbot_adapter import ChatbotInterface, JobsUnavailable
+from chalicelib.services.dynamodb_job_store import DynamoDBJobStore
+from chalicelib.services.lambda_job_runner import LambdaJobRunner
+
+
+class GatedHandler:
+    """Blocks process_query until released so tests can observe a pending job"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def process_query(self, query, session_id, source_lang="auto", target_lang="en"):
+        self.release.wait(5)
+        if query == 'boom':
+            raise RuntimeError('upstream failed')
+        return {'status': 'success', 'response': f"answer to {query}", 'timings': {'total': 1.0}}
+
+
+class FakeTable:
+    """Local stand-in for a boto3 DynamoDB Table"""
+
+    def __init__(self):
+        self.items = {}
+        self.consistent_reads = 0
+
+    def put_item(self, Item):
+        self.items[Item['job_id']] = dict(Item)
+
+    def get_item(self, Key, ConsistentRead=False):
+        self.consistent_reads += int(ConsistentRead)
+        item = self.items.get(Key['job_id'])
+        return {'Item': dict(item)} if item else {}
+
+
+class TestChatJobs(unittest.TestCase):
+    def setUp(self):
+        self.handler = GatedHandler()
+        self.patches = [
+            patch.object(app.chatbot, 'query_handler', self.handler),
+            patch.object(app.chatbot, 'job_store', InMemoryJobStore(ttl=60)),
+            patch.object(app.chatbot, 'job_runner', ThreadJobRunner(app.chatbot.run_job, 2))
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        self.handler.release.set()
+        for p in self.patches:
+            p.stop()
+
+    def submit(self, body):
+        with Client(app.app) as client:
+            return client.http.post(
+                '/api/chat/jobs',
+                headers={'Content-Type': 'application/json'},
+                body=json.dumps(body)
+            )
+
+    def poll(self, job_id, until=('succeeded', 'failed')):
+        with Client(app.app) as client:
+            deadline = time.time() + 5
+            while True:
+                response = client.http.get(f'/api/chat/jobs/{job_id}')
+                if response.status_code != 200 or response.json_body['status'] in until or time.time() > deadline:
+                    return response
+                time.sleep(0.01)
+
+    def test_submit_returns_before_the_query_finishes(self):
+        response = self.submit({'message': 'side effects of aspirin', 'language': 'en'})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json_body['job_id']
+        self.assertEqual(response.headers['Location'], f'/api/chat/jobs/{job_id}')
+
+        pending = self.poll(job_id, until=('pending', 'running'))
+        self.assertIn(pending.json_body['status'], ('pending', 'running'))
+        self.assertNotIn('result', pending.json_body)
+
+        self.handler.release.set()
+        done = self.poll(job_id).json_body
+        self.assertEqual(done['status'], 'succeeded')
+        self.assertEqual(done['result']['response'], 'answer to side effects of aspirin')
+        self.assertNotIn('timings', done['result'])
+        self.assertIn('finished_at', done)
+
+    def test_failed_job_reports_an_error(self):
+        self.handler.release.set()
+        job_id = self.submit({'message': 'boom'}).json_body['job_id']
+        done = self.poll(job_id).json_body
+        self.assertEqual(done['status'], 'failed')
+        self.assertEqual(done['error'], 'Internal server error')
+
+    def test_invalid_and_unknown_jobs(self):
+        self.assertEqual(self.submit({'message': ''}).status_code, 400)
+        self.assertEqual(self.submit({'language': 'en'}).status_code, 400)
+        self.assertEqual(self.poll('does-not-exist').status_code, 404)
+
+    def test_lambda_runner_hands_the_job_to_the_worker_function(self):
+        runner = LambdaJobRunner('pocket-pharmacist-dev-chat_job_worker')
+        runner.client = MagicMock()
+        self.handler.release.set()
+        with patch.object(app.chatbot, 'job_runner', runner):
+            job_id = self.submit({'message': 'side effects of aspirin', 'language': 'en'}).json_body['job_id']
+
+        call = runner.client.invoke.call_args.kwargs
+        self.assertEqual(call['FunctionName'], 'pocket-pharmacist-dev-chat_job_worker')
+        self.assertEqual(call['InvocationType'], 'Event')
+        self.assertEqual(self.poll(job_id, until=('pending',)).json_body['status'], 'pending')
+
+        # Lambda delivers the payload to the worker function
+        with Client(app.app) as client:
+            client.lambda_.invoke('chat_job_worker', json.loads(call['Payload']))
+        done = self.poll(job_id).json_body
+        self.assertEqual(done['status'], 'succeeded')
+        self.assertEqual(done['result']['response'], 'answer to side effects of aspirin')
+
+    def test_failed_handoff_marks_the_job_failed(self):
+        runner = MagicMock()
+        runner.submit.side_effect = RuntimeError('throttled')
+        with patch.object(app.chatbot, 'job_runner', runner), \
+                patch('chalicelib.interfaces.chalice_chatbot_adapter.uuid.uuid4', return_value=MagicMock(hex='job-1')):
+            self.assertEqual(self.submit({'message': 'hi'}).status_code, 500)
+        self.assertEqual(self.poll('job-1').json_body['status'], 'failed')
+
+
+class TestJobConfiguration(unittest.TestCase):
+    def test_lambda_requires_shared_store_and_async_runner(self):
+        chatbot = ChatbotInterface()
+        with patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': 'pocket-pharmacist-dev', 'JOB_STORE': 'memory',
+                                     'CHAT_JOB_FUNCTION': 'pocket-pharmacist-dev-chat_job_worker'}):
+            os.environ.pop('JOB_RUNNER', None)
+            self.assertRaises(JobsUnavailable, chatbot._create_job_store)
+            self.assertIsInstance(chatbot._create_job_runner(), LambdaJobRunner)
+            os.environ['JOB_RUNNER'] = 'thread'
+            self.assertRaises(JobsUnavailable, chatbot._create_job_runner)
+
+    def test_unavailable_jobs_return_503(self):
+        with patch.object(ChatbotInterface, '_create_job_store', side_effect=JobsUnavailable('JOB_STORE=dynamodb is required on Lambda')):
+            with patch.object(app, 'chatbot', ChatbotInterface()):
+                with Client(app.app) as client:
+                    response = client.http.post('/api/chat/jobs', headers={'Content-Type': 'application/json'},
+                                                body=json.dumps({'message': 'hi'}))
+                    self.assertEqual(response.status_code, 503)
+                    self.assertEqual(client.http.get('/api/chat/jobs/abc').status_code, 503)
+
+
+class TestJobStores(unittest.TestCase):
+    def test_in_memory_store_expires_jobs(self):
+        store = InMemoryJobStore(ttl=60)
+        now = [0.0]
+        store.records.clock = lambda: now[0]
+        store.put('a', {'status': 'pending'})
+        store.update('a', {'status': 'running'})
+        self.assertEqual(store.get('a'), {'status': 'running'})
+
+        now[0] = 61
+        self.assertEqual(store.cleanup(), 1)
+        self.assertIsNone(store.get('a'))
+        # Updates to an expired job do not resurrect it
+        store.update('a', {'status': 'succeeded'})
+        self.assertIsNone(store.get('a'))
+
+    def test_dynamodb_store_round_trip_and_ttl(self):
+        table = FakeTable()
+        store = DynamoDBJobStore(table=table, ttl=60)
+        store.put('a', {'status': 'pending', 'message': 'hi'})
+        store.update('a', {'status': 'succeeded', 'result': {'response': 'ok'}})
+
+        self.assertEqual(store.get('a'), {'status': 'succeeded', 'message': 'hi', 'result': {'response': 'ok'}})
+        self.assertGreater(table.consistent_reads, 0)
+        self.assertGreater(table.items['a']['expires_at'], time.time())
+
+        table.items['a']['expires_at'] = int(time.time()) - 1
+        self.assertIsNone(store.get('a'))
+        store.update('missing', {'status': 'running'})
+        self.assertNotIn('missing', table.items)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import chalicelib.catalog.drug_catalog as drug_catalog
+import chalicelib.catalog.compiled_catalog as compiled_catalog
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH, get_drug_catalog
+from chalicelib.catalog.compiled_catalog import CompiledCatalog, compile_catalog, is_fresh
+from chalicelib.catalog.side_effect_index import SideEffectIndex
+from chalicelib.catalog.substitute_graph import SubstituteGraph
+
+
+class TestCompiledCatalog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'drug_catalog.bin')
+        cls.source = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+        compile_catalog(cls.source, cls.path, DEFAULT_CATALOG_PATH)
+        cls.compiled = CompiledCatalog(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.compiled.close()
+        cls.directory.cleanup()
+
+    def test_records_round_trip(self):
+        self.assertEqual(len(self.compiled), len(self.source))
+        for original, mapped in zip(self.source, self.compiled):
+            self.assertEqual(mapped.to_dict(), original.to_dict())
+            self.assertEqual(mapped.aliases, original.aliases)
+        # Decoded once, then the same object is returned
+        self.assertIs(self.compiled.records[3], self.compiled.records[3])
+        self.assertEqual(self.compiled.records[-1].id, self.source.records[-1].id)
+
+    def test_lookup_tables_match_the_parsed_catalog(self):
+        self.assertEqual(list(self.compiled.by_name), sorted(self.source.by_name))
+        self.assertEqual(len(self.compiled.by_alias), len(self.source.by_alias))
+        for name, record in self.source.by_name.items():
+            self.assertEqual(self.compiled.get_by_name(name).id, record.id)
+        for alias, records in self.source.by_alias.items():
+            self.assertEqual([r.id for r in self.compiled.get_by_alias(alias)], [r.id for r in records])
+        for record in self.source:
+            self.assertEqual(self.compiled.get_by_id(record.id).name, record.name)
+        self.assertIsNone(self.compiled.lookup('tylenol'))
+        self.assertIsNone(self.compiled.get_by_id(10 ** 6))
+        self.assertEqual([r.id for r in self.compiled.suggest('azithrall')], [r.id for r in self.source.suggest('azithrall')])
+
+    def test_derived_indexes_build_from_the_artifact(self):
+        self.assertEqual(SideEffectIndex.from_catalog(self.compiled).postings,
+                         SideEffectIndex.from_catalog(self.source).postings)
+        self.assertEqual(SubstituteGraph.from_catalog(self.compiled).neighbors,
+                         SubstituteGraph.from_catalog(self.source).neighbors)
+
+    def test_rejects_other_files(self):
+        bogus = os.path.join(self.directory.name, 'bogus.bin')
+        with open(bogus, 'wb') as f:
+            f.write(b'not a catalog' * 10)
+        with self.assertRaises(ValueError):
+            CompiledCatalog(bogus)
+
+    def test_process_catalog_prefers_a_fresh_artifact(self):
+        env = {'DRUG_CATALOG_PATH': DEFAULT_CATALOG_PATH, 'DRUG_CATALOG_ARTIFACT': self.path}
+        with patch.dict(os.environ, env), patch.object(drug_catalog, '_catalog', None):
+            # Timestamps do not matter, only the recorded size and digest
+            os.utime(self.path, (0, 0))
+            self.assertIsInstance(get_drug_catalog(), CompiledCatalog)
+
+    def test_artifact_is_ignored_for_another_dataset(self):
+        dataset = os.path.join(self.directory.name, 'one_row.json')
+        with open(dataset, 'w') as f:
+            json.dump([{'id': 9001, 'name': 'newdrugzol 10mg tablet', 'Uses': 'Testing',
+                        'SideEffects': 'Nausea', 'Substitute': '', 'Habit Forming': 'No'}], f)
+        os.utime(dataset, (0, 0))
+        self.assertFalse(is_fresh(self.path, dataset))
+
+        env = {'DRUG_CATALOG_PATH': dataset, 'DRUG_CATALOG_ARTIFACT': self.path}
+        with patch.dict(os.environ, env), patch.object(drug_catalog, '_catalog', None):
+            catalog = get_drug_catalog()
+            self.assertNotIsInstance(catalog, CompiledCatalog)
+            self.assertEqual(len(catalog), 1)
+            self.assertEqual(catalog.lookup('newdrugzol').id, 9001)
+
+    def test_artifact_without_a_dataset(self):
+        missing = os.path.join(self.directory.name, 'missing.json')
+        self.assertFalse(is_fresh(self.path, missing))
+        # Without DRUG_CATALOG_PATH the artifact stands in for an absent bundled dataset
+        with patch.dict(os.environ, {'DRUG_CATALOG_ARTIFACT': self.path}), \
+                patch.object(drug_catalog, 'DEFAULT_CATALOG_PATH', missing), \
+                patch.object(drug_catalog, '_catalog', None):
+            os.environ.pop('DRUG_CATALOG_PATH', None)
+            self.assertIsInstance(get_drug_catalog(), CompiledCatalog)
+
+    def test_packaged_artifact_is_not_hashed_at_startup(self):
+        with patch.dict(os.environ, {'DRUG_CATALOG_ARTIFACT': self.path}), \
+                patch.object(compiled_catalog, 'source_fingerprint', side_effect=AssertionError("hashed")), \
+                patch.object(drug_catalog, '_catalog', None):
+            os.environ.pop('DRUG_CATALOG_PATH', None)
+            self.assertIsInstance(get_drug_catalog(), CompiledCatalog)
+
+        # A same-sized edit is only caught by the digest
+        dataset = os.path.join(self.directory.name, 'edited.json')
+        with open(DEFAULT_CATALOG_PATH, 'rb') as f:
+            data = bytearray(f.read())
+        data[data.index(b'Nausea')] = ord('M')
+        with open(dataset, 'wb') as f:
+            f.write(data)
+        self.assertTrue(is_fresh(self.path, dataset, check_digest=False))
+        self.assertFalse(is_fresh(self.path, dataset))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, split_list_field, generate_aliases
+from chalicelib.catalog.substitute_graph import SubstituteGraph
+from chalicelib.services.chalice_medical_info import ChalliceMedicalInfoService
+
+SAMPLE_ITEMS = [
+    {
+        'id': 1.0,
+        'name': 'augmentin 625 duo tablet',
+        'Uses': 'Treatment of Bacterial infections',
+        'SideEffects': 'Vomiting, Nausea, Diarrhea',
+        'Substitute': 'Penciclav 500 mg/125 mg Tablet, Moxikind-CV 625 Tablet',
+        'Habit Forming': 'it cannot form a habit'
+    },
+    {
+        'id': 4.0,
+        'name': 'allegra 120mg tablet',
+        'Uses': 'Treatment of Sneezing and runny nose due to allergies',
+        'SideEffects': 'Headache, Drowsiness, Flushing (sense of warmth in the face, ears, neck and trunk)',
+        'Substitute': float('nan'),
+        'Habit Forming': 'it can form a habit'
+    },
+    {
+        'id': 6.0,
+        'name': 'allegra-m tablet',
+        'Uses': 'Treatment of Sneezing and runny nose due to allergies',
+        'SideEffects': 'Nausea',
+        'Substitute': 'Emlukast-FX Tablet',
+        'Habit Forming': 'it cannot form a habit'
+    }
+]
+
+
+class TestDrugCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = DrugCatalog.from_items(SAMPLE_ITEMS)
+
+    def test_split_list_field_keeps_parenthesized_commas(self):
+        self.assertEqual(
+            split_list_field('Headache, Flushing (face, ears), Rash'),
+            ['Headache', 'Flushing (face, ears)', 'Rash']
+        )
+        self.assertEqual(split_list_field(float('nan')), [])
+
+    def test_generate_aliases(self):
+        self.assertEqual(generate_aliases('augmentin 625 duo tablet'), ['augmentin 625 duo', 'augmentin'])
+        self.assertIn('allegra m', generate_aliases('allegra-m tablet'))
+
+    def test_lookup_by_id_name_and_alias(self):
+        self.assertEqual(self.catalog.get_by_id(4).name, 'allegra 120mg tablet')
+        self.assertEqual(self.catalog.lookup('  Augmentin 625 DUO Tablet ').id, 1)
+        self.assertEqual(self.catalog.lookup('augmentin').id, 1)
+        self.assertEqual(self.catalog.lookup('allegra').id, 4)
+        self.assertEqual(self.catalog.lookup('allegra m').id, 6)
+        self.assertIsNone(self.catalog.lookup('tylenol'))
+
+    def test_record_fields(self):
+        record = self.catalog.get_by_id(4)
+        self.assertEqual(len(record.side_effects), 3)
+        self.assertEqual(record.substitutes, [])
+        self.assertTrue(record.habit_forming)
+
+    def test_service_answers_from_catalog(self):
+        service = ChalliceMedicalInfoService()
+        service._catalog = self.catalog
+
+        result = service.get_medical_info({'intent': 'GetSideEffects', 'slots': {'medication': 'Augmentin'}})
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['data']['side_effects'], ['Vomiting', 'Nausea', 'Diarrhea'])
+
+        result = service.get_medical_info({'intent': 'GeneralMedicationInfo', 'slots': {'medication': 'allegra'}})
+        self.assertEqual(result['data']['id'], 4)
+
+    def test_default_dataset_loads(self):
+        catalog = DrugCatalog.from_file()
+        self.assertEqual(len(catalog), 500)
+        self.assertIsNotNone(catalog.lookup('azithral 500 tablet'))
+
+
+class TestSubstituteGraph(unittest.TestCase):
+    def setUp(self):
+        items = SAMPLE_ITEMS + [{
+            'id': 7.0,
+            'name': 'penciclav 500 mg/125 mg tablet',
+            'Substitute': 'Allegra-M Tablet'
+        }]
+        self.graph = SubstituteGraph.from_catalog(DrugCatalog.from_items(items))
+
+    def test_substitutes_resolve_to_catalog_entries(self):
+        self.assertEqual(self.graph.substitutes[1][0], 7)
+        self.assertIn(1, self.graph.substituted_by[7])
+
+    def test_one_hop_is_bidirectional(self):
+        names = [self.graph.name_of(node) for node in self.graph.alternatives(7)]
+        self.assertEqual(names, ['Allegra-M Tablet', 'Augmentin 625 Duo Tablet'])
+        external = self.graph.find_node('moxikind-cv 625 tablet')
+        self.assertLess(external, 0)
+        self.assertEqual(self.graph.alternatives(external), (1,))
+
+    def test_multi_hop_is_bounded(self):
+        reachable = dict(self.graph.alternatives_within(1, max_hops=2))
+        self.assertEqual(reachable[7], 1)
+        self.assertEqual(reachable[6], 2)
+        self.assertNotIn(self.graph.find_node('emlukast-fx tablet'), reachable)
+        self.assertEqual(len(self.graph.alternatives_within(1, max_hops=3, limit=2)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import get_drug_catalog
+from chalicelib.catalog.fuzzy_matcher import FuzzyMatcher, bounded_levenshtein
+from chalicelib.services.chalice_medical_info import ChalliceMedicalInfoService
+
+
+class TestFuzzyMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = FuzzyMatcher(['azithral', 'azithral 500', 'augmentin', 'allegra', 'allegra m', 'ibuprofen'])
+
+    def test_bounded_levenshtein(self):
+        self.assertEqual(bounded_levenshtein('ibuprofin', 'ibuprofen', 2), 1)
+        self.assertEqual(bounded_levenshtein('kitten', 'sitting', 3), 3)
+        self.assertIsNone(bounded_levenshtein('kitten', 'sitting', 2))
+
+    def test_ranked_matches(self):
+        self.assertEqual(self.matcher.match('azithrall')[0], ('azithral', 1))
+        self.assertEqual(self.matcher.match('ibuprofin'), [('ibuprofen', 1)])
+        self.assertEqual(self.matcher.match('allegra'), [('allegra', 0)])
+
+    def test_short_queries_must_match_exactly(self):
+        self.assertEqual(self.matcher.match('alle'), [])
+        self.assertEqual(self.matcher.match('xyzzyq'), [])
+
+    def test_merge_bound_keeps_rare_trigram_matches(self):
+        # Every name shares the " forte" trigrams; the stems' trigrams still find the match
+        terms = [f"{stem} forte" for stem in ('azithral', 'augmentin', 'allegra', 'ibuprofen', 'cetirizine')]
+        bounded = FuzzyMatcher(terms, max_postings=2)
+        self.assertEqual(bounded.match('ibuprofin forte'), [('ibuprofen forte', 1)])
+        self.assertEqual(bounded.match('alegra forte'), FuzzyMatcher(terms).match('alegra forte'))
+
+    def test_five_letter_names_are_not_fuzzed(self):
+        # "advil" is one edit from "avil", an unrelated antihistamine
+        self.assertEqual(FuzzyMatcher(['avil', 'avil 25']).match('advil'), [])
+        self.assertEqual(get_drug_catalog().suggest('advil'), [])
+        self.assertIsNone(get_drug_catalog().lookup('advil'))
+
+    def test_service_never_answers_for_a_close_spelling(self):
+        service = ChalliceMedicalInfoService()
+        service.initialize()
+        service.openfda_client = MagicMock()
+        service.openfda_client.fetch.return_value = None
+
+        result = service.get_medical_info({'intent': 'GetSideEffects', 'slots': {'medication': 'advil'}})
+        self.assertEqual(result['data']['medication'], 'ibuprofen')
+        self.assertNotIn('Avil', result['response'])
+
+        # Misspellings are checked against OpenFDA, then offered back as a question
+        result = service.get_medical_info({'intent': 'GetSideEffects', 'slots': {'medication': 'ibuprofin'}})
+        self.assertEqual(result['data']['suggestions'], ['ibuprofen'])
+        self.assertIn('Did you mean ibuprofen?', result['response'])
+        service.openfda_client.fetch.assert_called_once()
+
+        result = service.get_medical_info({'intent': 'GeneralMedicationInfo', 'slots': {'medication': 'azithrall'}})
+        self.assertNotIn('source', result['data'])
+        self.assertTrue(result['data']['suggestions'])
+        result = service.get_medical_info({'intent': 'GeneralMedicationInfo', 'slots': {'medication': 'azithral'}})
+        self.assertEqual(result['data']['name'], get_drug_catalog().lookup('azithral').name)
+
+
+if __name__ == '__main__':
+    unittest.main()
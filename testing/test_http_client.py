@@ -0,0 +1,120 @@
+import unittest
+import sys
+import os
+import random
+from unittest.mock import MagicMock
+
+import requests
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.utils.http_client import HTTPClient
+
+
+def make_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        self.delays = []
+        self.client = HTTPClient(
+            pool_size=4, connect_timeout=1, read_timeout=5, max_retries=3,
+            backoff_base=0.1, backoff_max=1.0, sleep=self.delays.append, rng=random.Random(3)
+        )
+        self.client.session = MagicMock()
+
+    def test_session_pool_and_timeouts(self):
+        client = HTTPClient(pool_size=4, connect_timeout=1, read_timeout=5)
+        adapter = client.session.get_adapter('https://api.fda.gov')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertIs(client.session, client.session)
+
+        self.client.session.get.return_value = make_response(200)
+        self.client.get('https://fda.test/drug/label.json', params={'limit': 1})
+        self.assertEqual(self.client.session.get.call_args.kwargs['timeout'], (1, 5))
+
+    def test_retries_throttling_and_server_errors_with_jitter(self):
+        self.client.session.get.side_effect = [make_response(429), make_response(503), make_response(200)]
+        response = self.client.get('https://fda.test/drug/label.json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.stats(), {'requests': 3, 'retries': 2})
+        self.assertEqual(len(self.delays), 2)
+        self.assertTrue(0 <= self.delays[0] <= 0.1)
+        self.assertTrue(0 <= self.delays[1] <= 0.2)
+
+    def test_gives_up_and_returns_last_response(self):
+        self.client.session.get.return_value = make_response(500)
+        self.assertEqual(self.client.get('https://fda.test').status_code, 500)
+        self.assertEqual(self.client.session.get.call_count, 4)
+
+    def test_client_errors_are_not_retried(self):
+        self.client.session.get.return_value = make_response(404)
+        self.assertEqual(self.client.get('https://fda.test').status_code, 404)
+        self.assertEqual(self.delays, [])
+
+    def test_retry_after_is_honored_up_to_the_cap(self):
+        self.client.session.get.side_effect = [
+            make_response(429, {'Retry-After': '0.5'}),
+            make_response(429, {'Retry-After': '30'}),
+            make_response(200)
+        ]
+        self.client.get('https://fda.test')
+        self.assertEqual(self.delays, [0.5, 1.0])
+
+    def test_connection_errors_are_retried_then_raised(self):
+        self.client.session.get.side_effect = requests.ConnectionError('reset')
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get('https://fda.test')
+        self.assertEqual(self.client.session.get.call_count, 4)
+
+    def test_deadline_spans_every_attempt(self):
+        now = [0.0]
+
+        def sleep(delay):
+            now[0] += delay
+
+        def hang(url, timeout, **kwargs):
+            # Every attempt uses its whole read timeout
+            now[0] += timeout[1]
+            raise requests.Timeout('read timed out')
+
+        client = HTTPClient(connect_timeout=3.05, read_timeout=10, max_retries=2, backoff_base=0.2,
+                            backoff_max=2, deadline=20, sleep=sleep, clock=lambda: now[0])
+        client.session = MagicMock()
+        client.session.get.side_effect = hang
+        with self.assertRaises(requests.Timeout):
+            client.get('https://fda.test')
+        self.assertLessEqual(now[0], 20)
+        timeouts = [call.kwargs['timeout'] for call in client.session.get.call_args_list]
+        self.assertEqual(timeouts[0], (3.05, 10))
+        self.assertLess(timeouts[-1][1], 10)
+
+    def test_no_retry_that_cannot_finish_before_the_deadline(self):
+        now = [0.0]
+        client = HTTPClient(max_retries=3, deadline=5, sleep=self.delays.append, clock=lambda: now[0])
+        client.session = MagicMock()
+
+        def slow(url, timeout, **kwargs):
+            now[0] += 4.5
+            return make_response(503, {'Retry-After': '2'})
+
+        client.session.get.side_effect = slow
+        self.assertEqual(client.get('https://fda.test').status_code, 503)
+        self.assertEqual(client.session.get.call_count, 1)
+        self.assertEqual(self.delays, [])
+
+    def test_non_idempotent_requests_are_sent_once(self):
+        self.client.session.post.return_value = make_response(503)
+        self.client.request('POST', 'https://fda.test', json={})
+        self.assertEqual(self.client.session.post.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
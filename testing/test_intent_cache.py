@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService
+from chalicelib.services.intent_cache import IntentCache, normalize_utterance
+from chalicelib.services.intent_recognition_service import IntentRecognitionService
+
+
+def scanner():
+    return ChaliceIntentRecognitionService(catalog=DrugCatalog.from_items([{'id': 1, 'name': 'Augmentin 625 Duo Tablet'}]))
+
+
+def lex_result(intent, medication=None, resolved=None):
+    slots = {}
+    if medication:
+        slots['Medication'] = {'value': {
+            'originalValue': medication,
+            'interpretedValue': resolved or medication,
+            'resolvedValues': [resolved or medication]
+        }}
+    return {'intent': {'name': intent, 'slots': slots}, 'slots': {}}
+
+
+class TestIntentCache(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_utterance("  What's the DOSE of Aspirin??"), "whats the dose of aspirin")
+
+    def test_exact_utterances_share_an_entry(self):
+        cache = IntentCache(maxsize=10, ttl=60, abstract_medications=False)
+        self.assertIsNone(cache.get("What is the dose of aspirin?"))
+        cache.put("What is the dose of aspirin?", lex_result('GetDosageInfo', 'aspirin'))
+        result = cache.get("what is the dose of   ASPIRIN")
+        self.assertEqual(result['intent']['name'], 'GetDosageInfo')
+        self.assertIsNone(cache.get("what is the dose of ibuprofen"))
+        # Callers get copies
+        result['intent']['name'] = 'changed'
+        self.assertEqual(cache.get("What is the dose of aspirin?")['intent']['name'], 'GetDosageInfo')
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_medications_are_abstracted(self):
+        cache = IntentCache(maxsize=10, ttl=60, abstract_medications=True, scanner=scanner())
+        cache.put("What are the side effects of Aspirin?", lex_result('GetSideEffects', 'Aspirin'))
+        result = cache.get("what are the side effects of augmentin 625 duo")
+        self.assertEqual(result['intent']['slots']['Medication']['value'], {
+            'originalValue': 'augmentin 625 duo',
+            'interpretedValue': 'augmentin 625 duo',
+            'resolvedValues': ['augmentin 625 duo']
+        })
+        self.assertEqual(cache.stats()['template_hits'], 1)
+
+    def test_resolved_synonyms_are_cached_exactly(self):
+        cache = IntentCache(maxsize=10, ttl=60, abstract_medications=True, scanner=scanner())
+        cache.put("side effects of tylenol", lex_result('GetSideEffects', 'tylenol', 'acetaminophen'))
+        self.assertIsNone(cache.get("side effects of aspirin"))
+        self.assertEqual(cache.get("Side effects of Tylenol?")['intent']['slots']['Medication']['value']['interpretedValue'], 'acetaminophen')
+        self.assertEqual(cache.stats()['exact_only'], 1)
+
+    def test_size_and_ttl_bounds(self):
+        now = [0.0]
+        cache = IntentCache(maxsize=2, ttl=10, abstract_medications=False)
+        cache.cache._clock = lambda: now[0]
+        for text in ("one", "two", "three"):
+            cache.put(text, lex_result('GeneralMedicationInfo'))
+        self.assertIsNone(cache.get("one"))
+        now[0] = 11.0
+        self.assertIsNone(cache.get("three"))
+        stats = cache.stats()
+        self.assertEqual((stats['evictions'], stats['expirations']), (1, 1))
+
+
+class TestLexIntentCache(unittest.TestCase):
+    def test_repeated_questions_skip_lex(self):
+        with patch('chalicelib.services.intent_recognition_service.boto3'):
+            service = IntentRecognitionService(cache=IntentCache(maxsize=10, ttl=60, abstract_medications=True, scanner=scanner()))
+        service.client = MagicMock()
+        service.client.recognize_text.return_value = {'interpretations': [lex_result('GetSideEffects', 'aspirin')]}
+
+        first = service.recognize_intent("What are the side effects of aspirin?")
+        second = service.recognize_intent("what are the side effects of augmentin")
+        self.assertEqual(first['intent']['slots']['Medication']['value']['originalValue'], 'aspirin')
+        self.assertEqual(second['intent']['slots']['Medication']['value']['originalValue'], 'augmentin')
+        self.assertEqual(service.client.recognize_text.call_count, 1)
+        self.assertEqual(service.cache.stats()['hit_rate'], 0.5)
+
+    def test_errors_are_not_cached(self):
+        with patch('chalicelib.services.intent_recognition_service.boto3'):
+            service = IntentRecognitionService(cache=IntentCache(maxsize=10, ttl=60, abstract_medications=False))
+        service.client = MagicMock()
+        service.client.recognize_text.side_effect = [RuntimeError("throttled"), {'interpretations': [lex_result('GetDosageInfo')]}]
+        self.assertIsNone(service.recognize_intent("dose?")['intent'])
+        self.assertEqual(service.recognize_intent("dose?")['intent']['name'], 'GetDosageInfo')
+
+    def test_empty_results_are_not_cached(self):
+        with patch('chalicelib.services.intent_recognition_service.boto3'):
+            service = IntentRecognitionService(cache=IntentCache(maxsize=10, ttl=60, abstract_medications=False))
+        service.client = MagicMock()
+        service.client.recognize_text.side_effect = [{}, {'interpretations': [{}]},
+                                                     {'interpretations': [lex_result('GetSubstitutes')]}]
+        self.assertFalse(service.recognize_intent("substitute?")['intent'])
+        self.assertFalse(service.recognize_intent("substitute?")['intent'])
+        self.assertEqual(service.recognize_intent("substitute?")['intent']['name'], 'GetSubstitutes')
+        self.assertEqual(service.client.recognize_text.call_count, 3)
+        self.assertEqual(len(service.cache.cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
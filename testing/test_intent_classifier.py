@@ -0,0 +1,159 @@
+import unittest
+import random
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog, DEFAULT_CATALOG_PATH
+from chalicelib.catalog.side_effect_index import SideEffectIndex
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService, COMMON_MEDICATIONS
+from chalicelib.services.intent_classifier import (
+    HashedFeatures, IntentClassifier, expand_utterances, load_templates, split_by_template
+)
+from chalicelib.services.local_intent_recognition import DEFAULT_MIN_CONFIDENCE, LocalIntentRecognitionService
+from chalicelib.orchestration.chalice_query_handler import ChaliceQueryHandler
+
+SLOT_VALUES = {
+    'medication': ['augmentin', 'azithral', 'aspirin', 'ibuprofen', 'metformin', 'dolo 650'],
+    'side_effect': ['nausea', 'headache', 'dizziness', 'rash', 'diarrhea']
+}
+
+TRAINED = {}
+
+
+def setUpModule():
+    # One small model shared by every test
+    utterances = expand_utterances(load_templates(), SLOT_VALUES, 3, random.Random(1))
+    TRAINED['train'], calibration, _ = split_by_template(utterances, (0.15, 0.0), random.Random(1))
+    TRAINED['model'] = IntentClassifier(sorted(load_templates()), HashedFeatures(2 ** 14))
+    TRAINED['losses'] = TRAINED['model'].fit(*zip(*TRAINED['train']), epochs=40)
+    TRAINED['model'].calibrate(*zip(*calibration))
+
+
+class TestIntentClassifier(unittest.TestCase):
+    def setUp(self):
+        self.model = TRAINED['model']
+        self.train = TRAINED['train']
+        self.losses = TRAINED['losses']
+
+    def test_features_are_deterministic_and_normalized(self):
+        featurizer = HashedFeatures(2 ** 10)
+        indptr, indices, values = featurizer.transform(["What is the dose?", ""])
+        self.assertEqual(len(indptr), 3)
+        self.assertGreater(indptr[2], indptr[1])  # empty text still has the '<s>' feature
+        self.assertAlmostEqual(float((values[:indptr[1]] ** 2).sum()), 1.0, places=5)
+        self.assertEqual(list(featurizer.transform(["What is the dose?"])[1]), list(indices[:indptr[1]]))
+
+    def test_learns_the_corpus(self):
+        self.assertLess(self.losses[-1], self.losses[0] / 4)
+        predictions = self.model.predict([
+            "what are the side effects of augmentin",
+            "how much metformin should i take",
+            "which drugs cause nausea",
+            "what can i take instead of azithral"
+        ])
+        self.assertEqual([intent for intent, _ in predictions],
+                         ['GetSideEffects', 'GetDosageInfo', 'FindDrugsBySideEffect', 'GetSubstitutes'])
+        for _, confidence in predictions:
+            self.assertGreater(confidence, 0.0)
+            self.assertLessEqual(confidence, 1.0)
+
+    def test_batch_matches_single_predictions(self):
+        texts = [text for text, _ in self.train[:20]]
+        batch = self.model.predict_proba(texts)
+        for row, text in enumerate(texts):
+            self.assertTrue(abs(batch[row] - self.model.predict_proba([text])[0]).max() < 1e-5)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.npz')
+            self.model.save(path)
+            loaded = IntentClassifier.load(path)
+        self.assertEqual(loaded.labels, self.model.labels)
+        self.assertEqual(loaded.temperature, self.model.temperature)
+        text = ["is it safe to mix aspirin and ibuprofen"]
+        self.assertEqual(loaded.predict(text), self.model.predict(text))
+
+    def test_evaluation_report(self):
+        metrics = self.model.evaluate(*zip(*self.train))
+        self.assertGreater(metrics['accuracy'], 0.9)
+        self.assertLessEqual(metrics['calibration_error'], 1.0)
+        self.assertEqual(set(metrics['per_intent_f1']), set(self.model.labels))
+
+
+class TestShippedCorpus(unittest.TestCase):
+    """Held-out quality of a model trained as scripts/models/train_intent_classifier.py does"""
+
+    # Measured 0.712 accuracy, and 0.955 accuracy on the answers at the default confidence
+    ACCURACY_FLOOR = 0.68
+    CONFIDENT_ACCURACY_FLOOR = 0.9
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(7)
+        catalog = DrugCatalog.from_file(DEFAULT_CATALOG_PATH)
+        slot_values = {
+            'medication': sorted(set(COMMON_MEDICATIONS) | set(catalog.by_alias) | set(catalog.by_name)),
+            'side_effect': [term for term in SideEffectIndex.from_catalog(catalog).terms() if len(term.split()) <= 3]
+        }
+        utterances = expand_utterances(load_templates(), slot_values, 8, rng)
+        train, calibration, cls.test = split_by_template(utterances, (0.15, 0.15), rng)
+        cls.model = IntentClassifier(sorted(set(label for _, label in train)), HashedFeatures(2 ** 16))
+        cls.model.fit(*zip(*train), epochs=60, learning_rate=0.05, l2=1e-4)
+        cls.model.calibrate(*zip(*calibration))
+        cls.rules = ChaliceIntentRecognitionService(catalog=catalog)
+
+    def test_held_out_accuracy(self):
+        metrics = self.model.evaluate(*zip(*self.test), threshold=DEFAULT_MIN_CONFIDENCE)
+        self.assertGreaterEqual(metrics['accuracy'], self.ACCURACY_FLOOR)
+        self.assertGreaterEqual(metrics['confident_accuracy'], self.CONFIDENT_ACCURACY_FLOOR)
+
+    def test_confident_answers_beat_the_rules(self):
+        metrics = self.model.evaluate(*zip(*self.test), threshold=DEFAULT_MIN_CONFIDENCE)
+        fired = [self.rules.recognize_intent(text)['intent'] == label for text, label in self.test
+                 if self.rules.recognize_intent(text)['intent'] != 'GeneralMedicationInfo']
+        self.assertGreaterEqual(metrics['confident_accuracy'], sum(fired) / len(fired))
+
+
+class TestLocalIntentRecognition(unittest.TestCase):
+    def setUp(self):
+        rules = ChaliceIntentRecognitionService(catalog=DrugCatalog.from_items([{'id': 1, 'name': 'Augmentin 625 Duo Tablet'}]))
+        self.service = LocalIntentRecognitionService(model_path='unused.npz', rules=rules, min_confidence=0.5)
+        self.service.classifier = TRAINED['model']
+
+    def test_classifies_and_fills_slots(self):
+        results = self.service.recognize_intents([
+            "what are the side effects of augmentin",
+            "which drugs cause headache"
+        ])
+        self.assertEqual(results[0]['intent'], 'GetSideEffects')
+        self.assertEqual(results[0]['slots']['medication'], 'augmentin')
+        self.assertEqual(results[1]['slots'], {'side_effect_query': "which drugs cause headache"})
+
+    def test_low_confidence_falls_back_to_rules(self):
+        self.service.min_confidence = 1.1
+        result = self.service.recognize_intent("what is the dosage of augmentin")
+        self.assertEqual(result['intent'], 'GetDosageInfo')
+        self.assertEqual(result['confidence'], 0.85)
+        self.assertEqual(self.service.fallbacks, 1)
+
+    def test_missing_model_falls_back_to_rules(self):
+        service = LocalIntentRecognitionService(model_path='/nonexistent/model.npz', rules=self.service.rules)
+        self.assertEqual(service.recognize_intent("any side effects of augmentin?")['intent'], 'GetSideEffects')
+
+    def test_handler_selects_backend(self):
+        with patch.dict(os.environ, {'INTENT_BACKEND': 'local', 'INTENT_MODEL_PATH': '/nonexistent/model.npz'}):
+            self.assertIsInstance(ChaliceQueryHandler().intent_service, ChaliceIntentRecognitionService)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.npz')
+            TRAINED['model'].save(path)
+            with patch.dict(os.environ, {'INTENT_BACKEND': 'local', 'INTENT_MODEL_PATH': path}):
+                self.assertIsInstance(ChaliceQueryHandler().intent_service, LocalIntentRecognitionService)
+
+
+if __name__ == '__main__':
+    unittest.main()
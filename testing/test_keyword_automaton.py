@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog
+from chalicelib.catalog.keyword_automaton import KeywordAutomaton, leftmost_longest
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService
+
+
+def make_catalog():
+    return DrugCatalog.from_items([
+        {'id': 1, 'name': 'Augmentin 625 Duo Tablet', 'SideEffects': 'Nausea'},
+        {'id': 2, 'name': 'Azithral 500 Tablet', 'SideEffects': 'Diarrhea'},
+        {'id': 3, 'name': 'Air Tablet'},
+    ])
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+    def test_finds_overlapping_keywords_in_one_pass(self):
+        automaton = KeywordAutomaton()
+        for keyword in ('he', 'she', 'his', 'hers'):
+            automaton.add(keyword, keyword)
+        found = sorted((start, end, payload) for start, end, payload in automaton.find('ushers'))
+        self.assertEqual(found, [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers')])
+
+    def test_whole_word_keywords(self):
+        automaton = KeywordAutomaton()
+        automaton.add('air', 'drug', whole_word=True)
+        automaton.add('dose', 'cue')
+        self.assertEqual([payload for _, _, payload in automaton.find('hair doses')], ['cue'])
+        self.assertEqual([payload for _, _, payload in automaton.find('air, twice')], ['drug'])
+
+    def test_keywords_added_after_a_search(self):
+        automaton = KeywordAutomaton()
+        automaton.add('aspirin', 1)
+        self.assertEqual(len(list(automaton.find('aspirin'))), 1)
+        automaton.add('pirin', 2)
+        self.assertEqual(sorted(payload for _, _, payload in automaton.find('aspirin')), [1, 2])
+
+    def test_leftmost_longest(self):
+        matches = [(0, 9, 'augmentin'), (0, 17, 'augmentin 625 duo'), (10, 13, '625'), (20, 24, 'azee')]
+        self.assertEqual(leftmost_longest(matches), [(0, 17, 'augmentin 625 duo'), (20, 24, 'azee')])
+
+
+class TestChaliceIntentRecognition(unittest.TestCase):
+    def setUp(self):
+        self.service = ChaliceIntentRecognitionService(catalog=make_catalog())
+
+    def test_fills_medication_slot_from_catalog_names_and_aliases(self):
+        result = self.service.recognize_intent("What are the side effects of Augmentin 625 Duo?")
+        self.assertEqual(result['intent'], 'GetSideEffects')
+        self.assertEqual(result['slots']['medication'], 'augmentin 625 duo')
+
+        result = self.service.recognize_intent("Can I take azithral instead of augmentin?")
+        self.assertEqual(result['intent'], 'GetSubstitutes')
+        self.assertEqual(result['slots']['medications'], ['azithral', 'augmentin'])
+
+    def test_common_medications_outside_the_catalog(self):
+        result = self.service.recognize_intent("What is the right dose of Ibuprofen?")
+        self.assertEqual(result['intent'], 'GetDosageInfo')
+        self.assertEqual(result['slots']['medication'], 'ibuprofen')
+
+    def test_rules_without_a_medication(self):
+        result = self.service.recognize_intent("Which drugs cause dizziness?")
+        self.assertEqual(result['intent'], 'FindDrugsBySideEffect')
+        self.assertEqual(result['slots'], {'side_effect_query': "Which drugs cause dizziness?"})
+        result = self.service.recognize_intent("Any side effects?")
+        self.assertEqual(result['slots'], {'medication': 'generic'})
+        # Short aliases and words containing names are not mentions
+        result = self.service.recognize_intent("Is fresh air good for augmentinol users?")
+        self.assertEqual(result, {'intent': 'GeneralMedicationInfo', 'confidence': 0.7, 'slots': {}})
+
+    def test_cause_questions_about_a_medication(self):
+        for query in ("What side effects can aspirin cause?", "What side effects does Augmentin 625 Duo Tablet cause?"):
+            self.assertEqual(self.service.recognize_intent(query)['intent'], 'GetSideEffects')
+        self.assertEqual(self.service.recognize_intent("Which drugs caused my rash?")['intent'], 'FindDrugsBySideEffect')
+        # "because" does not contain the cue word "cause"
+        result = self.service.recognize_intent("What can I take because of my headache?")
+        self.assertEqual(result['intent'], 'GeneralMedicationInfo')
+
+    def test_catalog_is_not_loaded_until_the_first_query(self):
+        service = ChaliceIntentRecognitionService(catalog=make_catalog())
+        self.assertFalse(ChaliceIntentRecognitionService.automaton.is_built(service))
+        service.recognize_intent("hello")
+        self.assertTrue(ChaliceIntentRecognitionService.automaton.is_built(service))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import zipfile
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts', 'database')))
+
+from build_label_store import build_label_store
+from chalicelib.catalog.label_store import LabelStore
+from chalicelib.services.openfda_client import OpenFDAClient
+from chalicelib.utils.http_client import HTTPClient
+
+
+def label(set_id, effective_time, brand, generic, product_type='HUMAN PRESCRIPTION DRUG', **sections):
+    document = {
+        'set_id': set_id,
+        'id': f"{set_id}-{effective_time}",
+        'effective_time': effective_time,
+        'openfda': {'brand_name': [brand], 'generic_name': [generic], 'product_type': [product_type]}
+    }
+    document.update({name: [text] for name, text in sections.items()})
+    return document
+
+
+def write_export(path, labels):
+    # Bulk files carry a "results" object in meta before the label array
+    payload = {'meta': {'results': {'skip': 0, 'limit': 2, 'total': len(labels)}}, 'results': labels}
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr(os.path.basename(path)[:-4], json.dumps(payload))
+
+
+class TestLabelStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        write_export(os.path.join(cls.directory.name, 'drug-label-0001-of-0002.json.zip'), [
+            label('set-aug', '20200101', 'Augmentin', 'AMOXICILLIN AND CLAVULANATE POTASSIUM',
+                  adverse_reactions='Old text: rash.'),
+            label('set-tyl', '20210505', 'Tylenol', 'ACETAMINOPHEN', 'HUMAN OTC DRUG',
+                  indications_and_usage='Temporarily relieves minor aches and pains.',
+                  warnings='Liver warning: severe liver damage may occur.'),
+            {'id': 'no-set-id'}
+        ])
+        write_export(os.path.join(cls.directory.name, 'drug-label-0002-of-0002.json.zip'), [
+            label('set-aug', '20230101', 'Augmentin', 'AMOXICILLIN AND CLAVULANATE POTASSIUM',
+                  adverse_reactions='Diarrhea, nausea and skin rashes were the most frequent reactions.'),
+            label('set-amx', '20220101', 'Amoxil', 'AMOXICILLIN',
+                  adverse_reactions='Nausea, vomiting and diarrhea.')
+        ])
+        cls.path = os.path.join(cls.directory.name, 'labels.sqlite3')
+        cls.summary = build_label_store([cls.directory.name], cls.path, workers=2)
+        cls.store = LabelStore(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.store.close()
+        cls.directory.cleanup()
+
+    def test_ingestion_keeps_newest_version(self):
+        self.assertEqual(self.summary['files'], 2)
+        self.assertEqual(self.summary['skipped'], 1)
+        self.assertEqual(len(self.store), 3)
+        self.assertIn('skin rashes', self.store.get('set-aug')['adverse_reactions'][0])
+
+    def test_name_indexes(self):
+        self.assertEqual(self.store.by_brand_name('TYLENOL')[0]['set_id'], 'set-tyl')
+        self.assertEqual(self.store.by_generic_name('amoxicillin')[0]['set_id'], 'set-amx')
+        self.assertEqual(self.store.by_brand_name('unknown'), [])
+
+    def test_full_text_search(self):
+        self.assertEqual([doc['set_id'] for doc in self.store.search('liver damage')], ['set-tyl'])
+        self.assertEqual(self.store.search('liver', section='adverse_reactions'), [])
+        self.assertEqual({doc['set_id'] for doc in self.store.search('nausea', limit=5)}, {'set-aug', 'set-amx'})
+
+    def test_openfda_search_expressions(self):
+        # The expressions the medical info services send to OpenFDA
+        self.assertEqual(self.store.query('openfda.generic_name:amoxicillin')[0]['set_id'], 'set-amx')
+        self.assertEqual(self.store.query('openfda.generic_name:clavulanate')[0]['set_id'], 'set-aug')
+        self.assertEqual(self.store.query('openfda.brand_name:"Tylenol" AND openfda.product_type:otc')[0]['set_id'], 'set-tyl')
+        self.assertEqual(self.store.query('openfda.brand_name:augmentin+AND+_exists_:adverse_reactions')[0]['set_id'], 'set-aug')
+        self.assertEqual(self.store.query('openfda.brand_name:tylenol+AND+_exists_:adverse_reactions'), [])
+        self.assertIsNone(self.store.query('openfda.brand_name:tylenol+AND+_exists_:boxed_warnings'))
+        self.assertIsNone(self.store.query('openfda.route:oral'))
+
+    def test_openfda_client_answers_from_store_first(self):
+        http = HTTPClient(max_retries=0)
+        http.session = MagicMock()
+        client = OpenFDAClient(base_url='https://fda.test/drug', api_key='', http_client=http, label_store=self.store)
+        data = client.fetch('label', {'search': 'openfda.generic_name:acetaminophen', 'limit': 1})
+        self.assertEqual(data['meta']['source'], 'label_store')
+        self.assertEqual(data['results'][0]['openfda']['brand_name'], ['Tylenol'])
+        http.session.get.assert_not_called()
+
+        # Misses fall through to HTTP, unless the client is offline
+        http.session.get.return_value = MagicMock(status_code=404)
+        self.assertIsNone(client.fetch('label', {'search': 'openfda.generic_name:ibuprofen', 'limit': 1}))
+        self.assertEqual(http.session.get.call_count, 1)
+        offline = OpenFDAClient(base_url='https://fda.test/drug', api_key='', http_client=http,
+                                label_store=self.store, offline=True)
+        self.assertIsNone(offline.fetch('label', {'search': 'openfda.generic_name:naproxen', 'limit': 1}))
+        self.assertEqual(http.session.get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.services.language_detector import LanguageDetector, UNKNOWN
+from chalicelib.services.chalice_translation_service import ChaliceTranslationService
+
+
+class TestLanguageDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = LanguageDetector()
+
+    def test_scripts(self):
+        self.assertEqual(self.detector.detect("阿司匹林的副作用是什么")[0], 'zh')
+        self.assertEqual(self.detector.detect("アスピリンの副作用は何ですか")[0], 'ja')
+        self.assertEqual(self.detector.detect("아스피린의 부작용은 무엇입니까")[0], 'ko')
+        self.assertEqual(self.detector.detect("Какие побочные эффекты у аспирина?")[0], 'ru')
+
+    def test_latin_languages(self):
+        cases = {
+            "What are the side effects of aspirin?": 'en',
+            "¿Cuáles son los efectos secundarios del paracetamol?": 'es',
+            "Quels sont les effets secondaires de l'aspirine ?": 'fr',
+            "Welche Nebenwirkungen hat Ibuprofen?": 'de',
+            "Quali sono gli effetti collaterali dell'aspirina?": 'it',
+            "Quais são os efeitos colaterais do paracetamol?": 'pt',
+        }
+        for text, expected in cases.items():
+            self.assertEqual(self.detector.detect(text)[0], expected, text)
+
+    def test_confidence(self):
+        language, confidence = self.detector.detect("Can I drink alcohol after taking ibuprofen?")
+        self.assertEqual(language, 'en')
+        self.assertGreaterEqual(confidence, 0.7)
+        # A lone drug name says little about the language
+        self.assertLess(self.detector.detect("ibuprofen")[1], 0.7)
+        self.assertEqual(self.detector.detect("500 mg"), (UNKNOWN, 0.0))
+
+    def test_fallback_translation_service_labels_han_as_chinese(self):
+        service = ChaliceTranslationService()
+        self.assertEqual(service._detect_language("阿司匹林的副作用是什么"), 'zh')
+        self.assertEqual(service._detect_language("123"), 'en')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import subprocess
+import threading
+from unittest.mock import patch
+
+# Add parent directory to path to import the modules
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from core.orchestration.lazy_service import LazyService
+from core.orchestration.query_handler_interface import QueryHandler
+from core.services.translation_service_interface import TranslationService
+from chalicelib.orchestration.chalice_query_handler import ChaliceQueryHandler
+from chalicelib.services.aws_translation_service import AWSTranslationService
+
+
+class Owner:
+    service = LazyService()
+
+    def __init__(self):
+        self.built = 0
+        self.release = threading.Event()
+
+    def _create_service(self):
+        self.release.wait(5)
+        self.built += 1
+        return object()
+
+
+class TestLazyService(unittest.TestCase):
+    def test_built_once_under_concurrent_first_access(self):
+        owner = Owner()
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(owner.service)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        owner.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(owner.built, 1)
+        self.assertEqual(len({id(service) for service in seen}), 1)
+
+    def test_assignment_and_delete(self):
+        owner = Owner()
+        owner.release.set()
+        self.assertFalse(Owner.service.is_built(owner))
+        owner.service = 'replacement'
+        self.assertEqual(owner.service, 'replacement')
+        self.assertEqual(owner.built, 0)
+        del owner.service
+        owner.service
+        self.assertEqual(owner.built, 1)
+
+
+class TestQueryHandlerConstruction(unittest.TestCase):
+    def test_chalice_handler_builds_only_aws_services_on_first_use(self):
+        with patch.object(TranslationService, '__init__', side_effect=AssertionError('core service built')) as core_init, \
+                patch('boto3.client') as mock_boto_client:
+            handler = ChaliceQueryHandler()
+            self.assertFalse(QueryHandler.translation_service.is_built(handler))
+            service = handler.translation_service
+            self.assertIsInstance(service, AWSTranslationService)
+            self.assertIs(handler.translation_service, service)
+            core_init.assert_not_called()
+            # The boto3 client waits for the first translation call
+            mock_boto_client.assert_not_called()
+            service.translate_client
+            self.assertEqual(mock_boto_client.call_count, 1)
+
+    def test_cleanup_skips_unused_services(self):
+        handler = QueryHandler()
+        handler.cleanup()
+        self.assertFalse(QueryHandler.medical_service.is_built(handler))
+        self.assertFalse(QueryHandler.session_store.is_built(handler))
+
+    def test_importing_app_defers_heavy_dependencies(self):
+        probe = (
+            "import sys, app; "
+            "print(','.join(name for name in ('boto3', 'botocore', 'requests') if name in sys.modules))"
+        )
+        output = subprocess.check_output([sys.executable, '-c', probe], cwd=ROOT, text=True)
+        self.assertEqual(output.strip(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
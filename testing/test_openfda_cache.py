@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.utils.ttl_cache import TTLCache, MISSING
+from chalicelib.services.openfda_client import OpenFDAClient, OpenFDAError
+from chalicelib.utils.http_client import HTTPClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    return response
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(maxsize=2, ttl=10, negative_ttl=2, clock=self.clock)
+
+    def test_lru_eviction(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertIs(self.cache.get('b'), MISSING)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_ttl_and_negative_ttl(self):
+        self.cache.set('found', {'results': [1]})
+        self.cache.set_negative('missing')
+        self.assertIsNone(self.cache.get('missing'))
+
+        self.clock.now = 3
+        self.assertIs(self.cache.get('missing'), MISSING)
+        self.assertEqual(self.cache.get('found'), {'results': [1]})
+
+        self.clock.now = 11
+        self.assertIs(self.cache.get('found'), MISSING)
+
+    def test_stats(self):
+        self.cache.set('a', 1)
+        self.cache.set_negative('b')
+        self.cache.get('a')
+        self.cache.get('b')
+        self.cache.get('c')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['negative_hits'], stats['misses']), (1, 1, 1))
+
+
+class TestOpenFDAClient(unittest.TestCase):
+    def setUp(self):
+        # No retries, so call counts below are upstream calls made by the client
+        self.http = HTTPClient(max_retries=0)
+        self.http.session = MagicMock()
+        self.client = OpenFDAClient(base_url='https://fda.test/drug', api_key='', http_client=self.http)
+
+    def test_repeat_lookups_stay_in_process(self):
+        self.http.session.get.return_value = make_response(200, {'results': [{'adverse_reactions': ['x']}]})
+        first = self.client.fetch('label', {'search': 'openfda.generic_name:aspirin', 'limit': 1})
+        second = self.client.fetch('label', {'limit': 1, 'search': 'openfda.generic_name:aspirin'})
+        self.assertEqual(first, second)
+        self.assertEqual(self.http.session.get.call_count, 1)
+
+    def test_callers_cannot_change_the_cached_response(self):
+        self.http.session.get.return_value = make_response(200, {'results': [{'adverse_reactions': ['x']}]})
+        params = {'search': 'openfda.generic_name:aspirin', 'limit': 1}
+        first = self.client.fetch('label', params)
+        first['results'][0]['adverse_reactions'][0] = 'changed'
+        first['results'].clear()
+        second = self.client.fetch('label', params)
+        self.assertEqual(second, {'results': [{'adverse_reactions': ['x']}]})
+        self.assertIsNot(second, self.client.fetch('label', params))
+
+    def test_not_found_is_cached(self):
+        self.http.session.get.return_value = make_response(404)
+        self.assertIsNone(self.client.fetch('label', {'search': 'nothing'}))
+        self.assertIsNone(self.client.fetch('label', {'search': 'nothing'}))
+        self.assertEqual(self.http.session.get.call_count, 1)
+
+    def test_server_errors_are_not_cached(self):
+        self.http.session.get.return_value = make_response(500)
+        for _ in range(2):
+            with self.assertRaises(OpenFDAError):
+                self.client.fetch('label', {'search': 'flaky'})
+        self.assertEqual(self.http.session.get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import sys
+import os
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.services.dynamodb_session_backend import DynamoDBSessionBackend, BATCH_SIZE, default_flush_interval
+from core.orchestration.query_handler_interface import QueryHandler
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+        self.items = []
+
+    def put_item(self, Item):
+        self.items.append(Item)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Mirror boto3: one BatchWriteItem request per BATCH_SIZE items
+        for start in range(0, len(self.items), BATCH_SIZE):
+            self.table.batch_requests += 1
+            for item in self.items[start:start + BATCH_SIZE]:
+                self.table.items[item['session_id']] = item
+        return False
+
+
+class FakeTable:
+    """Local stand-in for a boto3 DynamoDB Table"""
+
+    def __init__(self):
+        self.items = {}
+        self.batch_requests = 0
+        self.get_requests = 0
+        self.fail_writes = False
+
+    def get_item(self, Key):
+        self.get_requests += 1
+        item = self.items.get(Key['session_id'])
+        return {'Item': item} if item else {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        if self.fail_writes:
+            raise RuntimeError('throttled')
+        return FakeBatchWriter(self)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDynamoDBSessionBackend(unittest.TestCase):
+    def setUp(self):
+        self.table = FakeTable()
+        self.clock = FakeClock()
+        self.backend = DynamoDBSessionBackend(
+            table=self.table, timeout=3600, flush_interval=1.0, max_buffered=BATCH_SIZE, clock=self.clock
+        )
+
+    def test_updates_coalesce_until_flush(self):
+        self.backend.update('a', {'query_count': 1})
+        self.backend.update('a', {'query_count': 2, 'last_intent': 'GetSideEffects'})
+        self.assertEqual(self.table.items, {})
+        self.assertEqual(self.backend.get('a'), {'query_count': 2, 'last_intent': 'GetSideEffects'})
+
+        self.backend.flush()
+        self.assertEqual(self.table.batch_requests, 1)
+        self.assertEqual(json.loads(self.table.items['a']['data']), {'query_count': 2, 'last_intent': 'GetSideEffects'})
+        self.assertGreater(self.table.items['a']['expires_at'], time.time())
+        self.assertEqual(self.backend.stats()['coalesced'], 1)
+
+    def test_full_buffer_flushes_in_batches(self):
+        for i in range(BATCH_SIZE):
+            self.backend.update(f"s{i}", {'query_count': 1})
+        self.assertEqual(len(self.table.items), BATCH_SIZE)
+        self.assertEqual(self.table.batch_requests, 1)
+        self.assertEqual(self.backend.stats()['buffered'], 0)
+
+    def test_flush_interval(self):
+        self.backend.update('a', {})
+        self.clock.now += 1.5
+        self.backend.update('b', {})
+        self.assertEqual(set(self.table.items), {'a', 'b'})
+
+    def test_flush_if_due(self):
+        self.backend.update('a', {'query_count': 1})
+        self.backend.flush_if_due()
+        self.assertEqual(self.table.items, {})
+        self.clock.now += 1.5
+        self.backend.flush_if_due()
+        self.assertIn('a', self.table.items)
+
+    def test_lambda_flushes_every_query(self):
+        with patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': 'pocket-pharmacist'}):
+            os.environ.pop('SESSION_FLUSH_INTERVAL', None)
+            self.assertEqual(default_flush_interval(), 0.0)
+
+    def test_query_end_flushes_due_sessions(self):
+        handler = QueryHandler()
+        handler.session_store = self.backend
+        handler.translation_service = MagicMock()
+        handler.translation_service.translate.return_value = ('Hello', 'en')
+        handler.intent_service = MagicMock()
+        handler.intent_service.recognize_intent.return_value = {'intent': None, 'slots': {}}
+
+        self.backend.update('earlier', {'query_count': 1})
+        self.clock.now += 1.5
+        # The query updates no session, so only the end-of-query flush writes the change
+        handler.process_query("Hello", "session-1", "en", "en")
+        handler.cleanup()
+        self.assertIn('earlier', self.table.items)
+
+    def test_concurrent_updates_keep_every_field(self):
+        gate = threading.Barrier(8, timeout=5)
+        original_get = self.backend.get
+
+        def racing_get(session_id):
+            # Every thread reads before any of them merges
+            result = original_get(session_id)
+            gate.wait()
+            return result
+
+        self.backend.get = racing_get
+        threads = [threading.Thread(target=self.backend.update, args=('a', {f"field{i}": i})) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        del self.backend.get
+        self.assertEqual(self.backend.get('a'), {f"field{i}": i for i in range(8)})
+
+    def test_reads_go_through_cache(self):
+        self.table.items['a'] = {'session_id': 'a', 'data': json.dumps({'query_count': 3}), 'expires_at': int(time.time()) + 60}
+        self.assertEqual(self.backend.get('a'), {'query_count': 3})
+        self.assertEqual(self.backend.get('a'), {'query_count': 3})
+        self.assertEqual(self.table.get_requests, 1)
+
+    def test_expired_items_are_ignored(self):
+        self.table.items['a'] = {'session_id': 'a', 'data': json.dumps({'query_count': 3}), 'expires_at': int(time.time()) - 1}
+        self.assertIsNone(self.backend.get('a'))
+        self.assertEqual(self.backend.update('a', {'query_count': 1}), {'query_count': 1})
+
+    def test_failed_flush_keeps_changes_buffered(self):
+        self.backend.update('a', {'query_count': 1})
+        self.table.fail_writes = True
+        self.backend.flush()
+        self.assertEqual(self.backend.stats()['buffered'], 1)
+
+        self.table.fail_writes = False
+        self.backend.close()
+        self.assertIn('a', self.table.items)
+
+
+if __name__ == '__main__':
+    unittest.main()
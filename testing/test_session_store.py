@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.orchestration.session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = SessionStore(timeout=60, max_sessions=3, clock=self.clock)
+
+    def test_update_merges_and_get_returns_copy(self):
+        self.store.update('a', {'query_count': 1})
+        self.store.update('a', {'last_intent': 'GetSideEffects'})
+        data = self.store.get('a')
+        self.assertEqual(data, {'query_count': 1, 'last_intent': 'GetSideEffects'})
+        data['query_count'] = 99
+        self.assertEqual(self.store.get('a')['query_count'], 1)
+
+    def test_expire_removes_only_idle_sessions(self):
+        self.store.update('a', {})
+        self.clock.now += 30
+        self.store.update('b', {})
+        self.clock.now += 30
+        self.assertEqual(self.store.expire(), 1)
+        self.assertNotIn('a', self.store)
+        self.assertIn('b', self.store)
+
+    def test_update_restarts_timeout(self):
+        self.store.update('a', {'query_count': 1})
+        self.clock.now += 50
+        self.store.update('a', {'query_count': 2})
+        self.clock.now += 50
+        # The stale heap entry from the first update must not remove the session
+        self.assertEqual(self.store.expire(), 0)
+        self.assertEqual(self.store.get('a'), {'query_count': 2})
+
+    def test_expired_session_starts_fresh(self):
+        self.store.update('a', {'query_count': 5})
+        self.clock.now += 61
+        self.assertIsNone(self.store.get('a'))
+        self.assertEqual(self.store.update('a', {'last_intent': 'x'}), {'last_intent': 'x'})
+
+    def test_cap_evicts_least_recently_updated(self):
+        for session_id in ('a', 'b', 'c'):
+            self.store.update(session_id, {})
+            self.clock.now += 1
+        self.store.update('a', {})
+        self.store.update('d', {})
+        self.assertEqual(len(self.store), 3)
+        self.assertNotIn('b', self.store)
+        self.assertEqual(self.store.stats()['evicted'], 1)
+
+    def test_heap_stays_bounded_under_repeated_updates(self):
+        for _ in range(1000):
+            self.store.update('a', {})
+        self.assertLessEqual(self.store.stats()['heap_entries'], 2 * len(self.store) + 65)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.drug_catalog import DrugCatalog
+from chalicelib.catalog.side_effect_index import SideEffectIndex, normalize_term
+from chalicelib.services.chalice_intent_recognition import ChaliceIntentRecognitionService
+
+SAMPLE_ITEMS = [
+    {'id': 1.0, 'name': 'drug one tablet', 'SideEffects': 'Dizziness, Drowsiness, Stomach pain'},
+    {'id': 2.0, 'name': 'drug two tablet', 'SideEffects': 'Dizziness, Flushing (sense of warmth in the face, ears)'},
+    {'id': 3.0, 'name': 'drug three tablet', 'SideEffects': 'Drowsiness, Pain'},
+    {'id': 4.0, 'name': 'drug four tablet', 'SideEffects': 'No common side effects seen'}
+]
+
+
+class TestSideEffectIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SideEffectIndex.from_catalog(DrugCatalog.from_items(SAMPLE_ITEMS))
+
+    def test_normalize_term(self):
+        self.assertEqual(normalize_term('Flushing (sense of warmth in the face, ears)'), 'flushing')
+        self.assertEqual(normalize_term('Dizzy'), 'dizziness')
+
+    def test_postings(self):
+        self.assertEqual(self.index.posting_list('dizziness'), [1, 2])
+        self.assertEqual(self.index.posting_list('flushing'), [2])
+        self.assertNotIn('no common side effects seen', self.index)
+
+    def test_and_or_queries(self):
+        self.assertEqual(self.index.query(['dizziness', 'drowsiness'], 'AND'), [1])
+        self.assertEqual(self.index.query(['dizziness', 'drowsiness'], 'OR'), [1, 2, 3])
+        self.assertEqual(self.index.query(['dizziness', 'unknown'], 'AND'), [])
+
+    def test_parse_query_prefers_longest_phrase(self):
+        terms, operator = self.index.parse_query('Which medicines cause stomach pain and drowsiness?')
+        self.assertEqual(terms, ['stomach pain', 'drowsiness'])
+        self.assertEqual(operator, 'AND')
+
+        terms, operator = self.index.parse_query('What makes you dizzy/drowsy?')
+        self.assertEqual(terms, ['dizziness', 'drowsiness'])
+        self.assertEqual(operator, 'OR')
+
+
+class TestSideEffectRouting(unittest.TestCase):
+    def setUp(self):
+        self.service = ChaliceIntentRecognitionService()
+
+    def test_reverse_lookup_questions(self):
+        for query in ("Which medicines cause stomach pain?", "What drugs caused my rash?"):
+            self.assertEqual(self.service.recognize_intent(query)['intent'], 'FindDrugsBySideEffect')
+
+    def test_cause_questions_naming_a_medication(self):
+        result = self.service.recognize_intent("What side effects can Augmentin 625 Duo Tablet cause?")
+        self.assertEqual(result['intent'], 'GetSideEffects')
+        result = self.service.recognize_intent("What side effects does azee cause?")
+        self.assertEqual(result['intent'], 'GetSideEffects')
+
+    def test_because_is_not_a_cause(self):
+        result = self.service.recognize_intent("What can I take because of my headache?")
+        self.assertEqual(result['intent'], 'GeneralMedicationInfo')
+
+
+if __name__ == '__main__':
+    unittest.main()
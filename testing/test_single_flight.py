@@ -0,0 +1,163 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.utils.single_flight import SingleFlight
+from chalicelib.services.openfda_client import OpenFDAClient
+from chalicelib.utils.http_client import HTTPClient
+
+CONCURRENCY = 16
+
+
+def run_concurrently(target, count=CONCURRENCY):
+    """Start count threads running target and return their results or exceptions"""
+    results = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_followers(flight, expected, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.stats()['coalesced'] < expected and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_identical_calls_run_once(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def upstream():
+            calls.append(1)
+            release.wait(5)
+            return {'answer': 42}
+
+        threads, results = run_concurrently(lambda: flight.do('key', upstream))
+        wait_for_followers(flight, CONCURRENCY - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'answer': 42} for result in results))
+        self.assertEqual(flight.stats(), {'executions': 1, 'coalesced': CONCURRENCY - 1, 'in_flight': 0})
+
+    def test_errors_reach_all_waiters(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def upstream():
+            release.wait(5)
+            raise RuntimeError('upstream failed')
+
+        threads, results = run_concurrently(lambda: flight.do('key', upstream))
+        wait_for_followers(flight, CONCURRENCY - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        # The failed call is forgotten, so the next caller tries again
+        self.assertEqual(flight.do('key', lambda: 'recovered'), 'recovered')
+
+    def test_different_keys_do_not_coalesce(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 1), 1)
+        self.assertEqual(flight.do('b', lambda: 2), 2)
+        self.assertEqual(flight.stats()['executions'], 2)
+
+    def test_openfda_requests_are_coalesced(self):
+        client = OpenFDAClient(base_url='https://fda.test/drug', api_key='', http_client=HTTPClient())
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = {'results': [{'adverse_reactions': ['Nausea']}]}
+            return response
+
+        client.http.session = MagicMock()
+        client.http.session.get.side_effect = slow_get
+
+        threads, results = run_concurrently(
+            lambda: client.fetch('label', {'search': 'openfda.generic_name:aspirin', 'limit': 1})
+        )
+        wait_for_followers(client.flight, CONCURRENCY - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.http.session.get.call_count, 1)
+        self.assertTrue(all(result['results'][0]['adverse_reactions'] == ['Nausea'] for result in results))
+
+    @patch('boto3.client')
+    def test_translate_requests_are_coalesced(self, mock_boto_client):
+        from chalicelib.services.aws_translation_service import AWSTranslationService
+        from chalicelib.services.translation_cache import TranslationCache
+
+        release = threading.Event()
+        mock_translate = MagicMock()
+        mock_boto_client.return_value = mock_translate
+
+        def slow_translate(**kwargs):
+            release.wait(5)
+            return {'TranslatedText': 'Hello', 'SourceLanguageCode': 'fr'}
+
+        mock_translate.translate_text.side_effect = slow_translate
+        service = AWSTranslationService(cache=TranslationCache(path=''))
+
+        threads, results = run_concurrently(lambda: service.translate('Bonjour', 'auto', 'en'))
+        wait_for_followers(service.flight, CONCURRENCY - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_translate.translate_text.call_count, 1)
+        self.assertTrue(all(result == ('Hello', 'fr') for result in results))
+
+    @patch('boto3.client')
+    def test_lex_requests_are_coalesced(self, mock_boto_client):
+        from chalicelib.services.intent_cache import IntentCache
+        from chalicelib.services.intent_recognition_service import IntentRecognitionService
+
+        release = threading.Event()
+        mock_lex = MagicMock()
+        mock_boto_client.return_value = mock_lex
+
+        def slow_recognize(**kwargs):
+            release.wait(5)
+            return {'interpretations': [{'intent': {'name': 'GetSideEffects', 'slots': {}}}]}
+
+        mock_lex.recognize_text.side_effect = slow_recognize
+        # No result cache, so only single-flight can save the calls
+        service = IntentRecognitionService(cache=IntentCache(maxsize=0, ttl=60, abstract_medications=False))
+
+        threads, results = run_concurrently(lambda: service.recognize_intent('What are the side effects of aspirin?'))
+        wait_for_followers(service.flight, CONCURRENCY - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_lex.recognize_text.call_count, 1)
+        self.assertTrue(all(result['intent']['name'] == 'GetSideEffects' for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.orchestration.query_handler_interface import QueryHandler
+
+
+def meet(barrier):
+    """Wait for the other party at the barrier; False if it never arrived"""
+    if barrier is None:
+        return False
+    try:
+        barrier.wait()
+        return True
+    except threading.BrokenBarrierError:
+        return False
+
+
+class SlowTranslation:
+    def __init__(self, translations=None, latency=0.05, barrier=None):
+        self.translations = translations or {}
+        self.latency = latency
+        self.barrier = barrier
+        self.overlapped = False
+
+    def translate(self, text, source_lang="auto", target_lang="en"):
+        self.overlapped = meet(self.barrier)
+        time.sleep(self.latency)
+        return self.translations.get(text, text), "en"
+
+
+class SlowIntent:
+    def __init__(self, latency=0.05, barrier=None):
+        self.latency = latency
+        self.barrier = barrier
+        self.overlapped = False
+        self.queries = []
+
+    def recognize_intent(self, query):
+        self.overlapped = meet(self.barrier)
+        time.sleep(self.latency)
+        self.queries.append(query)
+        return {'intent': 'GetSideEffects', 'confidence': 0.9, 'slots': {'query': query}}
+
+
+class TestSpeculativeIntent(unittest.TestCase):
+    def setUp(self):
+        self.handler = QueryHandler()
+        self.handler.intent_service = SlowIntent()
+
+    def tearDown(self):
+        self.handler.cleanup()
+
+    def test_unchanged_translation_keeps_speculative_result(self):
+        # Each call waits for the other at the barrier, so both only get
+        # through when translation and recognition are in flight at once
+        both_in_flight = threading.Barrier(2, timeout=5)
+        self.handler.translation_service = SlowTranslation(barrier=both_in_flight)
+        self.handler.intent_service = SlowIntent(barrier=both_in_flight)
+        translated, intent = self.handler._translate_and_recognize("What are the side effects of aspirin?", "en-GB")
+
+        self.assertEqual(translated, "What are the side effects of aspirin?")
+        self.assertEqual(self.handler.intent_service.queries, ["What are the side effects of aspirin?"])
+        self.assertTrue(self.handler.translation_service.overlapped)
+        self.assertTrue(self.handler.intent_service.overlapped)
+        stats = self.handler.speculation_stats()
+        self.assertEqual((stats['attempts'], stats['wins'], stats['win_rate']), (1, 1, 1.0))
+        self.assertGreater(stats['saved_ms'], 0)
+
+    def test_changed_translation_redoes_recognition(self):
+        self.handler.translation_service = SlowTranslation({"aspirin side effects i pregnancy": "aspirin side effects in pregnancy"})
+        translated, intent = self.handler._translate_and_recognize("aspirin side effects i pregnancy", "en-US")
+
+        self.assertEqual(intent['slots']['query'], "aspirin side effects in pregnancy")
+        self.assertEqual(self.handler.speculation_stats()['wins'], 0)
+        self.assertEqual(self.handler.speculation_stats()['attempts'], 1)
+
+    def test_confident_english_skips_translation(self):
+        self.handler.translation_service = SlowTranslation({"What is metformin used for?": "changed"})
+        translated, intent = self.handler._translate_and_recognize("What is metformin used for?", "auto")
+
+        self.assertEqual(translated, "What is metformin used for?")
+        self.assertEqual(self.handler.speculation_stats()['attempts'], 0)
+
+    def test_non_english_text_is_not_speculated(self):
+        self.handler.translation_service = SlowTranslation({"¿Efectos secundarios?": "Side effects?"})
+        translated, intent = self.handler._translate_and_recognize("¿Efectos secundarios?", "auto")
+
+        self.assertEqual(self.handler.intent_service.queries, ["Side effects?"])
+        self.assertEqual(self.handler.speculation_stats()['attempts'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
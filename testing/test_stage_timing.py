@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import json
+import logging
+from unittest.mock import patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.orchestration.query_handler_interface import QueryHandler
+from core.orchestration.stage_timer import StageTimer, NULL_TIMER, format_server_timing
+
+
+class StubIntent:
+    def recognize_intent(self, query):
+        return {'intent': 'GetSideEffects', 'confidence': 0.9, 'slots': {}}
+
+
+class StubMedical:
+    def get_medical_info(self, intent_data):
+        return {'status': 'success', 'response': 'Nausea', 'data': {}}
+
+
+class TestStageTiming(unittest.TestCase):
+    def setUp(self):
+        self.handler = QueryHandler()
+        self.handler.intent_service = StubIntent()
+        self.handler.medical_service = StubMedical()
+
+    def test_disabled_by_default(self):
+        response = self.handler.process_query("What are the side effects of aspirin?", "s1", "en")
+        self.assertNotIn('timings', response)
+
+    def test_every_stage_is_timed(self):
+        self.handler.stage_timing = True
+        response = self.handler.process_query("What are the side effects of aspirin?", "s1", "en")
+        self.assertEqual(
+            set(response['timings']),
+            {'session_cleanup', 'translate_in', 'intent', 'medical_lookup', 'translate_out', 'session_update', 'total'}
+        )
+        self.assertGreaterEqual(response['timings']['total'], response['timings']['intent'])
+
+    def test_slow_queries_are_logged(self):
+        self.handler.slow_query_threshold_ms = 0
+        with self.assertLogs('core.orchestration.query_handler_interface', level=logging.WARNING) as logs:
+            response = self.handler.process_query("What are the side effects of aspirin?", "s1", "en")
+        self.assertNotIn('timings', response)
+        entry = json.loads(logs.output[0].split('Slow query: ', 1)[1])
+        self.assertEqual(entry['event'], 'slow_query')
+        self.assertIn('medical_lookup', entry['timings_ms'])
+
+    def test_server_timing_format(self):
+        timer = StageTimer()
+        timer.record('intent', 1.25)
+        timer.record('intent', 1.0)
+        self.assertEqual(format_server_timing({'intent': 2.25}), 'intent;dur=2.250')
+        self.assertEqual(timer.stages, {'intent': 2.25})
+        with NULL_TIMER.stage('intent'):
+            pass
+        self.assertEqual(NULL_TIMER.stages, {})
+
+    def test_chat_route_sets_server_timing_header(self):
+        from chalice.test import Client
+        import app
+
+        self.handler.stage_timing = True
+        with patch.object(app.chatbot, 'query_handler', self.handler):
+            with Client(app.app) as client:
+                response = client.http.post(
+                    '/api/chat',
+                    headers={'Content-Type': 'application/json'},
+                    body=json.dumps({'message': 'What are the side effects of aspirin?', 'language': 'en'})
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('medical_lookup;dur=', response.headers['Server-Timing'])
+        self.assertNotIn('timings', response.json_body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import gzip
+import io
+import json
+import tempfile
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.catalog.streaming import iter_json_array, iter_records, clean_records, batched
+from chalicelib.catalog.drug_catalog import DrugCatalog
+
+
+RECORDS = [
+    {'id': 1.0, 'name': 'augmentin 625 duo tablet', 'Uses': 'Treatment of [bacterial], infections', 'Substitute': 'a, b'},
+    {'id': 2.0, 'name': 'azithral 500 tablet', 'Uses': 'Treatment of "typhoid"', 'Substitute': float('nan')},
+    {'id': 3.0, 'name': 'ascoril ls syrup', 'Uses': 'Cough with mucus', 'Substitute': 'c'},
+]
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text, compress=False):
+        path = os.path.join(self.directory.name, name)
+        if compress:
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return path
+
+    def test_array_split_across_tiny_chunks(self):
+        text = json.dumps(RECORDS, indent=2)
+        parsed = list(iter_json_array(io.StringIO(text), chunk_size=5))
+        self.assertEqual([record['name'] for record in parsed], [record['name'] for record in RECORDS])
+        self.assertEqual(parsed[0]['Uses'], 'Treatment of [bacterial], infections')
+
+    def test_numbers_are_not_cut_at_chunk_edges(self):
+        self.assertEqual(list(iter_json_array(io.StringIO('[12345, 678, -1.5e3]'), chunk_size=3)), [12345, 678, -1500.0])
+
+    def test_empty_and_malformed_arrays(self):
+        self.assertEqual(list(iter_json_array(io.StringIO('  [ ] '))), [])
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('[{"id": 1} {"id": 2}]')))
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('[{"id": 1},')))
+
+    def test_layouts_are_detected(self):
+        array_path = self.write('data.json', json.dumps(RECORDS))
+        lines_path = self.write('data.txt', "\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+        gzip_path = self.write('data.jsonl.gz', "\n".join(json.dumps(record) for record in RECORDS), compress=True)
+        for path in (array_path, lines_path, gzip_path):
+            self.assertEqual(len(list(iter_records(path))), 3, path)
+
+    def test_clean_and_batch_stages(self):
+        cleaned = list(clean_records(iter(RECORDS + ['not a record'])))
+        self.assertEqual(len(cleaned), 3)
+        self.assertIsNone(cleaned[1]['Substitute'])
+        self.assertEqual([len(batch) for batch in batched(range(7), 3)], [3, 3, 1])
+
+    def test_catalog_loads_json_lines(self):
+        path = self.write('data.jsonl', "\n".join(json.dumps(record) for record in RECORDS))
+        catalog = DrugCatalog.from_file(path)
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual(catalog.get_by_id(2).substitutes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
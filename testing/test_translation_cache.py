@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.services.translation_cache import TranslationCache
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'translations.sqlite3')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_hit_uses_normalized_text(self):
+        cache = TranslationCache(path='')
+        cache.put('Bonjour  le monde ', 'fr', 'en', 'Hello world', 'fr')
+        self.assertEqual(cache.get('Bonjour le monde', 'fr', 'en'), ('Hello world', 'fr'))
+        self.assertIsNone(cache.get('Bonjour le monde', 'fr', 'de'))
+
+    def test_auto_calls_record_detected_language(self):
+        cache = TranslationCache(path='')
+        cache.put('Hola', 'auto', 'en', 'Hello', 'es')
+        self.assertEqual(cache.get('Hola', 'auto', 'en'), ('Hello', 'es'))
+        self.assertEqual(cache.get('Hola', 'es', 'en'), ('Hello', 'es'))
+
+    def test_disk_tier_survives_restart(self):
+        cache = TranslationCache(path=self.path)
+        cache.put('Hola', 'auto', 'en', 'Hello', 'es')
+        cache.close()
+
+        restarted = TranslationCache(path=self.path)
+        self.assertEqual(restarted.get('Hola', 'auto', 'en'), ('Hello', 'es'))
+        self.assertEqual(restarted.stats()['disk_hits'], 1)
+        # Promoted into memory, so the second lookup does not touch the disk
+        restarted.get('Hola', 'auto', 'en')
+        self.assertEqual(restarted.stats()['disk_hits'], 1)
+        restarted.close()
+
+    def test_disk_tier_row_limit(self):
+        cache = TranslationCache(path=self.path, disk_max_rows=10, disk_ttl=0)
+        for i in range(11):
+            cache.put(f'texto {i}', 'es', 'en', f'text {i}', 'es')
+        self.assertEqual(cache.stats()['disk_rows'], 9)
+        self.assertEqual(cache.stats()['disk_pruned'], 2)
+        cache.close()
+
+        restarted = TranslationCache(path=self.path, disk_max_rows=10, disk_ttl=0)
+        self.assertIsNone(restarted.get('texto 1', 'es', 'en'))
+        self.assertEqual(restarted.get('texto 2', 'es', 'en'), ('text 2', 'es'))
+        self.assertEqual(restarted.get('texto 10', 'es', 'en'), ('text 10', 'es'))
+        restarted.close()
+
+    def test_disk_tier_ttl(self):
+        with patch('chalicelib.services.translation_cache.time.time', return_value=1000.0):
+            cache = TranslationCache(path=self.path, disk_ttl=60)
+            cache.put('Hola', 'es', 'en', 'Hello', 'es')
+            cache.close()
+        with patch('chalicelib.services.translation_cache.time.time', return_value=1061.0):
+            restarted = TranslationCache(path=self.path, disk_ttl=60)
+            self.assertIsNone(restarted.get('Hola', 'es', 'en'))
+            # Expired rows are deleted when the disk tier is opened
+            self.assertEqual(restarted.stats()['disk_rows'], 0)
+            restarted.close()
+
+    @patch('boto3.client')
+    def test_service_returns_live_tuple_shape_on_hits(self, mock_boto_client):
+        from chalicelib.services.aws_translation_service import AWSTranslationService
+
+        mock_translate = MagicMock()
+        mock_boto_client.return_value = mock_translate
+        mock_translate.translate_text.return_value = {
+            'TranslatedText': 'What are the side effects?',
+            'SourceLanguageCode': 'es'
+        }
+        service = AWSTranslationService(cache=TranslationCache(path=self.path))
+
+        live = service.translate('¿Cuáles son los efectos secundarios?')
+        cached = service.translate('¿Cuáles son los efectos secundarios?')
+        self.assertEqual(live, cached)
+        self.assertEqual(mock_translate.translate_text.call_count, 1)
+        service.cache.close()
+
+    @patch('boto3.client')
+    def test_failed_translations_are_not_cached(self, mock_boto_client):
+        from chalicelib.services.aws_translation_service import AWSTranslationService
+
+        mock_translate = MagicMock()
+        mock_boto_client.return_value = mock_translate
+        mock_translate.translate_text.side_effect = Exception("Translation failed")
+        service = AWSTranslationService(cache=TranslationCache(path=''))
+
+        self.assertEqual(service.translate('Hola', 'es', 'en'), ('Hola', 'es'))
+        service.translate('Hola', 'es', 'en')
+        self.assertEqual(mock_translate.translate_text.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
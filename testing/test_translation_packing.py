@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chalicelib.services.translation_cache import TranslationCache
+from core.orchestration.query_handler_interface import QueryHandler
+
+
+def upper_translate(**kwargs):
+    return {'TranslatedText': kwargs['Text'].upper(), 'SourceLanguageCode': kwargs['SourceLanguageCode']}
+
+
+class TestTranslationPacking(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('boto3.client')
+        self.addCleanup(patcher.stop)
+        mock_boto_client = patcher.start()
+        self.mock_translate = MagicMock()
+        mock_boto_client.return_value = self.mock_translate
+        self.mock_translate.translate_text.side_effect = upper_translate
+
+        from chalicelib.services.aws_translation_service import AWSTranslationService
+        self.service = AWSTranslationService(cache=TranslationCache(path=''))
+
+    def test_segments_share_one_call(self):
+        result = self.service.translate_batch(['Headache', 'Nausea', '', 'Headache', 'Dizziness'], 'en', 'es')
+        self.assertEqual(result, ['HEADACHE', 'NAUSEA', '', 'HEADACHE', 'DIZZINESS'])
+        self.assertEqual(self.mock_translate.translate_text.call_count, 1)
+        # Each segment is cached on its own for later single translations
+        self.assertEqual(self.service.translate('Nausea', 'en', 'es'), ('NAUSEA', 'en'))
+        self.assertEqual(self.mock_translate.translate_text.call_count, 1)
+
+    def test_packs_stay_under_byte_limit(self):
+        self.service.max_request_bytes = 40
+        segments = [f"segment number {i}" for i in range(6)]
+        result = self.service.translate_batch(segments, 'en', 'es')
+        self.assertEqual(result, [segment.upper() for segment in segments])
+        for call in self.mock_translate.translate_text.call_args_list:
+            self.assertLessEqual(len(call.kwargs['Text'].encode('utf-8')), 40)
+        self.assertGreater(self.mock_translate.translate_text.call_count, 1)
+
+    def test_lost_markers_fall_back_to_single_calls(self):
+        def mangle(**kwargs):
+            text = kwargs['Text'].replace('[[', '(').replace(']]', ')')
+            return {'TranslatedText': text.upper(), 'SourceLanguageCode': 'en'}
+
+        self.mock_translate.translate_text.side_effect = mangle
+        result = self.service.translate_batch(['Headache', 'Nausea'], 'en', 'es')
+        self.assertEqual(result, ['HEADACHE', 'NAUSEA'])
+        self.assertEqual(self.mock_translate.translate_text.call_count, 3)
+
+    def test_final_response_translates_data_in_one_call(self):
+        handler = QueryHandler()
+        handler.translation_service = self.service
+        response = handler._prepare_final_response({
+            'status': 'success',
+            'response': 'Side effects of Aspirin: Nausea, Heartburn',
+            'data': {'medication': 'aspirin', 'side_effects': ['Nausea', 'Heartburn']}
+        }, 'auto', 'es')
+
+        self.assertEqual(response['translated_response'], 'SIDE EFFECTS OF ASPIRIN: NAUSEA, HEARTBURN')
+        self.assertEqual(response['translated_data'], {'side_effects': ['NAUSEA', 'HEARTBURN']})
+        self.assertEqual(self.mock_translate.translate_text.call_count, 1)
+
+    def test_default_english_chat_makes_no_translation_calls(self):
+        handler = QueryHandler()
+        handler.translation_service = self.service
+        handler.intent_service = MagicMock()
+        handler.intent_service.recognize_intent.return_value = {'intent': 'GetSideEffects', 'slots': {'medication': 'aspirin'}}
+        handler.medical_service = MagicMock()
+        handler.medical_service.get_medical_info.return_value = {
+            'status': 'success',
+            'response': 'Side effects of Aspirin: Nausea, Heartburn',
+            'data': {'medication': 'aspirin', 'side_effects': ['Nausea', 'Heartburn']}
+        }
+
+        response = handler.process_query("What are the side effects of aspirin?", "session-1")
+        handler.cleanup()
+
+        self.assertEqual(response['translated_response'], 'Side effects of Aspirin: Nausea, Heartburn')
+        self.assertEqual(self.mock_translate.translate_text.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()